@@ -16,15 +16,22 @@ Requirements: REQ-CLI-001 ~ REQ-CLI-004
 """
 
 import argparse
+import contextlib
 import os
 import signal
 import subprocess
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from codegraph_mcp import __version__
 
 
+if TYPE_CHECKING:
+    from codegraph_mcp.core.graph import GraphEngine
+    from codegraph_mcp.core.semantic import SummaryResult
+
+
 # Default PID file location
 def get_pid_file() -> Path:
     """Get the PID file path."""
@@ -36,6 +43,18 @@ def get_log_file() -> Path:
     return Path.home() / ".codegraph" / "server.log"
 
 
+async def summarize_communities(engine: "GraphEngine") -> "SummaryResult":
+    """Summarize changed communities and embed their summaries for global search."""
+    from codegraph_mcp.core.semantic import SemanticAnalyzer
+
+    analyzer = SemanticAnalyzer()
+    summaries = await analyzer.summarize_communities(engine)
+    # Without sentence-transformers global search ranks by BM25 alone
+    with contextlib.suppress(ImportError):
+        await analyzer.embed_communities(engine)
+    return summaries
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create CLI argument parser."""
     parser = argparse.ArgumentParser(
@@ -137,6 +156,12 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip community detection",
     )
+    index_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parallel parse worker processes (0 = one per CPU, default: 1)",
+    )
 
     # query command (REQ-TLS-001)
     query_parser = subparsers.add_parser("query", help="Execute a graph query")
@@ -368,10 +393,11 @@ def cmd_index(args: argparse.Namespace) -> int:
     """Handle index command."""
     import asyncio
 
+    from codegraph_mcp.config import Config
     from codegraph_mcp.core.indexer import Indexer
 
     async def _index() -> int:
-        indexer = Indexer()
+        indexer = Indexer(config=Config.from_env(), workers=getattr(args, "workers", 1))
         incremental = not args.full
         run_community = args.community and not args.no_community
 
@@ -478,6 +504,12 @@ def cmd_index(args: argparse.Namespace) -> int:
                                 description="[cyan]Detecting communities...",
                             )
                             community_result = await detector.detect(engine)
+
+                        progress.update(
+                            task,
+                            description="[cyan]Summarizing communities...",
+                        )
+                        await summarize_communities(engine)
                     finally:
                         await engine.close()
 
@@ -496,6 +528,8 @@ def cmd_index(args: argparse.Namespace) -> int:
             table.add_row("Relations", str(result.relations_count))
             table.add_row("Files Indexed", str(result.files_indexed))
             table.add_row("Files Skipped", str(result.files_skipped))
+            if result.entities_embedded:
+                table.add_row("Entities Embedded", str(result.entities_embedded))
             table.add_row("Duration", f"{result.duration_seconds:.2f}s")
 
             if community_result:
@@ -558,6 +592,11 @@ def cmd_index(args: argparse.Namespace) -> int:
                             f"communities (modularity: "
                             f"{community_result.modularity:.4f})"
                         )
+                    summaries = await summarize_communities(engine)
+                    print(
+                        f"Summarized {summaries.generated} communities "
+                        f"({summaries.cached + summaries.skipped} reused)"
+                    )
                 finally:
                     await engine.close()
 
@@ -646,8 +685,9 @@ def cmd_community(args: argparse.Namespace) -> int:
                 min_size=args.min_size,
             )
 
-            # Detect communities
+            # Detect communities, then summarize the changed ones
             result = await detector.detect(engine)
+            summaries = await summarize_communities(engine)
 
             print("Community Detection")
             print("=" * 40)
@@ -659,6 +699,10 @@ def cmd_community(args: argparse.Namespace) -> int:
             print(f"Communities detected: {len(result.communities)}")
             print(f"Hierarchy levels: {result.levels}")
             print(f"Modularity: {result.modularity:.4f}")
+            print(
+                f"Summaries: {summaries.generated} generated, "
+                f"{summaries.cached + summaries.skipped} reused"
+            )
 
             if result.communities:
                 print("\nCommunity Details:")
@@ -687,6 +731,7 @@ def cmd_watch(args: argparse.Namespace) -> int:
         print("Install with: pip install watchfiles")
         return 1
 
+    from codegraph_mcp.config import Config
     from codegraph_mcp.core.indexer import Indexer
     from codegraph_mcp.core.parser import ASTParser
 
@@ -694,7 +739,7 @@ def cmd_watch(args: argparse.Namespace) -> int:
     supported_extensions = set(ASTParser.LANGUAGE_EXTENSIONS.keys())
 
     async def _watch() -> int:
-        indexer = Indexer()
+        indexer = Indexer(config=Config.from_env())
         repo_path = args.path.resolve()
 
         print(f"\n[Watch Mode] Watching: {repo_path}")
@@ -762,6 +807,7 @@ def cmd_watch(args: argparse.Namespace) -> int:
                             f"[Watch Mode] Communities updated: "
                             f"{len(comm_result.communities)}"
                         )
+                        await summarize_communities(engine)
                 finally:
                     await engine.close()
 
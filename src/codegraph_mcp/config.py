@@ -29,6 +29,16 @@ class StorageConfig:
     vector_enabled: bool = True
     vector_dimensions: int = 384  # MiniLM default
 
+    # SQLite connection settings (WAL lets readers run during indexing)
+    journal_mode: str = "wal"
+    synchronous: str = "normal"
+    cache_size_mb: int = 64
+    mmap_size_mb: int = 256
+    temp_store: str = "memory"
+
+    # Read-only connections pooled by EngineManager (0 = share the writer)
+    read_pool_size: int = 4
+
 
 @dataclass
 class ParserConfig:
@@ -77,6 +87,8 @@ class SemanticConfig:
     # Embedding model
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     embedding_batch_size: int = 32
+    # Embed entities while indexing (needs sentence-transformers)
+    embeddings_enabled: bool = False
 
     # LLM settings for descriptions (optional)
     llm_enabled: bool = False
@@ -155,6 +167,8 @@ class Config:
             CODEGRAPH_LOG_LEVEL: Log level (DEBUG, INFO, WARNING, ERROR)
             CODEGRAPH_DB_PATH: Database path
             CODEGRAPH_CACHE_ENABLED: Enable cache (true/false)
+            CODEGRAPH_READ_POOL_SIZE: Number of read-only connections
+            CODEGRAPH_EMBEDDINGS_ENABLED: Embed entities while indexing (true/false)
         """
         config = cls()
 
@@ -170,6 +184,12 @@ class Config:
         if cache := os.getenv("CODEGRAPH_CACHE_ENABLED"):
             config.storage.cache_enabled = cache.lower() in ("true", "1", "yes")
 
+        if pool_size := os.getenv("CODEGRAPH_READ_POOL_SIZE"):
+            config.storage.read_pool_size = int(pool_size)
+
+        if embeddings := os.getenv("CODEGRAPH_EMBEDDINGS_ENABLED"):
+            config.semantic.embeddings_enabled = embeddings.lower() in ("true", "1", "yes")
+
         return config
 
     @classmethod
@@ -209,6 +229,16 @@ class Config:
                 config.storage.cache_enabled = storage["cache_enabled"]
             if "cache_max_size_mb" in storage:
                 config.storage.cache_max_size_mb = storage["cache_max_size_mb"]
+            for key in (
+                "journal_mode",
+                "synchronous",
+                "cache_size_mb",
+                "mmap_size_mb",
+                "temp_store",
+                "read_pool_size",
+            ):
+                if key in storage:
+                    setattr(config.storage, key, storage[key])
 
         if "parser" in data:
             parser = data["parser"]
@@ -221,6 +251,12 @@ class Config:
             if "exclude_patterns" in parser:
                 config.parser.exclude_patterns = parser["exclude_patterns"]
 
+        if "semantic" in data:
+            semantic = data["semantic"]
+            for key in ("embedding_model", "embedding_batch_size", "embeddings_enabled"):
+                if key in semantic:
+                    setattr(config.semantic, key, semantic[key])
+
         return config
 
     def to_dict(self) -> dict[str, Any]:
@@ -232,6 +268,12 @@ class Config:
                 "db_path": self.storage.db_path,
                 "cache_enabled": self.storage.cache_enabled,
                 "cache_max_size_mb": self.storage.cache_max_size_mb,
+                "journal_mode": self.storage.journal_mode,
+                "synchronous": self.storage.synchronous,
+                "cache_size_mb": self.storage.cache_size_mb,
+                "mmap_size_mb": self.storage.mmap_size_mb,
+                "temp_store": self.storage.temp_store,
+                "read_pool_size": self.storage.read_pool_size,
             },
             "parser": {
                 "languages": self.parser.languages,
@@ -13,27 +13,40 @@ This module provides the core functionality for code graph analysis:
 Architecture: Library-First (ADR-001)
 """
 
+from codegraph_mcp.core.changes import ChangeDetector, ChangeSet
 from codegraph_mcp.core.community import Community, CommunityDetector
+from codegraph_mcp.core.community_index import CommunityIndex
+from codegraph_mcp.core.csr import CSRGraph
 from codegraph_mcp.core.graph import GraphEngine, GraphQuery, QueryResult
 from codegraph_mcp.core.graphrag import GraphRAGSearch
 from codegraph_mcp.core.indexer import Indexer, IndexResult
 from codegraph_mcp.core.llm import LLMClient, LLMConfig
 from codegraph_mcp.core.parser import ASTParser, Entity, ParseResult, Relation
+from codegraph_mcp.core.resolver import ReferenceResolver, SymbolTable
 from codegraph_mcp.core.semantic import SemanticAnalyzer
+from codegraph_mcp.core.snapshot import GraphSnapshot
 
 
 __all__ = [
     # Parser
     "ASTParser",
+    # CSR graph
+    "CSRGraph",
+    # Change detection
+    "ChangeDetector",
+    "ChangeSet",
     "Community",
     # Community
     "CommunityDetector",
+    "CommunityIndex",
     "Entity",
     # Graph
     "GraphEngine",
     "GraphQuery",
     # GraphRAG
     "GraphRAGSearch",
+    # Snapshot
+    "GraphSnapshot",
     "IndexResult",
     # Indexer
     "Indexer",
@@ -42,7 +55,10 @@ __all__ = [
     "LLMConfig",
     "ParseResult",
     "QueryResult",
+    # Resolver
+    "ReferenceResolver",
     "Relation",
     # Semantic
     "SemanticAnalyzer",
+    "SymbolTable",
 ]
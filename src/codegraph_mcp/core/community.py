@@ -7,9 +7,29 @@ Requirements: REQ-SEM-003, REQ-SEM-004
 Design Reference: design-core-engine.md §2.5
 """
 
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
+from itertools import count
 from typing import Any
 
+import numpy as np
+
+from codegraph_mcp.core.csr import CSRGraph
+from codegraph_mcp.core.louvain import LouvainResult, local_moving, louvain
+
+
+# Prefix for queries over a community and all of its descendants: entities
+# reference leaf (level 0) communities, coarser ones are reached through
+# parent links. Bind the community id as the first parameter.
+COMMUNITY_TREE_CTE = """
+WITH RECURSIVE community_tree(id) AS (
+    SELECT ?
+    UNION ALL
+    SELECT c.id FROM communities c
+    JOIN community_tree t ON c.parent_id = t.id
+)
+"""
+
 
 @dataclass
 class Community:
@@ -25,6 +45,8 @@ class Community:
     summary: str | None = None
     member_ids: list[str] = field(default_factory=list)
     parent_id: int | None = None
+    # Sum of the members' (undirected, weighted) degrees
+    degree: float = 0.0
     metadata: dict[str, Any] = field(default_factory=dict)
 
     @property
@@ -45,6 +67,11 @@ class CommunityDetector:
     """
     Community detection using Louvain algorithm.
 
+    Every Louvain pass is kept: level 0 holds the finest communities
+    (which entities are assigned to), each higher level merges those
+    below it, and ``parent_id`` links a community to the one containing
+    it on the next level.
+
     Requirements: REQ-SEM-003, REQ-SEM-004
     Design Reference: design-core-engine.md §2.5
 
@@ -58,7 +85,6 @@ class CommunityDetector:
         algorithm: str = "louvain",
         resolution: float = 1.0,
         min_size: int = 3,
-        max_nodes: int = 50000,  # Sample if larger
     ) -> None:
         """
         Initialize the community detector.
@@ -67,17 +93,18 @@ class CommunityDetector:
             algorithm: Detection algorithm ("louvain" or "leiden")
             resolution: Resolution parameter for modularity
             min_size: Minimum community size
-            max_nodes: Max nodes before sampling (for large graphs)
         """
         self.algorithm = algorithm
         self.resolution = resolution
         self.min_size = min_size
-        self.max_nodes = max_nodes
 
     async def detect(self, engine: Any) -> CommunityResult:
         """
         Detect communities in the code graph.
 
+        The whole graph is clustered (no sampling): Louvain runs on the
+        engine's CSR arrays, so memory stays linear in the number of edges.
+
         Args:
             engine: GraphEngine instance
 
@@ -86,121 +113,105 @@ class CommunityDetector:
 
         Requirements: REQ-SEM-003
         """
-
-        # Check graph size first
-        cursor = await engine._connection.execute(
-            "SELECT COUNT(*) FROM entities"
-        )
-        node_count = (await cursor.fetchone())[0]
-
-        # Build NetworkX graph from entities and relations
-        G = await self._build_networkx_graph(engine)
-
-        if G.number_of_nodes() == 0:
+        csr = await engine.get_csr()
+        if csr.number_of_nodes() == 0:
             return CommunityResult()
 
-        # Sample large graphs for performance
-        if node_count > self.max_nodes:
-            G = self._sample_graph(G, self.max_nodes)
-
         # Apply community detection
         if self.algorithm == "louvain":
-            communities = self._detect_louvain(G)
+            result = self._detect_louvain(csr)
         else:
-            communities = self._detect_louvain(G)  # Fallback
+            result = self._detect_louvain(csr)  # Fallback
+        communities = self._build_hierarchy(
+            self._partitions(csr, result.memberships)
+        )
+        degree = dict(zip(
+            csr.ids,
+            (
+                np.bincount(csr.sources(), weights=csr.weights, minlength=len(csr))
+                + np.bincount(csr.indices, weights=csr.weights, minlength=len(csr))
+            ).tolist(),
+            strict=True,
+        ))
+        for community in communities:
+            community.degree = sum(degree[member] for member in community.member_ids)
 
         # Store communities in database
         await self._store_communities(engine, communities)
 
+        levels = max((c.level for c in communities), default=0)
         return CommunityResult(
             communities=communities,
-            levels=max((c.level for c in communities), default=0) + 1,
-            modularity=self._compute_modularity(G, communities),
-        )
-
-    def _sample_graph(self, G: Any, max_nodes: int) -> Any:
-        """Sample graph for large-scale community detection."""
-        import random
-
-        if G.number_of_nodes() <= max_nodes:
-            return G
-
-        # Sample nodes by degree (keep high-degree nodes)
-        degrees = dict(G.degree())
-        sorted_nodes = sorted(
-            degrees.keys(),
-            key=lambda x: degrees[x],
-            reverse=True
+            levels=levels + 1,
+            modularity=result.modularity[-1],
         )
 
-        # Keep top nodes by degree + random sample
-        top_count = max_nodes // 2
-        top_nodes = set(sorted_nodes[:top_count])
-
-        remaining = list(sorted_nodes[top_count:])
-        random.seed(42)
-        random_sample = set(random.sample(
-            remaining,
-            min(max_nodes - top_count, len(remaining))
-        ))
-
-        sampled_nodes = top_nodes | random_sample
-        return G.subgraph(sampled_nodes).copy()
-
-    async def _build_networkx_graph(self, engine: Any) -> Any:
-        """Build NetworkX graph from database (optimized for large graphs)."""
-        import networkx as nx
-
-        G = nx.DiGraph()
-
-        # Batch fetch nodes - use fetchall() for speed
-        cursor = await engine._connection.execute(
-            "SELECT id, type, name FROM entities"
-        )
-        rows = await cursor.fetchall()
-
-        # Add nodes in bulk
-        G.add_nodes_from(
-            (row[0], {"type": row[1], "name": row[2]})
-            for row in rows
-        )
-
-        # Batch fetch edges
-        cursor = await engine._connection.execute(
-            "SELECT source_id, target_id, type, weight FROM relations"
+    def _detect_louvain(self, csr: CSRGraph) -> LouvainResult:
+        """Apply Louvain to the CSR edges (direction is ignored)."""
+        return louvain(
+            csr.number_of_nodes(),
+            csr.sources(),
+            csr.indices,
+            csr.weights,
+            resolution=self.resolution,
+            seed=42,
         )
-        rows = await cursor.fetchall()
 
-        # Add edges in bulk
-        G.add_edges_from(
-            (row[0], row[1], {"type": row[2], "weight": row[3]})
-            for row in rows
-        )
+    @staticmethod
+    def _partitions(
+        csr: CSRGraph,
+        memberships: list[np.ndarray],
+    ) -> list[list[set[str]]]:
+        """
+        Convert per-level membership arrays into sets of entity IDs.
 
-        return G
+        Placeholder nodes for unresolved relation targets (empty type)
+        shape the clustering but are not stored as members.
+        """
+        entities = np.flatnonzero(csr.node_types != 0)
+        ids = np.asarray(csr.ids, dtype=object)[entities]
+        partitions = []
+        for membership in memberships:
+            labels = membership[entities]
+            order = np.argsort(labels, kind="stable")
+            starts = np.flatnonzero(np.diff(labels[order])) + 1
+            partitions.append(
+                [set(group) for group in np.split(ids[order], starts) if len(group)]
+            )
+        return partitions
 
-    def _detect_louvain(self, G: Any) -> list[Community]:
-        """Apply Louvain algorithm for community detection."""
-        from networkx.algorithms.community import louvain_communities
+    def _build_hierarchy(self, partitions: list[list[set[str]]]) -> list[Community]:
+        """
+        Turn nested partitions (finest first) into linked communities.
 
-        # Convert to undirected for Louvain
-        G_undirected = G.to_undirected()
+        Each partition must coarsen the previous one. Community IDs are
+        unique across levels; communities below ``min_size`` are dropped
+        on every level.
+        """
+        communities: list[Community] = []
+        previous: list[Community] = []
+        next_id = 0
+        for level, partition in enumerate(partitions):
+            current: list[Community] = []
+            owner: dict[str, Community] = {}
+            for members in partition:
+                if len(members) < self.min_size:
+                    continue
+                community = Community(
+                    id=next_id,
+                    level=level,
+                    member_ids=sorted(members),
+                )
+                next_id += 1
+                current.append(community)
+                owner.update(dict.fromkeys(members, community))
 
-        # Detect communities
-        partition = louvain_communities(
-            G_undirected,
-            resolution=self.resolution,
-            seed=42,
-        )
+            for child in previous:
+                parent = owner.get(child.member_ids[0])
+                child.parent_id = parent.id if parent else None
 
-        communities = []
-        for idx, members in enumerate(partition):
-            if len(members) >= self.min_size:
-                communities.append(Community(
-                    id=idx,
-                    level=0,
-                    member_ids=list(members),
-                ))
+            communities.extend(current)
+            previous = current
 
         return communities
 
@@ -213,144 +224,471 @@ class CommunityDetector:
         # Clear existing communities
         await engine._connection.execute("DELETE FROM communities")
 
-        # Batch insert communities
+        # Batch insert communities (parents first)
         community_data = [
-            (c.id, c.level, c.name, c.summary, c.member_count)
-            for c in communities
+            (c.id, c.level, c.name, c.summary, c.member_count, c.parent_id, c.degree)
+            for c in sorted(communities, key=lambda c: -c.level)
         ]
         await engine._connection.executemany(
             """
-            INSERT INTO communities (id, level, name, summary, member_count)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO communities
+            (id, level, name, summary, member_count, parent_id, degree)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
             community_data,
         )
 
-        # Batch update entity community assignments
-        # Build (community_id, entity_id) pairs
-        assignments = []
-        for community in communities:
-            for member_id in community.member_ids:
-                assignments.append((community.id, member_id))
-
-        # Execute batch update
+        # Entities belong to their leaf community; stale assignments are
+        # cleared first so members of dropped communities are unassigned
+        await engine._connection.execute(
+            "UPDATE entities SET community_id = NULL WHERE community_id IS NOT NULL"
+        )
+        assignments = [
+            (community.id, member_id)
+            for community in communities
+            if community.level == 0
+            for member_id in community.member_ids
+        ]
         await engine._connection.executemany(
             "UPDATE entities SET community_id = ? WHERE id = ?",
             assignments,
         )
 
+        await engine._bump_generation("community_generation")
         await engine._connection.commit()
 
     async def update_incremental(
         self,
         engine: Any,
         changed_entity_ids: list[str],
+        hops: int = 1,
     ) -> CommunityResult:
         """
         Incrementally update communities for changed entities.
 
-        This method reassigns changed entities to their best-fit existing
-        communities based on their relationships. If significant changes
-        are detected, it triggers a full re-detection.
+        Only the ``hops``-neighbourhood of the changed entities is loaded
+        and moved between communities by modularity gain; the rest of the
+        partition stays fixed. Communities that lost members are split into
+        their connected parts, parts below ``min_size`` are merged into the
+        community they link to most, and member counts are adjusted up the
+        hierarchy. All changes are written in one transaction.
 
         Args:
             engine: GraphEngine instance
-            changed_entity_ids: List of entity IDs that changed
+            changed_entity_ids: List of entity IDs that were added or updated
+            hops: Radius of the neighbourhood that may move
 
         Returns:
-            CommunityResult with updated community assignments
+            CommunityResult with the updated level-0 communities
         """
         if not changed_entity_ids:
             return CommunityResult()
 
-        # Check if we have existing communities
+        # Without existing communities there is nothing to maintain
         cursor = await engine._connection.execute(
             "SELECT COUNT(*) FROM communities"
         )
-        community_count = (await cursor.fetchone())[0]
+        if (await cursor.fetchone())[0] == 0:
+            return await self.detect(engine)
+
+        local = _LocalGraph(engine)
+        movable = await local.neighbourhood(changed_entity_ids, hops)
+        labels, fresh = await self._move_locally(local, movable)
+        lost, origins = await self._split_and_merge(local, movable, labels, fresh)
+        communities = await self._write_incremental(local, labels, lost, origins)
 
-        # If no communities exist or many entities changed, do full detection
         cursor = await engine._connection.execute(
-            "SELECT COUNT(*) FROM entities"
+            "SELECT COALESCE(MAX(level), -1) + 1 FROM communities"
+        )
+        return CommunityResult(
+            communities=communities,
+            levels=(await cursor.fetchone())[0],
+            modularity=0.0,  # Not recomputed for incremental updates
         )
-        total_entities = (await cursor.fetchone())[0]
 
-        # Threshold: if >20% of entities changed, do full re-detection
-        change_ratio = len(changed_entity_ids) / max(total_entities, 1)
-        if community_count == 0 or change_ratio > 0.2:
-            return await self.detect(engine)
+    async def _move_locally(
+        self,
+        local: "_LocalGraph",
+        movable: list[str],
+    ) -> tuple[dict[str, int | None], Iterator[int]]:
+        """
+        Run local moving on the neighbourhood.
 
-        # Incremental update: assign changed entities to best-fit communities
-        await self._assign_to_best_communities(
-            engine, changed_entity_ids
+        Returns:
+            (community label of every node seen, generator of temporary
+            labels); unassigned movable nodes start as singletons under
+            negative temporary labels.
+        """
+        fresh = count(-1, -1)
+        labels: dict[str, int | None] = {}
+        for node in movable:
+            labels.update((n, local.stored.get(n)) for n in local.adjacency[node])
+        own: dict[str, int] = {}
+        for node in movable:
+            stored = local.stored[node]
+            own[node] = next(fresh) if stored is None else stored
+        labels.update(own)
+
+        totals = await local.totals(
+            {label for label in labels.values() if label is not None and label >= 0}
         )
-
-        # Get updated statistics
-        cursor = await engine._connection.execute(
-            "SELECT COUNT(DISTINCT community_id) FROM entities "
-            "WHERE community_id IS NOT NULL"
+        totals.update((label, local.degree[node]) for node, label in own.items() if label < 0)
+        cursor = await local.engine._connection.execute(
+            "SELECT 2 * TOTAL(COALESCE(weight, 1.0)) FROM relations"
         )
-        _ = (await cursor.fetchone())[0]  # active_communities
-
-        return CommunityResult(
-            communities=[],  # Not re-detecting all communities
-            levels=1,
-            modularity=0.0,  # Skip modularity computation for speed
+        total = (await cursor.fetchone())[0]
+
+        local_moving(
+            movable,
+            local.adjacency,
+            local.degree,
+            labels,
+            totals,
+            total=total,
+            resolution=self.resolution,
         )
+        return labels, fresh
 
-    async def _assign_to_best_communities(
+    async def _split_and_merge(
         self,
-        engine: Any,
-        entity_ids: list[str],
-    ) -> None:
-        """Assign entities to their best-fit communities."""
-        for entity_id in entity_ids:
-            # Find most common community among connected entities
-            cursor = await engine._connection.execute(
-                """
-                SELECT e.community_id, COUNT(*) as cnt
-                FROM entities e
-                JOIN relations r ON (
-                    (r.source_id = ? AND r.target_id = e.id) OR
-                    (r.target_id = ? AND r.source_id = e.id)
-                )
-                WHERE e.community_id IS NOT NULL
-                GROUP BY e.community_id
-                ORDER BY cnt DESC
-                LIMIT 1
-                """,
-                (entity_id, entity_id),
+        local: "_LocalGraph",
+        movable: list[str],
+        labels: dict[str, int | None],
+        fresh: Iterator[int],
+    ) -> tuple[set[int], dict[int, int]]:
+        """
+        Split disconnected communities and merge undersized ones.
+
+        Only communities that lost members (or whose stored member count
+        is stale after entities were re-indexed or deleted) and groups
+        formed by unassigned nodes are checked. ``labels`` is updated in
+        place; split parts get new temporary labels.
+
+        Returns:
+            (IDs of communities that lost members, stored community each
+            split part came from)
+        """
+        lost = {
+            local.stored[node]
+            for node in movable
+            if local.stored[node] is not None and labels[node] != local.stored[node]
+        }
+        cursor = await local.engine._connection.execute(
+            """
+            SELECT c.id FROM communities c
+            WHERE c.level = 0 AND c.member_count != (
+                SELECT COUNT(*) FROM entities e WHERE e.community_id = c.id
             )
-            row = await cursor.fetchone()
+            """
+        )
+        lost.update(row[0] for row in await cursor.fetchall())
 
-            if row and row[0] is not None:
-                # Assign to most connected community
-                await engine._connection.execute(
-                    "UPDATE entities SET community_id = ? WHERE id = ?",
-                    (row[0], entity_id),
-                )
+        # Current members of those communities (moved nodes keep their label)
+        rows = await _fetch_in(
+            local.engine,
+            "SELECT id, community_id FROM entities WHERE community_id IN ({ids})",
+            sorted(lost),
+        )
+        for node, community in rows:
+            local.stored.setdefault(node, community)
+            labels.setdefault(node, community)
+
+        groups: dict[int, set[str]] = {community: set() for community in lost}
+        for node, label in labels.items():
+            if label is not None and (label < 0 or label in groups):
+                groups.setdefault(label, set()).add(node)
+        await local.load(sorted(node for members in groups.values() for node in members))
+
+        def label_of(node: str) -> int | None:
+            return labels[node] if node in labels else local.stored.get(node)
+
+        # Split: the largest connected part keeps the community
+        origins: dict[int, int] = {}
+        for label in sorted(groups):
+            parts = _components(groups[label], local.adjacency)
+            groups[label] = parts[0] if parts else set()
+            for part in parts[1:]:
+                part_label = next(fresh)
+                groups[part_label] = part
+                if label >= 0:
+                    origins[part_label] = label
+                for node in part:
+                    labels[node] = part_label
+
+        # Merge: undersized groups join the community they link to most
+        for label in sorted(groups, key=lambda label: (len(groups[label]), label)):
+            members = groups[label]
+            if not members or len(members) >= self.min_size:
+                continue
+            links: dict[int, float] = {}
+            for node in members:
+                for neighbour, weight in local.adjacency[node].items():
+                    target = label_of(neighbour)
+                    if target is not None and target != label:
+                        links[target] = links.get(target, 0.0) + weight
+            target = max(sorted(links), key=links.__getitem__) if links else None
+            for node in members:
+                labels[node] = target
+            if target in groups:
+                groups[target] |= members
+            groups[label] = set()
+
+        return lost, origins
+
+    async def _write_incremental(
+        self,
+        local: "_LocalGraph",
+        labels: dict[str, int | None],
+        lost: set[int],
+        origins: dict[int, int],
+    ) -> list[Community]:
+        """Write new assignments, communities and member counts in one batch."""
+        groups: dict[int, list[str]] = {}
+        for node, label in labels.items():
+            if label is not None:
+                groups.setdefault(label, []).append(node)
+        rows = await _fetch_in(
+            local.engine,
+            "SELECT id, parent_id, member_count, degree FROM communities WHERE id IN ({ids})",
+            sorted(label for label in groups.keys() | lost if label >= 0),
+        )
+        parents = {row[0]: row[1] for row in rows}
+        stored_counts = {row[0]: row[2] for row in rows}
+        stored_degrees = {row[0]: row[3] for row in rows}
+
+        # New communities: split parts keep the parent of their origin,
+        # other groups take the parent of the community they link to most
+        cursor = await local.engine._connection.execute(
+            "SELECT COALESCE(MAX(id), -1) + 1 FROM communities"
+        )
+        next_id = (await cursor.fetchone())[0]
+        new_ids: dict[int, int] = {}
+        new_rows = []
+        for label in sorted(label for label in groups if label < 0):
+            if label in origins:
+                parent_id = parents.get(origins[label])
             else:
-                # No connected communities, leave unassigned or create new
-                await engine._connection.execute(
-                    "UPDATE entities SET community_id = NULL WHERE id = ?",
-                    (entity_id,),
-                )
-
-        await engine._connection.commit()
+                links: dict[int, float] = {}
+                for node in groups[label]:
+                    for neighbour, weight in local.adjacency[node].items():
+                        community = labels.get(neighbour, local.stored.get(neighbour))
+                        if community is not None and community >= 0:
+                            links[community] = links.get(community, 0.0) + weight
+                best = max(sorted(links), key=links.__getitem__) if links else None
+                parent_id = parents.get(best)
+            new_ids[label] = next_id
+            new_rows.append((next_id, parent_id))
+            parents[next_id] = parent_id
+            next_id += 1
+
+        updates = []
+        for node, label in labels.items():
+            final = new_ids.get(label, label)
+            labels[node] = final
+            if node in local.stored and final != local.stored[node]:
+                updates.append((final, node))
+
+        await local.engine._connection.executemany(
+            "INSERT INTO communities (id, level, member_count, parent_id) VALUES (?, 0, 0, ?)",
+            new_rows,
+        )
+        await local.engine._connection.executemany(
+            "UPDATE entities SET community_id = ? WHERE id = ?",
+            updates,
+        )
 
-    def _compute_modularity(self, G: Any, communities: list[Community]) -> float:
-        """Compute modularity score."""
-        from networkx.algorithms.community import modularity
+        # Member counts and degrees of the affected communities, then the
+        # counts of their ancestors. Degrees are exact for reshaped
+        # communities (all members loaded) and adjusted for the others.
+        affected = sorted(
+            lost | set(new_ids.values()) | {final for final, _ in updates if final is not None}
+        )
+        members: dict[int, list[str]] = {community: [] for community in affected}
+        rows = await _fetch_in(
+            local.engine,
+            "SELECT id, community_id FROM entities WHERE community_id IN ({ids})",
+            affected,
+        )
+        for node, community in rows:
+            members[community].append(node)
+
+        degrees: dict[int, float | None] = {}
+        for community in affected:
+            if community in lost or community not in stored_degrees:
+                degrees[community] = sum(local.degree[node] for node in members[community])
+            elif stored_degrees[community] is not None:
+                degrees[community] = stored_degrees[community]
+        for final, node in updates:
+            if final is None or final in lost or final not in stored_degrees:
+                continue
+            degree = degrees.get(final)
+            if degree is not None:
+                degrees[final] = degree + local.degree[node]
+
+        await local.engine._connection.executemany(
+            "UPDATE communities SET member_count = ?, degree = ? WHERE id = ?",
+            [(len(members[c]), degrees.get(c), c) for c in affected if members[c]],
+        )
+        await local.engine._connection.executemany(
+            "DELETE FROM communities WHERE id = ?",
+            [(c,) for c in affected if not members[c]],
+        )
 
-        G_undirected = G.to_undirected()
+        deltas: dict[int, int] = {}
+        for community in affected:
+            parent_id = parents.get(community)
+            change = len(members[community]) - stored_counts.get(community, 0)
+            if parent_id is not None and change:
+                deltas[parent_id] = deltas.get(parent_id, 0) + change
+        while deltas:
+            await local.engine._connection.executemany(
+                "UPDATE communities SET member_count = member_count + ? WHERE id = ?",
+                [(change, community) for community, change in deltas.items()],
+            )
+            rows = await _fetch_in(
+                local.engine,
+                "SELECT id, parent_id FROM communities "
+                "WHERE id IN ({ids}) AND parent_id IS NOT NULL",
+                sorted(deltas),
+            )
+            ancestors: dict[int, int] = {}
+            for community, parent_id in rows:
+                ancestors[parent_id] = ancestors.get(parent_id, 0) + deltas[community]
+            deltas = {community: change for community, change in ancestors.items() if change}
+
+        await local.engine._bump_generation("community_generation")
+        await local.engine._connection.commit()
+
+        return [
+            Community(
+                id=community,
+                level=0,
+                member_ids=sorted(members[community]),
+                parent_id=parents.get(community),
+                degree=degrees.get(community) or 0.0,
+            )
+            for community in affected
+            if members[community]
+        ]
 
-        # Convert to list of sets for networkx
-        partition = [set(c.member_ids) for c in communities]
 
-        if not partition:
-            return 0.0
+async def _fetch_in(engine: Any, sql: str, ids: list[Any]) -> list[Any]:
+    """Run ``sql`` with its ``{ids}`` placeholder bound to chunks of ``ids``."""
+    rows: list[Any] = []
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        cursor = await engine._connection.execute(
+            sql.format(ids=",".join("?" * len(chunk))),
+            chunk,
+        )
+        rows.extend(await cursor.fetchall())
+    return rows
+
+
+def _components(members: set[str], adjacency: dict[str, dict[str, float]]) -> list[set[str]]:
+    """Connected parts of ``members`` (largest first)."""
+    parts: list[set[str]] = []
+    seen: set[str] = set()
+    for start in sorted(members):
+        if start in seen:
+            continue
+        part = {start}
+        stack = [start]
+        while stack:
+            for neighbour in adjacency.get(stack.pop(), ()):
+                if neighbour in members and neighbour not in part:
+                    part.add(neighbour)
+                    stack.append(neighbour)
+        seen |= part
+        parts.append(part)
+    return sorted(parts, key=lambda part: (-len(part), min(part)))
+
+
+class _LocalGraph:
+    """Part of the stored graph around changed entities, loaded on demand."""
+
+    def __init__(self, engine: Any) -> None:
+        self.engine = engine
+        # Undirected link weights and whole-graph degree of loaded entities
+        self.adjacency: dict[str, dict[str, float]] = {}
+        self.degree: dict[str, float] = {}
+        # Stored community of every entity seen (placeholders are absent)
+        self.stored: dict[str, int | None] = {}
+
+    async def lookup(self, ids: Iterable[str]) -> None:
+        """Fetch the stored community of entities not seen yet."""
+        missing = sorted({node for node in ids if node not in self.stored})
+        rows = await _fetch_in(
+            self.engine,
+            "SELECT id, community_id FROM entities WHERE id IN ({ids})",
+            missing,
+        )
+        self.stored.update(rows)
+
+    async def load(self, ids: Iterable[str]) -> None:
+        """Load the relations of entities and the communities of their neighbours."""
+        missing = [node for node in ids if node not in self.adjacency]
+        for node in missing:
+            self.adjacency[node] = {}
+            self.degree[node] = 0.0
+        # Both directions: a self-loop adds its weight twice to the degree
+        for column, other in (("source_id", "target_id"), ("target_id", "source_id")):
+            rows = await _fetch_in(
+                self.engine,
+                f"SELECT {column}, {other}, COALESCE(weight, 1.0) FROM relations "
+                f"WHERE {column} IN ({{ids}})",
+                missing,
+            )
+            for node, neighbour, weight in rows:
+                self.degree[node] += weight
+                if neighbour != node:
+                    links = self.adjacency[node]
+                    links[neighbour] = links.get(neighbour, 0.0) + weight
+        await self.lookup(n for node in missing for n in self.adjacency[node])
+
+    async def neighbourhood(self, changed: list[str], hops: int) -> list[str]:
+        """Load and return the existing changed entities and their ``hops``-neighbours."""
+        await self.lookup(changed)
+        frontier = sorted({node for node in changed if node in self.stored})
+        nodes: list[str] = []
+        for hop in range(hops + 1):
+            await self.load(frontier)
+            nodes += frontier
+            if hop == hops:
+                break
+            seen = set(nodes)
+            frontier = sorted({
+                neighbour
+                for node in frontier
+                for neighbour in self.adjacency[node]
+                if neighbour in self.stored and neighbour not in seen
+            })
+        return nodes
+
+    async def totals(self, communities: set[int]) -> dict[int, float]:
+        """Degree sum of each stored community in the whole graph."""
+        rows = await _fetch_in(
+            self.engine,
+            "SELECT id, degree FROM communities WHERE id IN ({ids})",
+            sorted(communities),
+        )
+        totals = {community: degree for community, degree in rows if degree is not None}
 
-        try:
-            return modularity(G_undirected, partition)
-        except Exception:
-            return 0.0
+        # Communities stored before degrees were recorded
+        missing = sorted(communities - totals.keys())
+        totals.update(dict.fromkeys(missing, 0.0))
+        rows = await _fetch_in(
+            self.engine,
+            """
+            SELECT e.community_id, TOTAL(
+                (SELECT TOTAL(COALESCE(weight, 1.0)) FROM relations WHERE source_id = e.id)
+                + (SELECT TOTAL(COALESCE(weight, 1.0)) FROM relations WHERE target_id = e.id)
+            )
+            FROM entities e
+            WHERE e.community_id IN ({ids})
+            GROUP BY e.community_id
+            """,
+            missing,
+        )
+        totals.update(rows)
+        return totals
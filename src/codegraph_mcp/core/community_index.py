@@ -0,0 +1,206 @@
+"""
+Community Index Module
+
+In-memory retrieval index over community summaries for global search.
+Summary embeddings are held in one normalized matrix, so scoring every
+community against a query costs a single matrix-vector product; a BM25
+index over names and summaries rewards exact terms and stands in when no
+embeddings exist (sentence-transformers is optional). The index is
+rebuilt only when the community generation changes.
+
+Requirements: REQ-TLS-010
+Design Reference: design-mcp-interface.md §2.1
+"""
+
+import asyncio
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+
+from codegraph_mcp.core.graph import identifier_terms
+
+
+# BM25 term frequency saturation and length normalization
+_K1 = 1.2
+_B = 0.75
+
+
+class CommunityIndex:
+    """
+    Vector and BM25 index over all communities.
+
+    Scores fuse the cosine similarity of the query with each summary
+    embedding and the BM25 score of the query terms (scaled to the best
+    match) as ``(1 - bm25_weight) * cosine + bm25_weight * bm25``.
+    Communities without a stored embedding only get the BM25 part, and
+    without any embeddings (or an embedding model) the score is BM25
+    alone. The index records the community generation it was built from
+    (see ``GraphEngine.get_generation``) and reloads once it moves on.
+
+    Usage:
+        index = CommunityIndex()
+        await index.refresh(engine)
+        scores = await index.score("authentication flow")
+    """
+
+    def __init__(self, bm25_weight: float = 0.3, analyzer: Any = None) -> None:
+        """
+        Initialize an empty (unloaded) index.
+
+        Args:
+            bm25_weight: Share of the BM25 score when embeddings exist
+            analyzer: SemanticAnalyzer used to embed queries (default:
+                one for the model the summaries were embedded with)
+        """
+        self.bm25_weight = bm25_weight
+        self.generation: int | None = None
+        self._analyzer = analyzer
+        self._build([])
+
+    @classmethod
+    def from_communities(cls, communities: Iterable[dict[str, Any]]) -> "CommunityIndex":
+        """Build a BM25-only index over community rows (id, name, summary)."""
+        index = cls()
+        index._build([
+            (community["id"], community.get("name"), community.get("summary"), None, None)
+            for community in communities
+        ])
+        return index
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.generation is not None
+
+    def invalidate(self) -> None:
+        """Drop the index; it is rebuilt on next use."""
+        self._build([])
+        self.generation = None
+
+    async def refresh(self, engine: Any) -> None:
+        """Rebuild the index if the communities changed."""
+        generation = await engine.get_generation("community_generation")
+        if generation != self.generation:
+            await self.load(engine, generation)
+
+    async def load(self, engine: Any, generation: int | None = None) -> None:
+        """Rebuild the index from the database."""
+        if generation is None:
+            generation = await engine.get_generation("community_generation")
+
+        cursor = await engine._connection.execute(
+            """
+            SELECT c.id, c.name, c.summary, s.embedding, s.embedding_model
+            FROM communities c
+            LEFT JOIN community_summaries s ON s.hash = c.summary_hash
+            ORDER BY c.id
+            """
+        )
+        self._build(await cursor.fetchall())
+        self.generation = generation
+
+    def _build(self, rows: list[Any]) -> None:
+        """Build the vector matrix and BM25 postings from community rows."""
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        n = len(rows)
+
+        # Embeddings of the prevailing model; other rows stay zero
+        models = Counter(row[4] for row in rows if row[3] is not None)
+        self.model: str | None = models.most_common(1)[0][0] if models else None
+        self.vectors: np.ndarray | None = None
+        if self.model is not None:
+            embedded = [
+                (i, np.frombuffer(row[3], dtype=np.float32))
+                for i, row in enumerate(rows)
+                if row[3] is not None and row[4] == self.model
+            ]
+            self.vectors = np.zeros((n, len(embedded[0][1])), dtype=np.float32)
+            for i, vector in embedded:
+                self.vectors[i] = vector
+            norms = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+            np.divide(self.vectors, norms, out=self.vectors, where=norms > 0)
+
+        # Postings: for each term, the documents containing it and their
+        # precomputed BM25 contribution
+        documents = [identifier_terms(f"{row[1] or ''} {row[2] or ''}") for row in rows]
+        lengths = np.array([len(terms) for terms in documents], dtype=np.float64)
+        average = float(lengths.mean()) if n else 0.0
+        average = average or 1.0
+        postings: dict[str, tuple[list[int], list[int]]] = {}
+        for i, terms in enumerate(documents):
+            for term, frequency in Counter(terms).items():
+                docs, frequencies = postings.setdefault(term, ([], []))
+                docs.append(i)
+                frequencies.append(frequency)
+
+        self._postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for term, (docs, frequencies) in postings.items():
+            members = np.array(docs, dtype=np.int64)
+            tf = np.array(frequencies, dtype=np.float64)
+            idf = np.log1p((n - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = _K1 * (1 - _B + _B * lengths[members] / average)
+            self._postings[term] = (members, idf * tf * (_K1 + 1) / (tf + norm))
+
+    def _bm25(self, query: str) -> np.ndarray:
+        """BM25 score of every community, scaled so the best match is 1."""
+        scores = np.zeros(len(self.ids))
+        for term in dict.fromkeys(identifier_terms(query)):
+            if term in self._postings:
+                docs, weights = self._postings[term]
+                scores[docs] += weights
+        peak = scores.max() if len(scores) else 0.0
+        return scores / peak if peak > 0 else scores
+
+    async def _embed_query(self, query: str) -> np.ndarray | None:
+        """
+        Normalized query embedding, or None without a usable model.
+
+        The model is loaded and run in a worker thread, off the event loop.
+        """
+        if self.vectors is None:
+            return None
+        if self._analyzer is None or self._analyzer.embedding_model != self.model:
+            from codegraph_mcp.core.semantic import SemanticAnalyzer
+
+            self._analyzer = SemanticAnalyzer(embedding_model=self.model)
+        try:
+            vectors = await asyncio.to_thread(self._analyzer.generate_embeddings, [query])
+        except ImportError:
+            # Keep ranking with BM25 and stop retrying the import
+            self.vectors = None
+            return None
+        vector = np.asarray(vectors[0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+
+    async def score(self, query: str) -> dict[int, float]:
+        """
+        Score all communities against a query.
+
+        Args:
+            query: Natural language query
+
+        Returns:
+            Score in (0, 1] of every community that matches at all
+        """
+        # A reload while the query is embedded replaces these arrays
+        ids, vectors = self.ids, self.vectors
+        scores = self._bm25(query)
+        vector = await self._embed_query(query)
+        if vector is not None and vectors is not None and vectors.shape[1] == len(vector):
+            cosine = np.clip(vectors @ vector, 0.0, 1.0)
+            scores = (1 - self.bm25_weight) * cosine + self.bm25_weight * scores
+        matches = np.flatnonzero(scores > 0)
+        return dict(zip(ids[matches].tolist(), scores[matches].tolist(), strict=True))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get index statistics."""
+        return {
+            "loaded": self.is_loaded,
+            "generation": self.generation,
+            "communities": len(self.ids),
+            "terms": len(self._postings),
+            "embedded": 0 if self.vectors is None else int(self.vectors.any(axis=1).sum()),
+            "embedding_model": self.model,
+        }
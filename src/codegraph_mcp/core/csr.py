@@ -0,0 +1,557 @@
+"""
+CSR Graph Module
+
+Compact, array-backed directed graph in compressed sparse row (CSR) form.
+Nodes are dense integers mapped to/from entity IDs; edges live in NumPy
+arrays (about 18 bytes per edge instead of the several hundred a NetworkX
+dict-of-dicts needs), which keeps large code graphs resident and makes
+multi-hop traversal a sequence of vectorized frontier expansions.
+
+Requirements: REQ-GRF-001, REQ-TLS-002, REQ-TLS-005
+Design Reference: design-core-engine.md §2.2
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import numpy as np
+
+
+# Traversal directions
+OUT = "out"
+IN = "in"
+BOTH = "both"
+
+
+def _gather(indptr: np.ndarray, frontier: np.ndarray) -> np.ndarray:
+    """Get the edge positions of all rows in ``frontier``."""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return offsets + np.arange(total, dtype=np.int64)
+
+
+def _encode(values: Iterable[str], vocab: list[str], codes: dict[str, int]) -> list[int]:
+    """Map strings to integer codes, extending the vocabulary as needed."""
+    out = []
+    for value in values:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(vocab)
+            vocab.append(value)
+        out.append(code)
+    return out
+
+
+class _Columns:
+    """Node columns and vocabularies that new nodes and edges are encoded into."""
+
+    def __init__(
+        self,
+        ids: list[str],
+        node_types: list[int],
+        node_files: list[int],
+        type_names: list[str],
+        file_names: list[str],
+    ) -> None:
+        self.ids = ids
+        self.index = {node_id: i for i, node_id in enumerate(ids)}
+        self.node_types = node_types
+        self.node_files = node_files
+        self.type_names = type_names
+        self.type_codes = {name: code for code, name in enumerate(type_names)}
+        self.file_names = file_names
+        self.file_codes = {name: code for code, name in enumerate(file_names)}
+
+    def add_nodes(self, nodes: Iterable[tuple[str, str, str]]) -> None:
+        """Append (id, type, file_path) tuples; later duplicates win."""
+        for node_id, node_type, file_path in nodes:
+            (type_code,) = _encode((node_type,), self.type_names, self.type_codes)
+            (file_code,) = _encode((file_path,), self.file_names, self.file_codes)
+            i = self.index.get(node_id)
+            if i is None:
+                self.index[node_id] = len(self.ids)
+                self.ids.append(node_id)
+                self.node_types.append(type_code)
+                self.node_files.append(file_code)
+            else:
+                self.node_types[i] = type_code
+                self.node_files[i] = file_code
+
+    def add_edges(
+        self,
+        edges: Iterable[tuple[str, str, str, float]],
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Encode (source_id, target_id, type, weight) tuples; unknown
+        endpoints become nodes with empty type and file.
+
+        Returns:
+            (sources, targets, edge types, weights) columns
+        """
+        sources: list[int] = []
+        targets: list[int] = []
+        edge_type_names: list[str] = []
+        weights: list[float] = []
+        for source_id, target_id, edge_type, weight in edges:
+            for node_id in (source_id, target_id):
+                if node_id not in self.index:
+                    self.index[node_id] = len(self.ids)
+                    self.ids.append(node_id)
+                    self.node_types.append(0)
+                    self.node_files.append(0)
+            sources.append(self.index[source_id])
+            targets.append(self.index[target_id])
+            edge_type_names.append(edge_type)
+            weights.append(1.0 if weight is None else weight)
+
+        edge_types = _encode(edge_type_names, self.type_names, self.type_codes)
+        return (
+            np.asarray(sources, dtype=np.int64),
+            np.asarray(targets, dtype=np.int64),
+            np.asarray(edge_types, dtype=np.uint16),
+            np.asarray(weights, dtype=np.float32),
+        )
+
+
+class CSRGraph:
+    """
+    Immutable directed multigraph stored as CSR arrays.
+
+    Outgoing edges of node ``i`` are ``indices[indptr[i]:indptr[i + 1]]``
+    with parallel ``edge_types`` / ``weights`` columns; a reverse CSR
+    (``rev_indptr`` / ``rev_indices`` / ``rev_edges``) serves predecessor
+    lookups. Node attributes (entity type, file) are stored as small
+    integer codes into per-graph vocabularies.
+
+    Usage:
+        csr = CSRGraph.build(
+            nodes=[("a", "function", "a.py"), ("b", "function", "b.py")],
+            edges=[("a", "b", "calls", 1.0)],
+        )
+        csr.bfs("a", depth=2)  # {"a": 0, "b": 1}
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        *,
+        node_types: np.ndarray,
+        node_files: np.ndarray,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        edge_types: np.ndarray,
+        weights: np.ndarray,
+        type_names: list[str],
+        file_names: list[str],
+    ) -> None:
+        """
+        Build the CSR arrays from node columns and edges in COO form.
+
+        Prefer ``CSRGraph.build`` unless the columns are already encoded.
+        """
+        n = len(ids)
+        self.ids = ids
+        self.index = {node_id: i for i, node_id in enumerate(ids)}
+        self.node_types = node_types.astype(np.uint16, copy=False)
+        self.node_files = node_files.astype(np.int32, copy=False)
+        self.type_names = type_names
+        self.file_names = file_names
+
+        # Forward CSR (stable sort keeps insertion order per source)
+        order = np.argsort(sources, kind="stable")
+        self.indices = targets[order].astype(np.int32, copy=False)
+        self.edge_types = edge_types[order].astype(np.uint16, copy=False)
+        self.weights = weights[order].astype(np.float32, copy=False)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=self.indptr[1:])
+
+        # Reverse CSR pointing back into the forward edge arrays
+        sorted_sources = sources[order]
+        rev_order = np.argsort(self.indices, kind="stable")
+        self.rev_indices = sorted_sources[rev_order].astype(np.int32, copy=False)
+        self.rev_edges = rev_order.astype(np.int32, copy=False)
+        self.rev_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=n), out=self.rev_indptr[1:])
+
+    @classmethod
+    def build(
+        cls,
+        nodes: Iterable[tuple[str, str, str]],
+        edges: Iterable[tuple[str, str, str, float]],
+    ) -> "CSRGraph":
+        """
+        Build a graph from node and edge tuples.
+
+        Args:
+            nodes: (id, type, file_path) tuples; later duplicates win
+            edges: (source_id, target_id, type, weight) tuples. Endpoints
+                that are not listed in ``nodes`` (e.g. unresolved targets)
+                become nodes with empty type and file.
+
+        Returns:
+            CSRGraph instance
+        """
+        columns = _Columns([], [], [], type_names=[""], file_names=[""])
+        columns.add_nodes(nodes)
+        sources, targets, edge_types, weights = columns.add_edges(edges)
+        return cls(
+            columns.ids,
+            node_types=np.asarray(columns.node_types, dtype=np.uint16),
+            node_files=np.asarray(columns.node_files, dtype=np.int32),
+            sources=sources,
+            targets=targets,
+            edge_types=edge_types,
+            weights=weights,
+            type_names=columns.type_names,
+            file_names=columns.file_names,
+        )
+
+    # ------------------------------------------------------------------
+    # Basic accessors
+    # ------------------------------------------------------------------
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def number_of_nodes(self) -> int:
+        return len(self.ids)
+
+    def number_of_edges(self) -> int:
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the node and edge arrays."""
+        return sum(
+            a.nbytes for a in (
+                self.node_types, self.node_files,
+                self.indptr, self.indices, self.edge_types, self.weights,
+                self.rev_indptr, self.rev_indices, self.rev_edges,
+            )
+        )
+
+    def nodes(self) -> list[str]:
+        """Get all node IDs."""
+        return list(self.ids)
+
+    def sources(self) -> np.ndarray:
+        """Get the source node of every forward edge position."""
+        return np.repeat(
+            np.arange(len(self.ids), dtype=np.int32), np.diff(self.indptr)
+        )
+
+    def edges(self) -> Iterator[tuple[str, str, str, float]]:
+        """Iterate over (source_id, target_id, type, weight) tuples."""
+        ids = self.ids
+        for s, t, et, w in zip(
+            self.sources().tolist(),
+            self.indices.tolist(),
+            self.edge_types.tolist(),
+            self.weights.tolist(),
+            strict=True,
+        ):
+            yield ids[s], ids[t], self.type_names[et], w
+
+    def node_type(self, node_id: str) -> str:
+        """Get the entity type of a node ("" for edge-only nodes)."""
+        return self.type_names[self.node_types[self.index[node_id]]]
+
+    def successors(self, node_id: str) -> list[str]:
+        i = self.index[node_id]
+        return [self.ids[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def predecessors(self, node_id: str) -> list[str]:
+        i = self.index[node_id]
+        return [
+            self.ids[j] for j in self.rev_indices[self.rev_indptr[i]:self.rev_indptr[i + 1]]
+        ]
+
+    def _type_mask(self, edge_types: Iterable[str] | None) -> np.ndarray | None:
+        """Boolean lookup table over type codes, or None for all types."""
+        if edge_types is None:
+            return None
+        mask = np.zeros(len(self.type_names), dtype=bool)
+        wanted = set(edge_types)
+        for code, name in enumerate(self.type_names):
+            mask[code] = name in wanted
+        return mask
+
+    # ------------------------------------------------------------------
+    # Traversal
+    # ------------------------------------------------------------------
+
+    def _expand(
+        self,
+        frontier: np.ndarray,
+        direction: str,
+        type_mask: np.ndarray | None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Expand a frontier by one hop.
+
+        Returns:
+            (parents, neighbors, edge positions) for every traversed edge
+        """
+        parents, neighbors, positions = [], [], []
+        if direction in (OUT, BOTH):
+            pos = _gather(self.indptr, frontier)
+            parents.append(np.repeat(frontier, np.diff(self.indptr)[frontier]))
+            neighbors.append(self.indices[pos])
+            positions.append(pos)
+        if direction in (IN, BOTH):
+            rpos = _gather(self.rev_indptr, frontier)
+            parents.append(np.repeat(frontier, np.diff(self.rev_indptr)[frontier]))
+            neighbors.append(self.rev_indices[rpos])
+            positions.append(self.rev_edges[rpos].astype(np.int64))
+
+        parent = np.concatenate(parents)
+        neighbor = np.concatenate(neighbors)
+        position = np.concatenate(positions)
+        if type_mask is not None:
+            keep = type_mask[self.edge_types[position]]
+            parent, neighbor, position = parent[keep], neighbor[keep], position[keep]
+        return parent, neighbor, position
+
+    def _bfs(
+        self,
+        start: int,
+        depth: int | None,
+        direction: str,
+        type_mask: np.ndarray | None,
+    ) -> tuple[np.ndarray, np.ndarray, list[int]]:
+        """
+        Level-synchronous BFS.
+
+        Returns:
+            (levels, parents, visit order); unvisited nodes have level -1
+        """
+        n = len(self.ids)
+        levels = np.full(n, -1, dtype=np.int32)
+        parents = np.full(n, -1, dtype=np.int32)
+        levels[start] = 0
+        order = [start]
+        frontier = np.array([start], dtype=np.int64)
+        level = 0
+        while len(frontier) and (depth is None or level < depth):
+            level += 1
+            parent, neighbor, _ = self._expand(frontier, direction, type_mask)
+            new = levels[neighbor] < 0
+            neighbor, first = np.unique(neighbor[new], return_index=True)
+            if not len(neighbor):
+                break
+            # Keep discovery order rather than ID order
+            by_discovery = np.argsort(first, kind="stable")
+            neighbor = neighbor[by_discovery]
+            levels[neighbor] = level
+            parents[neighbor] = parent[new][first[by_discovery]]
+            order.extend(neighbor.tolist())
+            frontier = neighbor.astype(np.int64)
+        return levels, parents, order
+
+    def bfs(
+        self,
+        source: str,
+        depth: int | None = None,
+        direction: str = OUT,
+        edge_types: Iterable[str] | None = None,
+    ) -> dict[str, int]:
+        """
+        Breadth-first search from a node.
+
+        Args:
+            source: Start node ID
+            depth: Maximum number of hops (None for unbounded)
+            direction: "out", "in" or "both"
+            edge_types: Only follow edges of these types
+
+        Returns:
+            Reached node IDs mapped to their hop distance, in BFS order
+        """
+        if source not in self.index:
+            return {}
+        levels, _, order = self._bfs(
+            self.index[source], depth, direction, self._type_mask(edge_types)
+        )
+        return {self.ids[i]: int(levels[i]) for i in order}
+
+    def k_hop(
+        self,
+        source: str,
+        k: int,
+        direction: str = BOTH,
+        edge_types: Iterable[str] | None = None,
+    ) -> list[str]:
+        """Get the nodes within ``k`` hops of ``source`` (excluding it)."""
+        return list(self.bfs(source, k, direction, edge_types))[1:]
+
+    def shortest_path(
+        self,
+        source: str,
+        target: str,
+        max_depth: int | None = None,
+        direction: str = OUT,
+    ) -> list[str] | None:
+        """Get one shortest path between two nodes, or None."""
+        if source not in self.index or target not in self.index:
+            return None
+        t = self.index[target]
+        levels, parents, _ = self._bfs(self.index[source], max_depth, direction, None)
+        if levels[t] < 0:
+            return None
+        path = [t]
+        while parents[path[-1]] >= 0:
+            path.append(int(parents[path[-1]]))
+        return [self.ids[i] for i in reversed(path)]
+
+    def all_simple_paths(
+        self,
+        source: str,
+        target: str,
+        cutoff: int,
+        limit: int | None = None,
+    ) -> list[list[str]]:
+        """
+        Enumerate simple paths along outgoing edges (depth-first).
+
+        Args:
+            source: Source node ID
+            target: Target node ID
+            cutoff: Maximum number of edges per path
+            limit: Stop after this many paths
+
+        Returns:
+            List of paths (each a list of node IDs)
+        """
+        if source not in self.index or target not in self.index or cutoff < 1:
+            return []
+        s, t = self.index[source], self.index[target]
+        if s == t:
+            return [[source]]
+        indptr, indices = self.indptr, self.indices
+
+        def children(i: int) -> Iterator[int]:
+            return iter(dict.fromkeys(indices[indptr[i]:indptr[i + 1]].tolist()))
+
+        paths: list[list[str]] = []
+        visited = {s: None}
+        stack = [children(s)]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                visited.popitem()
+            elif child in visited:
+                continue
+            elif child == t:
+                paths.append([self.ids[i] for i in (*visited, t)])
+                if limit is not None and len(paths) >= limit:
+                    break
+            elif len(visited) < cutoff:
+                visited[child] = None
+                stack.append(children(child))
+        return paths
+
+    def edge_positions(
+        self,
+        nodes: Iterable[str],
+        direction: str = BOTH,
+    ) -> np.ndarray:
+        """Get the distinct forward edge positions incident to ``nodes``."""
+        frontier = np.fromiter(
+            (self.index[n] for n in nodes if n in self.index), dtype=np.int64
+        )
+        _, _, positions = self._expand(frontier, direction, None)
+        return np.unique(positions)
+
+    def edge_at(self, position: int) -> tuple[str, str, str, float]:
+        """Get the (source_id, target_id, type, weight) of an edge position."""
+        source = int(np.searchsorted(self.indptr, position, side="right")) - 1
+        return (
+            self.ids[source],
+            self.ids[self.indices[position]],
+            self.type_names[self.edge_types[position]],
+            float(self.weights[position]),
+        )
+
+    # ------------------------------------------------------------------
+    # Updates and conversion
+    # ------------------------------------------------------------------
+
+    def patched(
+        self,
+        removed_files: Iterable[str],
+        relinked: Iterable[str],
+        nodes: Iterable[tuple[str, str, str]],
+        edges: Iterable[tuple[str, str, str, float]],
+    ) -> "CSRGraph":
+        """
+        Return a copy with some files' nodes and some out-edges replaced.
+
+        Args:
+            removed_files: Files whose nodes (and incident edges) are dropped
+            relinked: Nodes whose outgoing edges are dropped
+            nodes: New (id, type, file_path) tuples; existing nodes with
+                the same ID are replaced along with their incident edges
+            edges: New (source_id, target_id, type, weight) tuples
+        """
+        nodes = list(nodes)
+        removed = set(removed_files)
+        removed_codes = [
+            code for code, name in enumerate(self.file_names) if name in removed
+        ]
+        keep_node = ~np.isin(self.node_files, removed_codes)
+        # Re-added nodes are replaced along with their incident edges
+        keep_node[[self.index[n[0]] for n in nodes if n[0] in self.index]] = False
+        drop_out = np.zeros(len(self.ids), dtype=bool)
+        drop_out[[self.index[n] for n in relinked if n in self.index]] = True
+
+        sources = self.sources()
+        keep_edge = keep_node[sources] & keep_node[self.indices] & ~drop_out[sources]
+
+        # Kept nodes and edges are spliced as arrays; only the new tuples
+        # are encoded (against the existing vocabularies)
+        kept = np.flatnonzero(keep_node)
+        remap = np.full(len(self.ids), -1, dtype=np.int64)
+        remap[kept] = np.arange(len(kept))
+        columns = _Columns(
+            [self.ids[i] for i in kept.tolist()],
+            self.node_types[kept].tolist(),
+            self.node_files[kept].tolist(),
+            type_names=list(self.type_names),
+            file_names=list(self.file_names),
+        )
+        columns.add_nodes(nodes)
+        new_sources, new_targets, new_types, new_weights = columns.add_edges(edges)
+
+        return CSRGraph(
+            columns.ids,
+            node_types=np.asarray(columns.node_types, dtype=np.uint16),
+            node_files=np.asarray(columns.node_files, dtype=np.int32),
+            sources=np.concatenate([remap[sources[keep_edge]], new_sources]),
+            targets=np.concatenate([remap[self.indices[keep_edge]], new_targets]),
+            edge_types=np.concatenate([self.edge_types[keep_edge], new_types]),
+            weights=np.concatenate([self.weights[keep_edge], new_weights]),
+            type_names=columns.type_names,
+            file_names=columns.file_names,
+        )
+
+    def to_networkx(self) -> Any:
+        """Convert to a NetworkX DiGraph (parallel edges collapse)."""
+        import networkx as nx
+
+        G = nx.DiGraph()
+        G.add_nodes_from(
+            (node_id, {"type": self.type_names[code]})
+            for node_id, code in zip(self.ids, self.node_types.tolist(), strict=True)
+        )
+        G.add_edges_from(
+            (s, t, {"type": et, "weight": w}) for s, t, et, w in self.edges()
+        )
+        return G
@@ -9,14 +9,25 @@ Design Reference: design-core-engine.md
 """
 
 import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from codegraph_mcp.config import StorageConfig
+from codegraph_mcp.core.community_index import CommunityIndex
 from codegraph_mcp.core.graph import GraphEngine, GraphStatistics, QueryResult
 from codegraph_mcp.core.parser import Entity
+from codegraph_mcp.core.snapshot import GraphSnapshot
 from codegraph_mcp.utils.logging import get_logger
 
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+    from codegraph_mcp.core.indexer import IndexResult
+
 logger = get_logger(__name__)
 
 
@@ -26,7 +37,10 @@ class EngineManager:
 
     Provides:
     - Connection pooling via singleton pattern
+    - A pool of read-only connections next to the single writer
     - LRU caching for frequent queries
+    - Shared in-memory graph snapshot for traversal queries
+    - Shared community index for global search
     - Automatic reconnection on failure
     - Graceful shutdown
 
@@ -35,37 +49,63 @@ class EngineManager:
         engine = await manager.get_engine()
         result = await engine.query(...)
         # No need to close - managed by EngineManager
+
+        # Read-only work can run concurrently on pooled connections
+        async with manager.read_engine() as reader:
+            result = await reader.query(...)
     """
 
     _instances: dict[Path, "EngineManager"] = {}
     _lock = asyncio.Lock()
 
-    def __init__(self, repo_path: Path) -> None:
-        """Initialize manager for a repository."""
+    def __init__(self, repo_path: Path, storage: StorageConfig | None = None) -> None:
+        """
+        Initialize manager for a repository.
+
+        Args:
+            repo_path: Repository root
+            storage: Connection pragmas and read pool size
+        """
         self._repo_path = repo_path.resolve()
+        self._storage = storage or StorageConfig()
         self._engine: GraphEngine | None = None
         self._initialized = False
         self._init_lock = asyncio.Lock()
 
+        # Read-only connections, opened on first use
+        self._readers: list[GraphEngine] = []
+        self._idle_readers: asyncio.Queue[GraphEngine] | None = None
+
         # Cache for expensive operations
         self._stats_cache: GraphStatistics | None = None
         self._stats_cache_time: float = 0
         self._entity_cache: dict[str, Entity | None] = {}
         self._cache_ttl = 60.0  # 60 seconds TTL
 
+        # Graph snapshot shared by find_paths, get_subgraph and
+        # community detection (survives reconnects)
+        self._snapshot = GraphSnapshot()
+        # Community summary index shared by global_search calls
+        self._community_index = CommunityIndex()
+
     @classmethod
-    async def get_instance(cls, repo_path: Path) -> "EngineManager":
+    async def get_instance(
+        cls,
+        repo_path: Path,
+        storage: StorageConfig | None = None,
+    ) -> "EngineManager":
         """
         Get or create an EngineManager instance for a repository.
 
-        Thread-safe singleton per repository.
+        Thread-safe singleton per repository. ``storage`` only applies when
+        the instance is created.
         """
         resolved = repo_path.resolve()
 
         async with cls._lock:
             if resolved not in cls._instances:
                 logger.info(f"Creating new EngineManager for {resolved}")
-                cls._instances[resolved] = cls(resolved)
+                cls._instances[resolved] = cls(resolved, storage)
             return cls._instances[resolved]
 
     @classmethod
@@ -99,9 +139,12 @@ class EngineManager:
                 await self._engine.close()
             except Exception:
                 pass
+        await self._close_readers()
 
-        self._engine = GraphEngine(self._repo_path)
+        self._engine = GraphEngine(self._repo_path, storage=self._storage)
         await self._engine.initialize()
+        self._engine.snapshot = self._snapshot
+        self._engine.community_index = self._community_index
         self._initialized = True
         self._clear_cache()
         logger.info(f"GraphEngine initialized for {self._repo_path}")
@@ -109,11 +152,64 @@ class EngineManager:
     async def close(self) -> None:
         """Close the engine connection."""
         async with self._init_lock:
+            await self._close_readers()
             if self._engine:
                 await self._engine.close()
                 self._engine = None
                 self._initialized = False
                 self._clear_cache()
+            self._snapshot.invalidate()
+            self._community_index.invalidate()
+
+    @asynccontextmanager
+    async def read_engine(self) -> AsyncIterator[GraphEngine]:
+        """
+        Borrow a read-only GraphEngine from the pool.
+
+        With WAL journaling, pooled readers see the last committed index
+        while the writer (or a reindex) is busy, so concurrent tool calls
+        do not queue behind a single connection thread. Falls back to the
+        writer when ``read_pool_size`` is 0.
+
+        Yields:
+            Read-only GraphEngine sharing the manager's snapshot and community index
+        """
+        writer = await self.get_engine()
+        if self._storage.read_pool_size <= 0:
+            yield writer
+            return
+
+        async with self._init_lock:
+            if self._idle_readers is None:
+                self._idle_readers = await self._open_readers()
+            idle = self._idle_readers
+
+        engine = await idle.get()
+        try:
+            yield engine
+        finally:
+            idle.put_nowait(engine)
+
+    async def _open_readers(self) -> "asyncio.Queue[GraphEngine]":
+        """Open the read-only connections (the writer created the schema)."""
+        idle: asyncio.Queue[GraphEngine] = asyncio.Queue()
+        for _ in range(self._storage.read_pool_size):
+            engine = GraphEngine(self._repo_path, storage=self._storage, read_only=True)
+            await engine.initialize()
+            engine.snapshot = self._snapshot
+            engine.community_index = self._community_index
+            self._readers.append(engine)
+            idle.put_nowait(engine)
+        logger.info(f"Opened {len(self._readers)} read connections for {self._repo_path}")
+        return idle
+
+    async def _close_readers(self) -> None:
+        """Close all pooled read-only connections."""
+        for engine in self._readers:
+            with suppress(Exception):
+                await engine.close()
+        self._readers.clear()
+        self._idle_readers = None
 
     def _clear_cache(self) -> None:
         """Clear all caches."""
@@ -125,6 +221,34 @@ class EngineManager:
         """Invalidate cache after data modifications."""
         self._clear_cache()
 
+    async def get_graph(self) -> "nx.DiGraph":
+        """
+        Get the code graph as NetworkX, built from the shared snapshot.
+
+        The snapshot itself is refreshed first if the index changed.
+        """
+        engine = await self.get_engine()
+        return await self._snapshot.get_graph(engine)
+
+    async def apply_index_result(self, result: "IndexResult") -> None:
+        """
+        Bring caches and the graph snapshot up to date after indexing.
+
+        Incremental runs patch the snapshot for the changed files only;
+        full runs drop it so it is rebuilt on next use.
+        """
+        self._clear_cache()
+        if not result.incremental:
+            self._snapshot.invalidate()
+            return
+
+        engine = await self.get_engine()
+        await self._snapshot.patch(
+            engine,
+            result.changed_files,
+            result.relinked_entity_ids,
+        )
+
     # Cached operations
 
     async def get_statistics_cached(self) -> GraphStatistics:
@@ -202,6 +326,9 @@ class EngineManager:
                 "repo_path": str(self._repo_path),
                 "entity_count": stats.entity_count,
                 "cache_size": len(self._entity_cache),
+                "read_connections": len(self._readers),
+                "snapshot": self._snapshot.get_stats(),
+                "community_index": self._community_index.get_stats(),
             }
         except Exception as e:
             return {
@@ -2,20 +2,218 @@
 Graph Engine Module
 
 SQLite-based graph storage and query engine for code entities and relations.
-Uses NetworkX for in-memory graph operations and path finding.
+Uses a compact CSR graph for in-memory traversal and path finding.
 
 Requirements: REQ-GRF-001 ~ REQ-GRF-006
 Design Reference: design-core-engine.md §2.2, design-storage.md
 """
 
+import hashlib
 import json
+import re
+import zlib
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import networkx as nx
 
-from codegraph_mcp.core.parser import Entity, EntityType, Relation, RelationType
+from codegraph_mcp.config import StorageConfig
+from codegraph_mcp.core.csr import CSRGraph
+from codegraph_mcp.core.parser import (
+    Entity,
+    EntityColumns,
+    EntityType,
+    Relation,
+    RelationColumns,
+    RelationType,
+)
+from codegraph_mcp.core.resolver import ORIGINAL_TARGET_KEY
+
+
+if TYPE_CHECKING:
+    from codegraph_mcp.core.community_index import CommunityIndex
+    from codegraph_mcp.core.snapshot import GraphSnapshot
+    from codegraph_mcp.storage.vectors import VectorStore
+
+
+# Identifier parts: "parseHTTPResponse2" -> parse, HTTP, Response, 2
+_IDENTIFIER_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+_WORD = re.compile(r"\w+")
+
+# Entity table (REQ-GRF-003). The text indexes are keyed by rowid, so it is
+# declared as an INTEGER PRIMARY KEY, which VACUUM never renumbers.
+_ENTITY_TABLE = """
+CREATE TABLE IF NOT EXISTS {table} (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    qualified_name TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    start_line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    start_column INTEGER DEFAULT 0,
+    end_column INTEGER DEFAULT 0,
+    signature TEXT,
+    docstring TEXT,
+    source_code TEXT,
+    embedding BLOB,
+    community_id INTEGER,
+    metadata TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# bm25 column weights: name, qualified_name, signature, docstring
+_FTS_WEIGHTS = "10.0, 4.0, 2.0, 1.0"
+
+# Accepted values for the keyword pragmas in StorageConfig
+_PRAGMA_CHOICES = {
+    "journal_mode": {"delete", "truncate", "persist", "memory", "wal", "off"},
+    "synchronous": {"off", "normal", "full", "extra"},
+    "temp_store": {"default", "file", "memory"},
+}
+
+# Entity columns read for query results. Source bodies, embedding BLOBs
+# and timestamps stay on disk; bodies are loaded on request (get_sources).
+_ENTITY_COLUMNS = (
+    "id", "type", "name", "qualified_name", "file_path",
+    "start_line", "end_line", "start_column", "end_column",
+    "signature", "docstring", "community_id", "metadata",
+)
+_ENTITY_SELECT = ", ".join(f"e.{column}" for column in _ENTITY_COLUMNS)
+
+
+def _fts_text(value: str | None) -> str:
+    """
+    Text indexed for full-text search.
+
+    The unicode61 tokenizer already splits snake_case at underscores;
+    camelCase parts are appended so "getUserName" matches "user".
+    """
+    if not value:
+        return ""
+    parts = [
+        part
+        for word in _WORD.findall(value)
+        for part in _IDENTIFIER_PART.findall(word)
+        if part.lower() != word.lower()
+    ]
+    return f"{value} {' '.join(parts)}" if parts else value
+
+
+def identifier_terms(text: str | None) -> list[str]:
+    """Lowercase identifier parts of a text ("getUserName" -> get, user, name)."""
+    if not text:
+        return []
+    return [
+        part.lower()
+        for word in _WORD.findall(text)
+        for part in (_IDENTIFIER_PART.findall(word) or [word])
+    ]
+
+
+def _fts_query(text: str, column: str | None = None) -> str | None:
+    """
+    Build an FTS5 MATCH expression from free text.
+
+    Every identifier part must be present as a token prefix. Returns None
+    if the text has no searchable terms.
+    """
+    terms = identifier_terms(text)
+    if not terms:
+        return None
+    prefix = f"{column} : " if column else ""
+    return " AND ".join(f'{prefix}"{term}"*' for term in dict.fromkeys(terms))
+
+
+def _trigram_query(text: str, columns: tuple[str, ...]) -> str | None:
+    """
+    Build a trigram MATCH expression for a literal substring.
+
+    Returns None for substrings shorter than one trigram, which the index
+    cannot answer.
+    """
+    if len(text) < 3:
+        return None
+    phrase = text.replace('"', '""')
+    return f'{{{" ".join(columns)}}} : "{phrase}"'
+
+
+def _compress_source(text: str) -> tuple[str, bytes]:
+    """Content hash and zlib-compressed bytes of an entity body."""
+    data = text.encode("utf-8")
+    return hashlib.sha256(data).hexdigest(), zlib.compress(data, 6)
+
+
+def _like_escape(text: str) -> str:
+    """Escape LIKE wildcards so ``text`` matches literally (ESCAPE '\\')."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class StoredEntity(Entity):
+    """
+    Entity read from the graph database.
+
+    Built from an ``_ENTITY_COLUMNS`` row. ``metadata`` stays as stored
+    JSON text until first accessed, so list-style reads that only return
+    ids, names and locations never decode it.
+    """
+
+    __slots__ = ("_metadata", "_metadata_json", "community_id")
+
+    _metadata: dict[str, Any] | None
+    _metadata_json: str | None
+    community_id: int | None
+
+    def __init__(
+        self,
+        *args: Any,
+        community_id: int | None = None,
+        metadata_json: str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self.community_id = community_id
+        self._metadata_json = metadata_json
+        super().__init__(*args, **kwargs)
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        if self._metadata is None:
+            raw = self._metadata_json
+            self._metadata = json.loads(raw) if raw else {}
+            self._metadata_json = None
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: dict[str, Any] | None) -> None:
+        self._metadata = value
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "StoredEntity":
+        """Create an entity from a row selected with ``_ENTITY_SELECT``."""
+        from codegraph_mcp.core.parser import Location
+
+        return cls(
+            id=row[0],
+            type=EntityType(row[1]),
+            name=row[2],
+            qualified_name=row[3],
+            location=Location(
+                file_path=Path(row[4]),
+                start_line=row[5],
+                end_line=row[6],
+                start_column=row[7] or 0,
+                end_column=row[8] or 0,
+            ),
+            signature=row[9],
+            docstring=row[10],
+            metadata=None,
+            community_id=row[11],
+            metadata_json=row[12],
+        )
 
 
 @dataclass
@@ -109,6 +307,28 @@ class QueryResult:
         return "\n".join(lines)
 
 
+# (file path, entities, relations) for GraphEngine.replace_files
+FileUpdate = tuple[
+    Path,
+    list[Entity] | EntityColumns,
+    list[Relation] | RelationColumns,
+]
+
+
+@dataclass
+class FileReplaceResult:
+    """Result of replacing the entity sets of files."""
+
+    entities_written: int = 0
+    relations_written: int = 0
+    # Entities that no longer exist in their file
+    entities_removed: int = 0
+    removed_ids: list[str] = field(default_factory=list)
+    # Entities in other files whose edges into removed entities were
+    # reverted to placeholders or dropped
+    relinked_ids: set[str] = field(default_factory=set)
+
+
 @dataclass
 class GraphStatistics:
     """Statistics about the graph."""
@@ -137,17 +357,35 @@ class GraphEngine:
         result = engine.query(GraphQuery("find all functions"))
     """
 
-    def __init__(self, repo_path: Path, db_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        repo_path: Path,
+        db_path: Path | None = None,
+        *,
+        storage: StorageConfig | None = None,
+        read_only: bool = False,
+    ) -> None:
         """
         Initialize the graph engine.
 
         Args:
             repo_path: Path to the repository
             db_path: Path to SQLite database (default: .codegraph/graph.db)
+            storage: Connection pragmas (default: StorageConfig())
+            read_only: Open an existing database without write access
         """
         self.repo_path = repo_path
         self.db_path = db_path or (repo_path / ".codegraph" / "graph.db")
+        self.storage = storage or StorageConfig()
+        self.read_only = read_only
         self._connection: Any = None
+        self._fts_enabled = False
+        self._trigram_enabled = False
+        # Shared in-memory graph and community index (attached by EngineManager)
+        self.snapshot: GraphSnapshot | None = None
+        self.community_index: CommunityIndex | None = None
+        # Vector store that follows entity removals (attached while indexing)
+        self.vector_store: VectorStore | None = None
 
     async def initialize(self) -> None:
         """
@@ -157,36 +395,103 @@ class GraphEngine:
         """
         import aiosqlite
 
+        if self.read_only:
+            if not self.db_path.exists():
+                raise FileNotFoundError(f"Database not found: {self.db_path}")
+            self._connection = await aiosqlite.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True
+            )
+            await self._apply_pragmas()
+            await self._detect_text_indexes()
+            return
+
         # Ensure directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         self._connection = await aiosqlite.connect(self.db_path)
+        await self._apply_pragmas()
         await self._create_schema()
 
+    async def _add_missing_columns(self, table: str, columns: dict[str, str]) -> None:
+        """Add columns introduced after a database was created."""
+        cursor = await self._connection.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in await cursor.fetchall()}
+        for name, declaration in columns.items():
+            if name not in existing:
+                await self._connection.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {name} {declaration}"
+                )
+
+    async def _add_entity_rowid(self) -> None:
+        """
+        Rebuild an entity table that predates its explicit rowid.
+
+        Implicit rowids may change on VACUUM, which would point the text
+        indexes at other entities. The rebuild copies the current rowids,
+        so the existing index rows stay valid.
+        """
+        cursor = await self._connection.execute("PRAGMA table_info(entities)")
+        columns = [row[1] for row in await cursor.fetchall()]
+        if not columns or "rowid" in columns:
+            return
+
+        await self._connection.execute(_ENTITY_TABLE.format(table="entities_rebuilt"))
+        cursor = await self._connection.execute("PRAGMA table_info(entities_rebuilt)")
+        copied = ", ".join(
+            column for column in [row[1] for row in await cursor.fetchall()]
+            if column in columns
+        )
+        await self._connection.execute(
+            f"INSERT INTO entities_rebuilt (rowid, {copied}) "
+            f"SELECT rowid, {copied} FROM entities"
+        )
+        await self._connection.execute("DROP TABLE entities")
+        await self._connection.execute("ALTER TABLE entities_rebuilt RENAME TO entities")
+
+    async def _apply_pragmas(self) -> None:
+        """
+        Apply the connection pragmas from ``self.storage``.
+
+        ``journal_mode`` and ``synchronous`` only apply to writers; WAL is
+        persistent, so read-only connections inherit it from the file.
+
+        Raises:
+            ValueError: If a keyword pragma has an unsupported value
+        """
+        storage = self.storage
+        keywords = {"temp_store": storage.temp_store}
+        if not self.read_only:
+            keywords["journal_mode"] = storage.journal_mode
+            keywords["synchronous"] = storage.synchronous
+        for pragma, value in keywords.items():
+            if value.lower() not in _PRAGMA_CHOICES[pragma]:
+                raise ValueError(f"Unsupported {pragma}: {value!r}")
+            await self._connection.execute(f"PRAGMA {pragma} = {value.lower()}")
+
+        # Negative cache_size is in KiB
+        await self._connection.execute(
+            f"PRAGMA cache_size = {-int(storage.cache_size_mb) * 1024}"
+        )
+        await self._connection.execute(
+            f"PRAGMA mmap_size = {int(storage.mmap_size_mb) * 1024 * 1024}"
+        )
+
+    async def _detect_text_indexes(self) -> None:
+        """Enable the text indexes a read-only database already has."""
+        cursor = await self._connection.execute(
+            """
+            SELECT name FROM sqlite_master
+            WHERE name IN ('entities_fts', 'entities_trigram')
+            """
+        )
+        tables = {row[0] for row in await cursor.fetchall()}
+        self._fts_enabled = "entities_fts" in tables
+        self._trigram_enabled = "entities_trigram" in tables
+
     async def _create_schema(self) -> None:
         """Create database schema if not exists."""
-        schema = """
-        -- Entity table (REQ-GRF-003)
-        CREATE TABLE IF NOT EXISTS entities (
-            id TEXT PRIMARY KEY,
-            type TEXT NOT NULL,
-            name TEXT NOT NULL,
-            qualified_name TEXT NOT NULL,
-            file_path TEXT NOT NULL,
-            start_line INTEGER NOT NULL,
-            end_line INTEGER NOT NULL,
-            start_column INTEGER DEFAULT 0,
-            end_column INTEGER DEFAULT 0,
-            signature TEXT,
-            docstring TEXT,
-            source_code TEXT,
-            embedding BLOB,
-            community_id INTEGER,
-            metadata TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-
+        await self._add_entity_rowid()
+        schema = _ENTITY_TABLE.format(table="entities") + """
         -- Relations table (REQ-GRF-004)
         CREATE TABLE IF NOT EXISTS relations (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -207,6 +512,8 @@ class GraphEngine:
             summary TEXT,
             member_count INTEGER DEFAULT 0,
             parent_id INTEGER,
+            degree REAL,
+            summary_hash TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (parent_id) REFERENCES communities(id)
         );
@@ -218,7 +525,44 @@ class GraphEngine:
             hash TEXT NOT NULL,
             size INTEGER,
             entity_count INTEGER DEFAULT 0,
-            indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            mtime_ns INTEGER,
+            inode INTEGER
+        );
+
+        -- Indexing run state (resume after interrupted runs)
+        CREATE TABLE IF NOT EXISTS index_state (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- Embedding row mapping (vectors live in embeddings.f32)
+        CREATE TABLE IF NOT EXISTS embedding_rows (
+            entity_id TEXT PRIMARY KEY,
+            row INTEGER NOT NULL,
+            content_hash TEXT
+        );
+
+        -- Entity bodies, zlib-compressed and shared by content hash
+        -- (kept out of entities so row scans stay small)
+        CREATE TABLE IF NOT EXISTS source_blobs (
+            hash TEXT PRIMARY KEY,
+            data BLOB NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS entity_sources (
+            entity_id TEXT PRIMARY KEY,
+            hash TEXT NOT NULL
+        );
+
+        -- Community summaries by content hash of the members and their
+        -- sources (survives re-detection, which renumbers communities)
+        CREATE TABLE IF NOT EXISTS community_summaries (
+            hash TEXT PRIMARY KEY,
+            summary TEXT NOT NULL,
+            embedding BLOB,
+            embedding_model TEXT
         );
 
         -- Indexes (REQ-GRF-006)
@@ -232,20 +576,335 @@ class GraphEngine:
         CREATE INDEX IF NOT EXISTS idx_relations_type ON relations(type);
         CREATE UNIQUE INDEX IF NOT EXISTS idx_relations_unique
             ON relations(source_id, target_id, type);
+        CREATE INDEX IF NOT EXISTS idx_entity_sources_hash ON entity_sources(hash);
         """
 
         for statement in schema.split(";"):
             statement = statement.strip()
             if statement:
                 await self._connection.execute(statement)
+        await self._add_missing_columns("files", {"mtime_ns": "INTEGER", "inode": "INTEGER"})
+        await self._add_missing_columns(
+            "communities", {"degree": "REAL", "summary_hash": "TEXT"}
+        )
+        await self._add_missing_columns(
+            "community_summaries", {"embedding": "BLOB", "embedding_model": "TEXT"}
+        )
+        await self._add_missing_columns("embedding_rows", {"content_hash": "TEXT"})
         await self._connection.commit()
 
+        await self._create_fts()
+
+    async def _create_fts(self) -> None:
+        """
+        Create the full-text index over entity names and docs.
+
+        ``entities_fts`` rows share the (explicit, stable) rowid of their
+        ``entities`` row.
+        Databases indexed before the table existed are backfilled once.
+        """
+        try:
+            await self._connection.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5(
+                    name, qualified_name, signature, docstring,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+                """
+            )
+        except Exception:
+            # SQLite built without FTS5: fall back to LIKE scans
+            self._fts_enabled = False
+            return
+        self._fts_enabled = True
+
+        if await self.get_index_state("fts_built") is None:
+            await self._connection.execute("DELETE FROM entities_fts")
+            cursor = await self._connection.execute(
+                "SELECT rowid, name, qualified_name, signature, docstring FROM entities"
+            )
+            await self._connection.executemany(
+                """
+                INSERT INTO entities_fts (rowid, name, qualified_name, signature, docstring)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (row[0], *(_fts_text(value) for value in row[1:]))
+                    for row in await cursor.fetchall()
+                ],
+            )
+            await self.set_index_state("fts_built", "1")
+
+        await self._create_trigram()
+
+    async def _create_trigram(self) -> None:
+        """
+        Create the trigram index used for substring matching.
+
+        ``entities_trigram`` holds the raw id, name and qualified name so
+        partial IDs and infix names resolve through the index instead of
+        ``LIKE '%...%'`` scans.
+        """
+        try:
+            await self._connection.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS entities_trigram USING fts5(
+                    id, name, qualified_name,
+                    tokenize = 'trigram'
+                )
+                """
+            )
+        except Exception:
+            # SQLite < 3.34 has no trigram tokenizer: keep LIKE scans
+            self._trigram_enabled = False
+            return
+        self._trigram_enabled = True
+
+        if await self.get_index_state("trigram_built") is None:
+            await self._connection.execute("DELETE FROM entities_trigram")
+            await self._connection.execute(
+                """
+                INSERT INTO entities_trigram (rowid, id, name, qualified_name)
+                SELECT rowid, id, name, qualified_name FROM entities
+                """
+            )
+            await self.set_index_state("trigram_built", "1")
+
+    async def _fts_delete(self, entity_ids: list[str]) -> None:
+        """Remove the text-index rows of entities (before they are replaced)."""
+        params = [(entity_id,) for entity_id in entity_ids]
+        if self._fts_enabled:
+            await self._connection.executemany(
+                """
+                DELETE FROM entities_fts
+                WHERE rowid = (SELECT rowid FROM entities WHERE id = ?)
+                """,
+                params,
+            )
+        if self._trigram_enabled:
+            await self._connection.executemany(
+                """
+                DELETE FROM entities_trigram
+                WHERE rowid = (SELECT rowid FROM entities WHERE id = ?)
+                """,
+                params,
+            )
+
+    async def _fts_insert(self, entities: EntityColumns) -> None:
+        """Index stored entities for full-text and substring search."""
+        ids, names, qualified_names = entities.id, entities.name, entities.qualified_name
+        signatures, docstrings = entities.signature, entities.docstring
+        # Later duplicates replaced earlier ones in entities
+        last = {entity_id: i for i, entity_id in enumerate(ids)}
+        if len(last) != len(ids):
+            keep = sorted(last.values())
+            ids = [ids[i] for i in keep]
+            names = [names[i] for i in keep]
+            qualified_names = [qualified_names[i] for i in keep]
+            signatures = [signatures[i] for i in keep]
+            docstrings = [docstrings[i] for i in keep]
+        if self._trigram_enabled:
+            await self._connection.executemany(
+                """
+                INSERT INTO entities_trigram (rowid, id, name, qualified_name)
+                SELECT rowid, id, name, qualified_name FROM entities WHERE id = ?
+                """,
+                [(entity_id,) for entity_id in ids],
+            )
+        if self._fts_enabled:
+            await self._connection.executemany(
+                """
+                INSERT INTO entities_fts (rowid, name, qualified_name, signature, docstring)
+                SELECT rowid, ?, ?, ?, ? FROM entities WHERE id = ?
+                """,
+                zip(
+                    map(_fts_text, names),
+                    map(_fts_text, qualified_names),
+                    map(_fts_text, signatures),
+                    map(_fts_text, docstrings),
+                    ids,
+                    strict=True,
+                ),
+            )
+
+    async def _fts_search(
+        self,
+        text: str,
+        column: str | None = None,
+        filters: str = "",
+        params: list[Any] | None = None,
+        limit: int = 20,
+    ) -> list[tuple] | None:
+        """
+        Full-text search ranked by bm25.
+
+        Args:
+            text: Free-text query
+            column: Restrict matching to one column (e.g. "name")
+            filters: Extra SQL conditions on entities ``e`` (with leading AND)
+            params: Parameters for ``filters``
+            limit: Maximum rows
+
+        Returns:
+            Entity rows (``_ENTITY_SELECT``), or None if full-text search is
+            unavailable or the query has no searchable terms
+        """
+        match = _fts_query(text, column) if self._fts_enabled else None
+        if match is None:
+            return None
+        cursor = await self._connection.execute(
+            f"""
+            SELECT {_ENTITY_SELECT} FROM entities_fts
+            JOIN entities e ON e.rowid = entities_fts.rowid
+            WHERE entities_fts MATCH ?{filters}
+            ORDER BY
+                CASE WHEN e.name = ? THEN 0 ELSE 1 END,
+                bm25(entities_fts, {_FTS_WEIGHTS}),
+                LENGTH(e.name)
+            LIMIT ?
+            """,
+            [match, *(params or []), text, limit],
+        )
+        return await cursor.fetchall()
+
+    async def _substring_search(
+        self,
+        text: str,
+        *,
+        columns: tuple[str, ...] = ("name", "qualified_name"),
+        filters: str = "",
+        params: list[Any] | None = None,
+        limit: int = 20,
+    ) -> list[Any] | None:
+        """
+        Find entities containing ``text`` through the trigram index.
+
+        Args:
+            text: Literal substring (case-insensitive)
+            columns: Trigram columns to match
+            filters: Extra SQL conditions on entities ``e`` (with leading AND)
+            params: Parameters for ``filters``
+            limit: Maximum rows
+
+        Returns:
+            Entity rows (``_ENTITY_SELECT``) ordered by exact name match, name
+            length and id, or None if the trigram index cannot answer
+        """
+        match = _trigram_query(text, columns) if self._trigram_enabled else None
+        if match is None:
+            return None
+        cursor = await self._connection.execute(
+            f"""
+            SELECT {_ENTITY_SELECT} FROM entities_trigram
+            JOIN entities e ON e.rowid = entities_trigram.rowid
+            WHERE entities_trigram MATCH ?{filters}
+            ORDER BY
+                CASE WHEN e.name = ? THEN 0 ELSE 1 END,
+                LENGTH(e.name),
+                e.id
+            LIMIT ?
+            """,
+            [match, *(params or []), text, limit],
+        )
+        return await cursor.fetchall()
+
+    async def _text_search(
+        self,
+        text: str,
+        *,
+        column: str | None = None,
+        filters: str = "",
+        params: list[Any] | None = None,
+        limit: int = 20,
+    ) -> list[Any] | None:
+        """
+        Token matches from full-text search, then substring matches.
+
+        Full-text hits (whole identifier parts: "parse" in parse_file) come
+        first; infix hits from the trigram index ("reparse") fill the rest
+        of ``limit``, without duplicates.
+
+        Args:
+            text: Query text
+            column: Restrict matching to one column (e.g. "name")
+            filters: Extra SQL conditions on entities ``e`` (with leading AND)
+            params: Parameters for ``filters``
+            limit: Maximum rows
+
+        Returns:
+            Entity rows (``_ENTITY_SELECT``), or None if neither index can
+            answer and the caller must scan
+        """
+        rows = await self._fts_search(text, column, filters=filters, params=params, limit=limit)
+        if rows and len(rows) >= limit:
+            return rows
+        substrings = await self._substring_search(
+            text,
+            columns=(column,) if column else ("name", "qualified_name"),
+            filters=filters,
+            params=params,
+            limit=limit,
+        )
+        if not rows:
+            return substrings
+        if substrings:
+            seen = {row[0] for row in rows}
+            rows.extend(row for row in substrings if row[0] not in seen)
+        return rows[:limit]
+
     async def close(self) -> None:
         """Close database connection."""
         if self._connection:
             await self._connection.close()
             self._connection = None
 
+    async def get_index_state(self, key: str) -> str | None:
+        """Get an indexing state value (e.g. "status")."""
+        cursor = await self._connection.execute(
+            "SELECT value FROM index_state WHERE key = ?",
+            (key,),
+        )
+        row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def set_index_state(self, key: str, value: str) -> None:
+        """Set an indexing state value."""
+        await self._connection.execute(
+            """
+            INSERT OR REPLACE INTO index_state (key, value, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            """,
+            (key, value),
+        )
+        await self._connection.commit()
+
+    async def get_generation(self, key: str = "graph_generation") -> int:
+        """
+        Get the graph generation.
+
+        The generation increases whenever entities or relations are written,
+        so in-memory snapshots can detect that they are stale. The
+        ``community_generation`` counter does the same for communities,
+        their summaries and summary embeddings.
+        """
+        cursor = await self._connection.execute(
+            "SELECT value FROM index_state WHERE key = ?", (key,)
+        )
+        row = await cursor.fetchone()
+        return int(row[0]) if row else 0
+
+    async def _bump_generation(self, key: str = "graph_generation") -> None:
+        """Advance a generation counter (committed by the caller)."""
+        await self._connection.execute(
+            """
+            INSERT INTO index_state (key, value) VALUES (?, '1')
+            ON CONFLICT(key) DO UPDATE SET
+                value = CAST(value AS INTEGER) + 1,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (key,),
+        )
+
     async def add_entity(self, entity: Entity) -> str:
         """
         Add an entity to the graph.
@@ -260,12 +919,13 @@ class GraphEngine:
         """
         import json
 
+        await self._fts_delete([entity.id])
         await self._connection.execute(
             """
             INSERT OR REPLACE INTO entities
             (id, type, name, qualified_name, file_path, start_line, end_line,
-             start_column, end_column, signature, docstring, source_code, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             start_column, end_column, signature, docstring, metadata)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 entity.id,
@@ -279,10 +939,13 @@ class GraphEngine:
                 entity.location.end_column,
                 entity.signature,
                 entity.docstring,
-                entity.source_code,
                 json.dumps(entity.metadata),
             ),
         )
+        columns = EntityColumns.from_entities([entity])
+        await self._fts_insert(columns)
+        await self._store_sources(columns)
+        await self._bump_generation()
         await self._connection.commit()
         return entity.id
 
@@ -314,10 +977,11 @@ class GraphEngine:
                 json.dumps(relation.metadata),
             ),
         )
+        await self._bump_generation()
         await self._connection.commit()
         return cursor.lastrowid
 
-    async def add_entities_batch(self, entities: list[Entity]) -> int:
+    async def add_entities_batch(self, entities: list[Entity] | EntityColumns) -> int:
         """
         Add multiple entities in a single batch operation.
 
@@ -325,7 +989,7 @@ class GraphEngine:
         because it uses executemany and commits once at the end.
 
         Args:
-            entities: List of entities to add.
+            entities: Entities to add, as objects or columns.
 
         Returns:
             Number of entities added.
@@ -333,35 +997,174 @@ class GraphEngine:
         if not entities:
             return 0
 
-        data = [
-            (
-                entity.id,
-                entity.type.value,
-                entity.name,
-                entity.qualified_name,
-                str(entity.file_path),
-                entity.start_line,
-                entity.end_line,
-                entity.signature or "",
-                entity.docstring or "",
-                json.dumps(entity.metadata),
-            )
-            for entity in entities
-        ]
+        await self._upsert_entities(entities)
+        await self._bump_generation()
+        await self._connection.commit()
+        return len(entities)
+
+    async def _upsert_entities(self, entities: list[Entity] | EntityColumns) -> None:
+        """
+        Insert or update entities and their text-index rows (no commit).
 
+        Re-parsed entities keep their community so incremental community
+        maintenance starts from the previous assignment.
+        """
+        if not isinstance(entities, EntityColumns):
+            entities = EntityColumns.from_entities(entities)
+
+        await self._fts_delete(entities.id)
         await self._connection.executemany(
             """
-            INSERT OR REPLACE INTO entities
+            INSERT INTO entities
             (id, type, name, qualified_name, file_path,
              start_line, end_line, signature, docstring, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, COALESCE(?, ''), COALESCE(?, ''), ?)
+            ON CONFLICT(id) DO UPDATE SET
+                type = excluded.type,
+                name = excluded.name,
+                qualified_name = excluded.qualified_name,
+                file_path = excluded.file_path,
+                start_line = excluded.start_line,
+                end_line = excluded.end_line,
+                start_column = 0,
+                end_column = 0,
+                signature = excluded.signature,
+                docstring = excluded.docstring,
+                source_code = NULL,
+                embedding = NULL,
+                metadata = excluded.metadata,
+                updated_at = CURRENT_TIMESTAMP
             """,
-            data,
+            zip(
+                entities.id,
+                entities.type,
+                entities.name,
+                entities.qualified_name,
+                entities.file_path,
+                entities.start_line,
+                entities.end_line,
+                entities.signature,
+                entities.docstring,
+                entities.metadata,
+                strict=True,
+            ),
+        )
+        await self._fts_insert(entities)
+        await self._store_sources(entities)
+
+    async def _source_hashes(self, entity_ids: list[str]) -> set[str]:
+        """Content hashes currently referenced by the given entities."""
+        hashes: set[str] = set()
+        for i in range(0, len(entity_ids), 500):
+            chunk = entity_ids[i:i + 500]
+            cursor = await self._connection.execute(
+                f"""
+                SELECT DISTINCT hash FROM entity_sources
+                WHERE entity_id IN ({','.join('?' * len(chunk))})
+                """,
+                chunk,
+            )
+            hashes.update(row[0] for row in await cursor.fetchall())
+        return hashes
+
+    async def _store_sources(self, entities: EntityColumns) -> None:
+        """
+        Store entity bodies in the compressed side table (no commit).
+
+        Identical bodies (e.g. overloads, copies across files) are stored
+        once. Entities written without a body lose their old one.
+        """
+        unique = dict(zip(entities.id, entities.source_code, strict=True))
+        previous = await self._source_hashes(list(unique))
+
+        blobs: dict[str, bytes] = {}
+        mapping: list[tuple[str, str]] = []
+        for entity_id, source_code in unique.items():
+            if source_code:
+                content_hash, data = _compress_source(source_code)
+                blobs[content_hash] = data
+                mapping.append((entity_id, content_hash))
+
+        await self._connection.executemany(
+            "INSERT OR IGNORE INTO source_blobs (hash, data) VALUES (?, ?)",
+            list(blobs.items()),
+        )
+        await self._connection.executemany(
+            "INSERT OR REPLACE INTO entity_sources (entity_id, hash) VALUES (?, ?)",
+            mapping,
+        )
+        await self._connection.executemany(
+            "DELETE FROM entity_sources WHERE entity_id = ?",
+            [(entity_id,) for entity_id, source_code in unique.items() if not source_code],
+        )
+        await self._prune_sources(previous - blobs.keys())
+
+    async def _delete_sources(self, entity_ids: list[str]) -> None:
+        """Drop the bodies of deleted entities (no commit)."""
+        previous = await self._source_hashes(entity_ids)
+        await self._connection.executemany(
+            "DELETE FROM entity_sources WHERE entity_id = ?",
+            [(entity_id,) for entity_id in entity_ids],
+        )
+        await self._prune_sources(previous)
+
+    async def _prune_sources(self, hashes: set[str]) -> None:
+        """Delete the given blobs unless another entity still uses them."""
+        await self._connection.executemany(
+            """
+            DELETE FROM source_blobs
+            WHERE hash = ?
+              AND NOT EXISTS (SELECT 1 FROM entity_sources WHERE hash = ?)
+            """,
+            [(content_hash, content_hash) for content_hash in hashes],
         )
-        await self._connection.commit()
-        return len(entities)
 
-    async def add_relations_batch(self, relations: list[Relation]) -> int:
+    async def get_sources(self, entity_ids: list[str]) -> dict[str, str]:
+        """
+        Get the source bodies of entities.
+
+        Bodies are only read and decompressed here, never by the regular
+        entity reads. Rows written before the side table existed keep
+        their inline ``source_code``.
+
+        Args:
+            entity_ids: Entity IDs
+
+        Returns:
+            Mapping of entity ID to source (entities without source omitted)
+        """
+        ids = list(dict.fromkeys(entity_ids))
+        sources: dict[str, str] = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            cursor = await self._connection.execute(
+                f"""
+                SELECT e.id, b.data, e.source_code FROM entities e
+                LEFT JOIN entity_sources s ON s.entity_id = e.id
+                LEFT JOIN source_blobs b ON b.hash = s.hash
+                WHERE e.id IN ({','.join('?' * len(chunk))})
+                """,
+                chunk,
+            )
+            for entity_id, data, inline in await cursor.fetchall():
+                if data is not None:
+                    sources[entity_id] = zlib.decompress(data).decode("utf-8")
+                elif inline:
+                    sources[entity_id] = inline
+        return sources
+
+    async def load_sources(self, entities: list[Entity]) -> list[Entity]:
+        """Fill in ``source_code`` on entities that were read without it."""
+        missing = [entity for entity in entities if entity.source_code is None]
+        if missing:
+            sources = await self.get_sources([entity.id for entity in missing])
+            for entity in missing:
+                entity.source_code = sources.get(entity.id)
+        return entities
+
+    async def add_relations_batch(
+        self, relations: list[Relation] | RelationColumns
+    ) -> int:
         """
         Add multiple relations in a single batch operation.
 
@@ -369,7 +1172,7 @@ class GraphEngine:
         because it uses executemany and commits once at the end.
 
         Args:
-            relations: List of relations to add.
+            relations: Relations to add, as objects or columns.
 
         Returns:
             Number of relations added.
@@ -377,16 +1180,15 @@ class GraphEngine:
         if not relations:
             return 0
 
-        data = [
-            (
-                relation.source_id,
-                relation.target_id,
-                relation.type.value,
-                relation.weight,
-                json.dumps(relation.metadata),
-            )
-            for relation in relations
-        ]
+        await self._insert_relations(relations)
+        await self._bump_generation()
+        await self._connection.commit()
+        return len(relations)
+
+    async def _insert_relations(self, relations: list[Relation] | RelationColumns) -> None:
+        """Insert relations, ignoring duplicates (no commit)."""
+        if not isinstance(relations, RelationColumns):
+            relations = RelationColumns.from_relations(relations)
 
         await self._connection.executemany(
             """
@@ -394,10 +1196,143 @@ class GraphEngine:
             (source_id, target_id, type, weight, metadata)
             VALUES (?, ?, ?, ?, ?)
             """,
-            data,
+            zip(
+                relations.source_id,
+                relations.target_id,
+                relations.type,
+                relations.weight,
+                relations.metadata,
+                strict=True,
+            ),
         )
-        await self._connection.commit()
-        return len(relations)
+
+    async def replace_files(
+        self,
+        files: list[FileUpdate],
+    ) -> FileReplaceResult:
+        """
+        Replace the entity sets of re-parsed files in one transaction.
+
+        Entity IDs contain line numbers, so an edit usually renames them.
+        For each file the stored IDs are diffed with the new ones:
+        vanished entities are deleted, the file's own outgoing relations
+        are replaced by the new ones, and the rest is upserted. Resolved
+        edges from other files into vanished entities are reverted to
+        their placeholder (``original_target``) so the resolver can link
+        them to the new entity; other edges into them are dropped.
+
+        Args:
+            files: (file path, entities, relations) for each file, as
+                objects or columns; an empty entity list removes the file
+                from the graph
+
+        Returns:
+            FileReplaceResult with counts and the relinked entities
+        """
+        result = FileReplaceResult()
+        if not files:
+            return result
+
+        try:
+            if await self._replace_files(files, result):
+                await self._bump_generation()
+            await self._connection.commit()
+        except Exception:
+            await self._connection.rollback()
+            raise
+
+        # Their embedding rows went with them; drop the vectors as well
+        if self.vector_store is not None:
+            for entity_id in result.removed_ids:
+                self.vector_store.remove(entity_id)
+        return result
+
+    async def _replace_files(
+        self,
+        files: list[FileUpdate],
+        result: FileReplaceResult,
+    ) -> bool:
+        """Body of replace_files (no commit); returns whether anything changed."""
+        chunk_size = 500
+        paths = list(dict.fromkeys(str(file_path) for file_path, _, _ in files))
+        old_ids: set[str] = set()
+        for i in range(0, len(paths), chunk_size):
+            chunk = paths[i:i + chunk_size]
+            cursor = await self._connection.execute(
+                f"SELECT id FROM entities WHERE file_path IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            old_ids.update(row[0] for row in await cursor.fetchall())
+
+        entities = EntityColumns()
+        relations = RelationColumns()
+        for _, file_entities, file_relations in files:
+            if not isinstance(file_entities, EntityColumns):
+                file_entities = EntityColumns.from_entities(file_entities)
+            if not isinstance(file_relations, RelationColumns):
+                file_relations = RelationColumns.from_relations(file_relations)
+            entities.extend(file_entities)
+            relations.extend(file_relations)
+        if not (old_ids or entities or relations):
+            return False
+        vanished = sorted(old_ids.difference(entities.id))
+        owned = sorted(old_ids)
+
+        # The files' outgoing edges are re-emitted by the parse
+        for i in range(0, len(owned), chunk_size):
+            chunk = owned[i:i + chunk_size]
+            await self._connection.execute(
+                f"DELETE FROM relations WHERE source_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+
+        for i in range(0, len(vanished), chunk_size):
+            chunk = vanished[i:i + chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = await self._connection.execute(
+                f"SELECT DISTINCT source_id FROM relations WHERE target_id IN ({placeholders})",
+                chunk,
+            )
+            result.relinked_ids.update(row[0] for row in await cursor.fetchall())
+
+            # Resolved edges fall back to their placeholder; a duplicate
+            # placeholder edge makes the update a no-op and the row is dropped
+            await self._connection.execute(
+                f"""
+                UPDATE OR IGNORE relations
+                SET target_id = json_extract(metadata, '$.{ORIGINAL_TARGET_KEY}'),
+                    metadata = json_remove(metadata, '$.{ORIGINAL_TARGET_KEY}')
+                WHERE target_id IN ({placeholders})
+                  AND json_extract(metadata, '$.{ORIGINAL_TARGET_KEY}') IS NOT NULL
+                """,
+                chunk,
+            )
+            await self._connection.execute(
+                f"DELETE FROM relations WHERE target_id IN ({placeholders})",
+                chunk,
+            )
+
+            await self._fts_delete(chunk)
+            await self._delete_sources(chunk)
+            await self._connection.execute(
+                f"DELETE FROM entities WHERE id IN ({placeholders})",
+                chunk,
+            )
+            await self._connection.execute(
+                f"DELETE FROM embedding_rows WHERE entity_id IN ({placeholders})",
+                chunk,
+            )
+
+        if entities:
+            await self._upsert_entities(entities)
+        if relations:
+            await self._insert_relations(relations)
+
+        result.entities_written = len(entities)
+        result.relations_written = len(relations)
+        result.entities_removed = len(vanished)
+        result.removed_ids = vanished
+        return True
 
     async def resolve_entity_id(
         self,
@@ -411,8 +1346,12 @@ class GraphEngine:
         - Exact match: Returns if entity_id matches exactly
         - Name match: Searches by entity name
         - Qualified name suffix: Searches by qualified_name ending
+        - Partial ID: "module.py::name::12" matches the end of an ID
         - File + name: "filename::name" pattern
 
+        Suffix matches go through the trigram index; ties are ranked by
+        ID length, then ID, so the result does not depend on row order.
+
         Args:
             entity_id: Full or partial entity identifier
             entity_type: Optional type filter
@@ -434,15 +1373,15 @@ class GraphEngine:
         params: list[Any] = []
 
         if entity_type:
-            type_filter = " AND type = ?"
+            type_filter = " AND e.type = ?"
             params.append(entity_type.value)
 
         # Try name exact match (may return multiple)
         cursor = await self._connection.execute(
             f"""
-            SELECT id, qualified_name FROM entities
-            WHERE name = ?{type_filter}
-            ORDER BY LENGTH(id) ASC
+            SELECT e.id FROM entities e
+            WHERE e.name = ?{type_filter}
+            ORDER BY LENGTH(e.id), e.id
             LIMIT 10
             """,
             [entity_id, *params],
@@ -454,15 +1393,32 @@ class GraphEngine:
             # Multiple matches - ambiguous, return None
             return None
 
-        # Try qualified_name suffix match
+        # Try qualified_name (and, for "::" forms, ID) suffix match
+        suffix = f"%{_like_escape(entity_id)}"
+        columns: tuple[str, ...] = ("qualified_name",)
+        suffix_filter = "e.qualified_name LIKE ? ESCAPE '\\'"
+        suffix_params = [suffix]
+        if "::" in entity_id:
+            columns = ("id", "qualified_name")
+            suffix_filter = f"({suffix_filter} OR e.id LIKE ? ESCAPE '\\')"
+            suffix_params.append(suffix)
+
+        match = _trigram_query(entity_id, columns) if self._trigram_enabled else None
+        if match is not None:
+            # Trigram candidates only; LIKE then checks the suffix
+            source = """entities_trigram
+                JOIN entities e ON e.rowid = entities_trigram.rowid
+                WHERE entities_trigram MATCH ? AND"""
+            suffix_params.insert(0, match)
+        else:
+            source = "entities e WHERE"
         cursor = await self._connection.execute(
             f"""
-            SELECT id FROM entities
-            WHERE qualified_name LIKE ?{type_filter}
-            ORDER BY LENGTH(id) ASC
+            SELECT e.id FROM {source} {suffix_filter}{type_filter}
+            ORDER BY LENGTH(e.id), e.id
             LIMIT 10
             """,
-            [f"%{entity_id}", *params],
+            [*suffix_params, *params],
         )
         rows = await cursor.fetchall()
         if len(rows) == 1:
@@ -477,12 +1433,12 @@ class GraphEngine:
             file_part, name_part = parts[0], parts[1]
             cursor = await self._connection.execute(
                 f"""
-                SELECT id FROM entities
-                WHERE name = ? AND file_path LIKE ?{type_filter}
-                ORDER BY LENGTH(id) ASC
+                SELECT e.id FROM entities e
+                WHERE e.name = ? AND e.file_path LIKE ? ESCAPE '\\'{type_filter}
+                ORDER BY LENGTH(e.id), e.id
                 LIMIT 10
                 """,
-                [name_part, f"%{file_part}%", *params],
+                [name_part, f"%{_like_escape(file_part)}%", *params],
             )
             rows = await cursor.fetchall()
             if rows:
@@ -511,14 +1467,26 @@ class GraphEngine:
         params: list[Any] = [f"%{pattern}%", f"%{pattern}%"]
 
         if entity_type:
-            type_filter = " AND type = ?"
+            type_filter = " AND e.type = ?"
             params.append(entity_type.value)
 
+        # Indexed full-text and substring search unless the caller uses
+        # LIKE wildcards
+        if "%" not in pattern:
+            rows = await self._text_search(
+                pattern,
+                filters=type_filter,
+                params=params[2:],
+                limit=limit,
+            )
+            if rows is not None:
+                return [self._row_to_entity(row) for row in rows]
+
         params.append(limit)
 
         cursor = await self._connection.execute(
             f"""
-            SELECT * FROM entities
+            SELECT {_ENTITY_SELECT} FROM entities e
             WHERE (name LIKE ? OR qualified_name LIKE ?){type_filter}
             ORDER BY
                 CASE WHEN name = ? THEN 0 ELSE 1 END,
@@ -530,20 +1498,36 @@ class GraphEngine:
         rows = await cursor.fetchall()
         return [self._row_to_entity(row) for row in rows]
 
-    async def get_entity(self, entity_id: str) -> Entity | None:
-        """Get an entity by ID (supports partial matching)."""
+    async def get_entity(
+        self,
+        entity_id: str,
+        include_source: bool = False,
+    ) -> Entity | None:
+        """
+        Get an entity by ID (supports partial matching).
+
+        Args:
+            entity_id: Full or partial entity identifier
+            include_source: Also load the entity's source body
+
+        Returns:
+            Entity or None if not found/ambiguous
+        """
         # Try to resolve partial ID
         resolved_id = await self.resolve_entity_id(entity_id)
         if not resolved_id:
             return None
 
         cursor = await self._connection.execute(
-            "SELECT * FROM entities WHERE id = ?",
+            f"SELECT {_ENTITY_SELECT} FROM entities e WHERE id = ?",
             (resolved_id,),
         )
         row = await cursor.fetchone()
         if row:
-            return self._row_to_entity(row)
+            entity = self._row_to_entity(row)
+            if include_source:
+                await self.load_sources([entity])
+            return entity
         return None
 
     async def find_callers(self, entity_id: str) -> list[Entity]:
@@ -560,8 +1544,8 @@ class GraphEngine:
             return []
 
         cursor = await self._connection.execute(
-            """
-            SELECT e.* FROM entities e
+            f"""
+            SELECT {_ENTITY_SELECT} FROM entities e
             JOIN relations r ON e.id = r.source_id
             WHERE r.target_id = ? AND r.type = 'calls'
             """,
@@ -584,8 +1568,8 @@ class GraphEngine:
             return []
 
         cursor = await self._connection.execute(
-            """
-            SELECT e.* FROM entities e
+            f"""
+            SELECT {_ENTITY_SELECT} FROM entities e
             JOIN relations r ON e.id = r.target_id
             WHERE r.source_id = ? AND r.type = 'calls'
             """,
@@ -609,37 +1593,86 @@ class GraphEngine:
         if not resolved_id:
             return QueryResult(entities=[], relations=[])
 
-        visited: set[str] = set()
-        entities: list[Entity] = []
+        if self.snapshot is not None:
+            return await self._find_dependencies_from_graph(resolved_id, depth)
+
+        # Level-synchronous expansion: one batched query per depth level
+        visited: dict[str, None] = {resolved_id: None}
         relations: list[Relation] = []
+        frontier = [resolved_id]
+        for level in range(depth + 1):
+            next_frontier = []
+            for source_id, target_id, rel_type, weight in await self._fetch_edges(
+                frontier, "out", ("imports", "calls", "uses")
+            ):
+                relations.append(
+                    self._tuple_to_relation((source_id, target_id, rel_type, weight))
+                )
+                if level < depth and target_id not in visited:
+                    visited[target_id] = None
+                    next_frontier.append(target_id)
+            frontier = next_frontier
 
-        async def traverse(eid: str, current_depth: int) -> None:
-            if eid in visited or current_depth > depth:
-                return
-            visited.add(eid)
+        entities = await self.get_entities_by_ids(list(visited))
+        return QueryResult(entities=entities, relations=relations)
 
-            entity = await self.get_entity(eid)
-            if entity:
-                entities.append(entity)
+    async def _fetch_edges(
+        self,
+        node_ids: list[str],
+        direction: str,
+        relation_types: tuple[str, ...] = (),
+    ) -> list[tuple]:
+        """
+        Fetch the edges incident to a set of nodes in batched queries.
 
-            cursor = await self._connection.execute(
-                """
-                SELECT target_id, type, weight FROM relations
-                WHERE source_id = ? AND type IN ('imports', 'calls', 'uses')
-                """,
-                (eid,),
-            )
-            for row in await cursor.fetchall():
-                rel = Relation(
-                    source_id=eid,
-                    target_id=row[0],
-                    type=RelationType(row[1]),
-                    weight=row[2],
+        Args:
+            node_ids: Frontier node IDs
+            direction: "out", "in", or "both"
+            relation_types: Only return these relation types (all if empty)
+
+        Returns:
+            Distinct (source_id, target_id, type, weight) rows
+        """
+        type_filter = ""
+        if relation_types:
+            type_filter = f" AND type IN ({','.join('?' * len(relation_types))})"
+
+        columns = {"out": ["source_id"], "in": ["target_id"]}.get(
+            direction, ["source_id", "target_id"]
+        )
+        edges: dict[tuple, tuple] = {}
+        for column in columns:
+            for i in range(0, len(node_ids), 500):
+                chunk = node_ids[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = await self._connection.execute(
+                    f"""
+                    SELECT source_id, target_id, type, weight FROM relations
+                    WHERE {column} IN ({placeholders}){type_filter}
+                    """,
+                    [*chunk, *relation_types],
                 )
-                relations.append(rel)
-                await traverse(row[0], current_depth + 1)
+                for row in await cursor.fetchall():
+                    edges.setdefault(row[:3], row)
+        return list(edges.values())
+
+    async def _find_dependencies_from_graph(
+        self, entity_id: str, depth: int
+    ) -> QueryResult:
+        """Outgoing dependency traversal over the in-memory graph."""
+        csr = await self.get_csr()
+        if entity_id not in csr:
+            return QueryResult(entities=[], relations=[])
 
-        await traverse(resolved_id, 0)
+        dependency_types = ("imports", "calls", "uses")
+        levels = csr.bfs(entity_id, depth, edge_types=dependency_types)
+        relations = [
+            self._tuple_to_relation(edge)
+            for edge in map(csr.edge_at, csr.edge_positions(levels, "out").tolist())
+            if edge[2] in dependency_types
+        ]
+
+        entities = await self.get_entities_by_ids(list(levels))
         return QueryResult(entities=entities, relations=relations)
 
     async def query(self, query: str | GraphQuery) -> QueryResult:
@@ -664,32 +1697,40 @@ class GraphEngine:
         all_relations: list[Relation] = []
 
         # Phase 1: Direct matches with scoring
-        base_sql = """
-            SELECT *, community_id FROM entities WHERE 1=1
-        """
+        filters = ""
         params: list[Any] = []
 
         if query.entity_types:
             placeholders = ",".join("?" * len(query.entity_types))
-            base_sql += f" AND type IN ({placeholders})"
+            filters += f" AND e.type IN ({placeholders})"
             params.extend(t.value for t in query.entity_types)
 
         if query.file_patterns:
             pattern_conditions = []
             for pattern in query.file_patterns:
-                pattern_conditions.append("file_path LIKE ?")
+                pattern_conditions.append("e.file_path LIKE ?")
                 params.append(f"%{pattern}%")
-            base_sql += f" AND ({' OR '.join(pattern_conditions)})"
+            filters += f" AND ({' OR '.join(pattern_conditions)})"
 
-        # Text search with different matching strategies
+        # Text search: bm25-ranked full-text and trigram indexes, substring
+        # scan as fallback
+        rows = None
         if query.query:
-            base_sql += " AND (name LIKE ? OR qualified_name LIKE ?)"
-            params.extend([f"%{query.query}%", f"%{query.query}%"])
-
-        base_sql += f" LIMIT {query.max_results * 2}"  # Get more for scoring
-
-        cursor = await self._connection.execute(base_sql, params)
-        rows = await cursor.fetchall()
+            rows = await self._text_search(
+                query.query,
+                filters=filters,
+                params=params,
+                limit=query.max_results * 2,  # Get more for scoring
+            )
+        if rows is None:
+            base_sql = f"SELECT {_ENTITY_SELECT} FROM entities e WHERE 1=1{filters}"
+            if query.query:
+                base_sql += " AND (e.name LIKE ? OR e.qualified_name LIKE ?)"
+                params.extend([f"%{query.query}%", f"%{query.query}%"])
+            base_sql += f" LIMIT {query.max_results * 2}"
+
+            cursor = await self._connection.execute(base_sql, params)
+            rows = await cursor.fetchall()
 
         seen_ids: set[str] = set()
         for row in rows:
@@ -705,8 +1746,8 @@ class GraphEngine:
                 scores[entity.id] = score
 
                 # Track community
-                if len(row) > 10 and row[10] is not None:
-                    communities[entity.id] = row[10]
+                if row[11] is not None:
+                    communities[entity.id] = row[11]
 
         # Phase 2: Include related entities if enabled
         if query.include_related and all_entities:
@@ -740,6 +1781,8 @@ class GraphEngine:
         # Sort by score and limit results
         all_entities.sort(key=lambda e: scores.get(e.id, 0), reverse=True)
         all_entities = all_entities[:query.max_results]
+        if query.include_source:
+            await self.load_sources(all_entities)
 
         return QueryResult(
             entities=all_entities,
@@ -817,7 +1860,7 @@ class GraphEngine:
         if related_ids:
             id_placeholders = ",".join("?" * len(related_ids))
             cursor = await self._connection.execute(
-                f"SELECT * FROM entities WHERE id IN ({id_placeholders})",
+                f"SELECT {_ENTITY_SELECT} FROM entities e WHERE id IN ({id_placeholders})",
                 list(related_ids),
             )
             for row in await cursor.fetchall():
@@ -870,26 +1913,8 @@ class GraphEngine:
         return stats
 
     def _row_to_entity(self, row: tuple) -> Entity:
-        """Convert database row to Entity object."""
-        from codegraph_mcp.core.parser import Location
-
-        return Entity(
-            id=row[0],
-            type=EntityType(row[1]),
-            name=row[2],
-            qualified_name=row[3],
-            location=Location(
-                file_path=Path(row[4]),
-                start_line=row[5],
-                end_line=row[6],
-                start_column=row[7] or 0,
-                end_column=row[8] or 0,
-            ),
-            signature=row[9],
-            docstring=row[10],
-            source_code=row[11],
-            metadata=json.loads(row[14]) if row[14] else {},
-        )
+        """Convert a ``_ENTITY_SELECT`` row to an Entity object."""
+        return StoredEntity.from_row(row)
 
     async def find_paths(
         self,
@@ -910,20 +1935,38 @@ class GraphEngine:
 
         Requirements: REQ-TLS-005
         """
-        # Build NetworkX graph from relations
-        G = await self._build_networkx_graph()
+        csr = await self.get_csr()
 
-        if source_id not in G or target_id not in G:
-            return []
+        # Find simple paths up to max_depth, limited to 10 paths
+        return csr.all_simple_paths(source_id, target_id, cutoff=max_depth, limit=10)
 
-        try:
-            # Find all simple paths up to max_depth
-            paths = list(nx.all_simple_paths(
-                G, source_id, target_id, cutoff=max_depth
-            ))
-            return paths[:10]  # Limit to 10 paths
-        except nx.NetworkXNoPath:
-            return []
+    async def get_csr(self) -> CSRGraph:
+        """
+        Get the code graph as a compact CSR graph for traversal queries.
+
+        Uses the shared snapshot when attached (rebuilt only after writes),
+        otherwise loads a fresh graph from the database. The returned graph
+        is immutable.
+        """
+        if self.snapshot is not None:
+            return await self.snapshot.get_csr(self)
+
+        from codegraph_mcp.core.snapshot import GraphSnapshot
+
+        snapshot = GraphSnapshot()
+        await snapshot.load(self)
+        return snapshot.csr
+
+    async def get_graph(self) -> nx.DiGraph:
+        """
+        Get the code graph as a NetworkX DiGraph.
+
+        Built from the shared snapshot when attached, otherwise from the
+        database.
+        """
+        if self.snapshot is not None:
+            return await self.snapshot.get_graph(self)
+        return await self._build_networkx_graph()
 
     async def _build_networkx_graph(self) -> nx.DiGraph:
         """Build NetworkX graph from database."""
@@ -974,7 +2017,7 @@ class GraphEngine:
         if direction in ("out", "both"):
             cursor = await self._connection.execute(
                 f"""
-                SELECT DISTINCT e.* FROM entities e
+                SELECT DISTINCT {_ENTITY_SELECT} FROM entities e
                 JOIN relations r ON e.id = r.target_id
                 WHERE r.source_id = ?{type_filter}
                 """,
@@ -986,7 +2029,7 @@ class GraphEngine:
         if direction in ("in", "both"):
             cursor = await self._connection.execute(
                 f"""
-                SELECT DISTINCT e.* FROM entities e
+                SELECT DISTINCT {_ENTITY_SELECT} FROM entities e
                 JOIN relations r ON e.id = r.source_id
                 WHERE r.target_id = ?{type_filter}
                 """,
@@ -1020,56 +2063,90 @@ class GraphEngine:
         Returns:
             QueryResult with entities and relations in the subgraph
         """
-        visited: set[str] = set()
-        entities: list[Entity] = []
-        relations: list[Relation] = []
-
-        async def traverse(eid: str, current_depth: int) -> None:
-            if eid in visited or current_depth > depth:
-                return
-            visited.add(eid)
+        if self.snapshot is not None:
+            return await self._get_subgraph_from_graph(entity_id, depth)
+
+        metadata = {"center": entity_id, "depth": depth}
+        center = await self.resolve_entity_id(entity_id)
+        if center is None:
+            return QueryResult(metadata=metadata)
+
+        # Level-synchronous expansion over both edge directions
+        visited: dict[str, None] = {center: None}
+        edges: dict[tuple, tuple] = {}
+        frontier = [center]
+        for level in range(depth + 1):
+            next_frontier = []
+            for row in await self._fetch_edges(frontier, "both"):
+                edges.setdefault(row[:3], row)
+                if level == depth:
+                    continue
+                for neighbor in row[:2]:
+                    if neighbor not in visited:
+                        visited[neighbor] = None
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+
+        entities = await self.get_entities_by_ids(list(visited))
+        relations = [self._tuple_to_relation(row) for row in edges.values()]
+        return QueryResult(entities=entities, relations=relations, metadata=metadata)
+
+    async def _get_subgraph_from_graph(
+        self,
+        entity_id: str,
+        depth: int,
+    ) -> QueryResult:
+        """Breadth-first subgraph extraction over the in-memory graph."""
+        csr = await self.get_csr()
+        metadata = {"center": entity_id, "depth": depth}
+
+        center = entity_id if entity_id in csr else await self.resolve_entity_id(entity_id)
+        if center is None or center not in csr:
+            return QueryResult(metadata=metadata)
+
+        # Level-by-level expansion over both edge directions
+        visited = list(csr.bfs(center, depth, direction="both"))
+        relations = [
+            self._tuple_to_relation(csr.edge_at(pos))
+            for pos in csr.edge_positions(visited).tolist()
+        ]
 
-            entity = await self.get_entity(eid)
-            if entity:
-                entities.append(entity)
+        entities = await self.get_entities_by_ids(visited)
+        return QueryResult(entities=entities, relations=relations, metadata=metadata)
+
+    @staticmethod
+    def _tuple_to_relation(edge: tuple[str, str, str, float]) -> Relation:
+        """Convert a (source, target, type, weight) tuple to a Relation."""
+        source_id, target_id, rel_type, weight = edge
+        return Relation(
+            source_id=source_id,
+            target_id=target_id,
+            type=(
+                RelationType(rel_type)
+                if rel_type in RelationType._value2member_map_
+                else RelationType.REFERENCES
+            ),
+            weight=weight,
+        )
 
-            # Get outgoing relations
-            cursor = await self._connection.execute(
-                "SELECT target_id, type, weight FROM relations WHERE source_id = ?",
-                (eid,),
-            )
-            for row in await cursor.fetchall():
-                rel = Relation(
-                    source_id=eid,
-                    target_id=row[0],
-                    type=RelationType(row[1]) if row[1] in [r.value for r in RelationType] else RelationType.REFERENCES,
-                    weight=row[2],
-                )
-                relations.append(rel)
-                await traverse(row[0], current_depth + 1)
+    async def get_entities_by_ids(self, entity_ids: list[str]) -> list[Entity]:
+        """
+        Fetch entities by exact ID in bulk, preserving the given order.
 
-            # Get incoming relations
+        IDs without a stored entity (e.g. unresolved targets) are skipped.
+        """
+        rows: dict[str, tuple] = {}
+        for i in range(0, len(entity_ids), 500):
+            chunk = entity_ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
             cursor = await self._connection.execute(
-                "SELECT source_id, type, weight FROM relations WHERE target_id = ?",
-                (eid,),
+                f"SELECT {_ENTITY_SELECT} FROM entities e WHERE id IN ({placeholders})",
+                chunk,
             )
             for row in await cursor.fetchall():
-                rel = Relation(
-                    source_id=row[0],
-                    target_id=eid,
-                    type=RelationType(row[1]) if row[1] in [r.value for r in RelationType] else RelationType.REFERENCES,
-                    weight=row[2],
-                )
-                relations.append(rel)
-                await traverse(row[0], current_depth + 1)
+                rows[row[0]] = row
 
-        await traverse(entity_id, 0)
-
-        return QueryResult(
-            entities=entities,
-            relations=relations,
-            metadata={"center": entity_id, "depth": depth},
-        )
+        return [self._row_to_entity(rows[eid]) for eid in entity_ids if eid in rows]
 
     async def search_by_name(
         self,
@@ -1088,14 +2165,27 @@ class GraphEngine:
         Returns:
             List of matching entities
         """
-        sql = "SELECT * FROM entities WHERE name LIKE ?"
+        sql = f"SELECT {_ENTITY_SELECT} FROM entities e WHERE name LIKE ?"
         params: list[Any] = [f"%{name_pattern}%"]
 
+        type_filter = ""
         if entity_types:
             placeholders = ",".join("?" * len(entity_types))
-            sql += f" AND type IN ({placeholders})"
+            type_filter = f" AND e.type IN ({placeholders})"
+            sql += type_filter
             params.extend(t.value for t in entity_types)
 
+        if "%" not in name_pattern:
+            rows = await self._text_search(
+                name_pattern,
+                column="name",
+                filters=type_filter,
+                params=params[1:],
+                limit=limit,
+            )
+            if rows is not None:
+                return [self._row_to_entity(row) for row in rows]
+
         sql += f" LIMIT {limit}"
 
         cursor = await self._connection.execute(sql, params)
@@ -1106,46 +2196,42 @@ class GraphEngine:
         """
         Delete all entities from a file.
 
+        Resolved edges from other files into them are reverted to their
+        placeholders (see ``replace_files``).
+
         Args:
             file_path: Path to the file
 
         Returns:
             Number of deleted entities
         """
-        # Get entity IDs first
-        cursor = await self._connection.execute(
-            "SELECT id FROM entities WHERE file_path = ?",
-            (str(file_path),),
-        )
-        entity_ids = [row[0] for row in await cursor.fetchall()]
-
-        if not entity_ids:
-            return 0
-
-        # Delete relations
-        placeholders = ",".join("?" * len(entity_ids))
-        await self._connection.execute(
-            f"DELETE FROM relations WHERE source_id IN ({placeholders})",
-            entity_ids,
-        )
-        await self._connection.execute(
-            f"DELETE FROM relations WHERE target_id IN ({placeholders})",
-            entity_ids,
-        )
-
-        # Delete entities
-        await self._connection.execute(
-            f"DELETE FROM entities WHERE id IN ({placeholders})",
-            entity_ids,
-        )
-
-        await self._connection.commit()
-        return len(entity_ids)
+        result = await self.replace_files([(Path(file_path), [], [])])
+        return result.entities_removed
 
     async def clear(self) -> None:
         """Clear all data from the graph."""
         await self._connection.execute("DELETE FROM relations")
         await self._connection.execute("DELETE FROM entities")
         await self._connection.execute("DELETE FROM communities")
+        await self._connection.execute("DELETE FROM community_summaries")
         await self._connection.execute("DELETE FROM files")
+        await self._connection.execute("DELETE FROM embedding_rows")
+        await self._connection.execute("DELETE FROM entity_sources")
+        await self._connection.execute("DELETE FROM source_blobs")
+        if self._fts_enabled:
+            await self._connection.execute("DELETE FROM entities_fts")
+        if self._trigram_enabled:
+            await self._connection.execute("DELETE FROM entities_trigram")
+        # Keep the generation counters monotonic so snapshots notice
+        await self._connection.execute(
+            """
+            DELETE FROM index_state WHERE key NOT IN (
+                'fts_built', 'trigram_built', 'graph_generation', 'community_generation'
+            )
+            """
+        )
+        await self._bump_generation()
+        await self._bump_generation("community_generation")
         await self._connection.commit()
+        if self.vector_store is not None:
+            self.vector_store.clear()
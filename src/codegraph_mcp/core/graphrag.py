@@ -12,6 +12,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
+from codegraph_mcp.core.community import COMMUNITY_TREE_CTE
+from codegraph_mcp.core.community_index import CommunityIndex
+
 
 if TYPE_CHECKING:
     from codegraph_mcp.core.graph import GraphEngine
@@ -93,6 +96,8 @@ class GraphRAGSearch:
         self.use_llm = use_llm
         self.max_communities = max_communities
         self.max_entities = max_entities
+        # Used when the engine has no shared community index attached
+        self._community_index = CommunityIndex()
 
     async def global_search(
         self,
@@ -103,23 +108,23 @@ class GraphRAGSearch:
         Global search across all communities.
 
         Uses community summaries to find relevant code regions,
-        then retrieves specific entities.
+        then retrieves specific entities. With a community hierarchy the
+        search starts at the coarsest level and descends only into the
+        best-scoring branches down to ``community_level``.
 
         Args:
             query: Natural language search query
-            community_level: Community hierarchy level (0=fine, 1=coarse)
+            community_level: Community hierarchy level (0=fine, higher is
+                coarser, negative scores every community flat)
 
         Returns:
             GlobalSearchResult with answer and supporting evidence
 
         Requirements: REQ-TLS-010
         """
-        # Get community summaries
-        communities = await self._get_communities_with_summaries(community_level)
-
-        # Find relevant communities using keyword matching or embeddings
-        relevant_communities = await self._find_relevant_communities(
-            query, communities
+        # Find relevant communities by summary embeddings and BM25
+        relevant_communities, communities_searched = await self._select_communities(
+            query, community_level
         )
 
         # Get entities from relevant communities
@@ -150,7 +155,7 @@ class GraphRAGSearch:
         return GlobalSearchResult(
             query=query,
             answer=answer,
-            communities_searched=len(communities),
+            communities_searched=communities_searched,
             relevant_communities=relevant_communities,
             supporting_entities=supporting_entities[: self.max_entities],
             confidence=self._calculate_confidence(relevant_communities),
@@ -217,6 +222,53 @@ class GraphRAGSearch:
             confidence=self._calculate_local_confidence(relevant_entities),
         )
 
+    async def _select_communities(
+        self,
+        query: str,
+        level: int,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        Rank communities at ``level`` by descending the hierarchy.
+
+        Each level keeps the best ``max_communities`` branches and only
+        their children are scored on the next level down, so the number
+        of communities scored grows with depth rather than with the size
+        of the repository.
+
+        Returns:
+            (relevant communities, number of communities scored)
+        """
+        scores = await self._score_communities(query)
+        cursor = await self.engine._connection.execute(
+            "SELECT MAX(level) FROM communities"
+        )
+        top = (await cursor.fetchone())[0]
+        if top is None or level < 0 or top <= level:
+            communities = await self._get_communities_with_summaries(level)
+            relevant = await self._find_relevant_communities(query, communities, scores)
+            return relevant, len(communities)
+
+        frontier = await self._get_communities_with_summaries(top)
+        searched = 0
+        while True:
+            searched += len(frontier)
+            relevant = await self._find_relevant_communities(query, frontier, scores)
+            if not relevant or relevant[0]["level"] <= level:
+                return relevant, searched
+            children = await self._get_child_communities([c["id"] for c in relevant])
+            if not children:
+                # Branches end above the requested level (small children dropped)
+                return relevant, searched
+            frontier = children
+
+    async def _score_communities(self, query: str) -> dict[int, float]:
+        """Score every community once against the query."""
+        index = self.engine.community_index
+        if index is None:
+            index = self._community_index
+        await index.refresh(self.engine)
+        return await index.score(query)
+
     async def _get_communities_with_summaries(
         self,
         level: int,
@@ -231,8 +283,27 @@ class GraphRAGSearch:
             """,
             (level, level),
         )
-        rows = await cursor.fetchall()
+        return self._community_rows(await cursor.fetchall())
 
+    async def _get_child_communities(
+        self,
+        parent_ids: list[int],
+    ) -> list[dict[str, Any]]:
+        """Get the direct children of the given communities."""
+        placeholders = ",".join("?" * len(parent_ids))
+        cursor = await self.engine._connection.execute(
+            f"""
+            SELECT id, level, name, summary, member_count
+            FROM communities
+            WHERE parent_id IN ({placeholders})
+            ORDER BY member_count DESC
+            """,
+            parent_ids,
+        )
+        return self._community_rows(await cursor.fetchall())
+
+    @staticmethod
+    def _community_rows(rows: list[Any]) -> list[dict[str, Any]]:
         return [
             {
                 "id": row[0],
@@ -248,29 +319,23 @@ class GraphRAGSearch:
         self,
         query: str,
         communities: list[dict[str, Any]],
+        scores: dict[int, float] | None = None,
     ) -> list[dict[str, Any]]:
-        """Find communities relevant to the query."""
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
+        """
+        Find communities relevant to the query.
+
+        Args:
+            query: Natural language query
+            communities: Candidate communities
+            scores: Precomputed community scores (default: BM25 over the
+                candidates' names and summaries)
+        """
+        if scores is None:
+            scores = await CommunityIndex.from_communities(communities).score(query)
 
         scored = []
         for comm in communities:
-            score = 0.0
-
-            # Match against name
-            if comm.get("name"):
-                name_lower = comm["name"].lower()
-                if any(word in name_lower for word in query_words):
-                    score += 0.5
-
-            # Match against summary
-            if comm.get("summary"):
-                summary_lower = comm["summary"].lower()
-                matching_words = sum(
-                    1 for word in query_words if word in summary_lower
-                )
-                score += matching_words * 0.2
-
+            score = scores.get(comm["id"], 0.0)
             if score > 0:
                 comm["score"] = min(score, 1.0)
                 scored.append(comm)
@@ -291,17 +356,18 @@ class GraphRAGSearch:
         community_id: int,
         limit: int = 10,
     ) -> list[Entity]:
-        """Get entities in a community."""
+        """Get entities in a community (or any community below it)."""
         from pathlib import Path
 
         from codegraph_mcp.core.parser import Entity, EntityType, Location
 
         cursor = await self.engine._connection.execute(
-            """
+            f"""
+            {COMMUNITY_TREE_CTE}
             SELECT id, type, name, qualified_name, file_path,
                    start_line, end_line, signature, docstring, source_code
             FROM entities
-            WHERE community_id = ?
+            WHERE community_id IN (SELECT id FROM community_tree)
             ORDER BY
                 CASE type
                     WHEN 'class' THEN 1
@@ -336,7 +402,7 @@ class GraphRAGSearch:
             )
             entities.append(entity)
 
-        return entities
+        return await self._load_sources(entities)
 
     async def _get_entity_neighborhood(
         self,
@@ -348,6 +414,14 @@ class GraphRAGSearch:
 
         from codegraph_mcp.core.parser import Entity, EntityType, Location
 
+        # Multi-hop neighborhood from the shared in-memory graph
+        if self.engine.snapshot is not None:
+            csr = await self.engine.get_csr()
+            neighbor_ids = csr.k_hop(entity_id, depth)
+            return await self._load_sources(await self.engine.get_entities_by_ids(
+                neighbor_ids[:self.max_entities * depth]
+            ))
+
         # Get directly connected entities
         cursor = await self.engine._connection.execute(
             """
@@ -387,6 +461,11 @@ class GraphRAGSearch:
             )
             entities.append(entity)
 
+        return await self._load_sources(entities)
+
+    async def _load_sources(self, entities: list[Entity]) -> list[Entity]:
+        """Load the bodies used for source scoring from the side table."""
+        await self.engine.load_sources(entities)
         return entities
 
     async def _find_relevant_entities(
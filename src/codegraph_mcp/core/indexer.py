@@ -7,20 +7,72 @@ Requirements: REQ-IDX-001 ~ REQ-IDX-004
 Design Reference: design-core-engine.md §2.4
 """
 
+import asyncio
 import hashlib
-from collections.abc import Callable
+import os
+from collections import deque
+from collections.abc import AsyncIterator, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from codegraph_mcp.core.changes import ChangeDetector
 from codegraph_mcp.core.graph import GraphEngine
 from codegraph_mcp.core.parser import ASTParser, ParseResult
+from codegraph_mcp.core.resolver import ReferenceResolver
+from codegraph_mcp.utils.logging import get_logger
+
+
+if TYPE_CHECKING:
+    from codegraph_mcp.core.semantic import SemanticAnalyzer
+    from codegraph_mcp.storage.vectors import VectorStore
+
+logger = get_logger(__name__)
 
 
 # Type alias for progress callback
 ProgressCallback = Callable[[int, int, Path | None], None]
 
+# (file_path, parse_result, error) - exactly one of result/error is set
+ParsedFile = tuple[Path, ParseResult | None, str | None]
+
+
+# Per-process parser used by pool workers (each worker owns its own
+# ASTParser and tree-sitter parsers; they are not shared across processes)
+_worker_parser: ASTParser | None = None
+
+
+def _init_parse_worker() -> None:
+    """Initialize the parser owned by a parse worker process."""
+    global _worker_parser  # noqa: PLW0603
+    _worker_parser = ASTParser()
+
+
+def _parse_chunk(
+    file_paths: list[Path],
+    parser: ASTParser | None = None,
+) -> list[ParsedFile]:
+    """
+    Parse a chunk of files.
+
+    Runs inside a worker process (using the worker-owned parser) or
+    in-process for the serial path, so both paths produce identical results.
+    Results are converted to columns here, so they cross the process
+    boundary as flat lists and go to the writer without further conversion.
+    """
+    parser = parser or _worker_parser
+    if parser is None:
+        parser = ASTParser()
+
+    parsed: list[ParsedFile] = []
+    for file_path in file_paths:
+        try:
+            parsed.append((file_path, parser.parse_file(file_path).to_columnar(), None))
+        except Exception as e:
+            parsed.append((file_path, None, f"{file_path}: {e}"))
+    return parsed
+
 
 @dataclass
 class IndexResult:
@@ -32,8 +84,17 @@ class IndexResult:
     files_skipped: int = 0
     errors: list[str] = field(default_factory=list)
     duration_seconds: float = 0.0
+    # Placeholder relation targets rewritten to real entity IDs
+    relations_resolved: int = 0
+    # Incremental runs: files re-indexed or deleted, and entities outside
+    # them whose relations were rewritten (used to patch graph snapshots)
+    incremental: bool = False
+    changed_files: list[Path] = field(default_factory=list)
+    relinked_entity_ids: list[str] = field(default_factory=list)
     # Track entity IDs that were added/updated for incremental community update
     changed_entity_ids: list[str] = field(default_factory=list)
+    # Entities (re-)embedded when embeddings are enabled in the config
+    entities_embedded: int = 0
 
     @property
     def success(self) -> bool:
@@ -63,10 +124,19 @@ class Indexer:
         result = await indexer.index_repository(Path("/repo"))
     """
 
+    # Files per parse task sent to a worker process
+    DEFAULT_BATCH_SIZE = 64
+
+    # Pending entities + relations that trigger a write to the graph
+    DEFAULT_HIGH_WATER_MARK = 50_000
+
     def __init__(
         self,
         parser: ASTParser | None = None,
         config: Any = None,
+        workers: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        high_water_mark: int = DEFAULT_HIGH_WATER_MARK,
     ) -> None:
         """
         Initialize the indexer.
@@ -74,10 +144,20 @@ class Indexer:
         Args:
             parser: AST parser instance (creates default if not provided)
             config: Configuration object
+            workers: Number of parse worker processes
+                (1 = parse on the event loop, 0 = one per CPU)
+            batch_size: Number of files per parse batch
+            high_water_mark: Pending entities + relations before a flush
         """
         self.parser = parser or ASTParser()
         self.config = config
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.batch_size = max(batch_size, 1)
+        self.high_water_mark = max(high_water_mark, 1)
         self._engine: GraphEngine | None = None
+        self._deleted_files: list[Path] = []
+        # Entities outside the written files whose edges were reverted
+        self._relinked_ids: set[str] = set()
 
     async def index_repository(
         self,
@@ -88,6 +168,16 @@ class Indexer:
         """
         Index a repository.
 
+        Parsing (producer) and writing (consumer) run as a pipeline: parsed
+        batches are buffered until ``high_water_mark`` entities and relations
+        are pending, then flushed to the graph. Each flush records the files
+        it covers, so an interrupted run leaves a usable partial index that
+        the next incremental run resumes.
+
+        With ``semantic.embeddings_enabled`` in the config, entities whose
+        text changed are embedded once references are resolved, and
+        removed entities leave the vector store as their files are written.
+
         Args:
             repo_path: Path to the repository
             incremental: If True, only index changed files
@@ -100,8 +190,6 @@ class Indexer:
         """
         import time
 
-        from codegraph_mcp.core.parser import Entity, Relation
-
         start_time = time.time()
 
         result = IndexResult()
@@ -110,59 +198,116 @@ class Indexer:
         # Initialize graph engine
         self._engine = GraphEngine(repo_path)
         await self._engine.initialize()
+        self._deleted_files = []
+        self._relinked_ids = set()
+        embedding: tuple[SemanticAnalyzer, VectorStore] | None = None
 
-        # Batch accumulators
-        all_entities: list[Entity] = []
-        all_relations: list[Relation] = []
+        # Pending writes (flushed at the high-water mark)
         file_updates: list[tuple[Path, ParseResult]] = []
+        pending = 0
+
+        async def flush() -> None:
+            nonlocal pending
+            await self._flush(file_updates)
+            file_updates.clear()
+            pending = 0
+
+        producer: asyncio.Task[None] | None = None
 
         try:
+            embedding = await self._open_vector_store()
+            if embedding is not None:
+                self._engine.vector_store = embedding[1]
+
             # Get files to index
+            full_scan = True
             if incremental:
                 # Check if index already exists (has entities)
                 stats = await self._engine.get_statistics()
                 if stats.entity_count == 0:
                     # No existing index - do full scan for initial indexing
                     files = self._get_all_files(repo_path)
+                elif await self._engine.get_index_state("status") == "in_progress":
+                    # Previous run was interrupted - files it did not store
+                    # have no tracking row, so they show up as changed
+                    files = await self._get_changed_files(repo_path)
                 else:
                     # Existing index - only get changed files
                     files = await self._get_changed_files(repo_path)
+                    full_scan = False
             else:
                 files = self._get_all_files(repo_path)
 
             total_files = len(files)
+            processed = 0
 
-            # Parse each file and collect results
-            for idx, file_path in enumerate(files):
-                # Report progress
-                if progress_callback:
-                    progress_callback(idx, total_files, file_path)
+            await self._engine.set_index_state("status", "in_progress")
 
+            # Producer: parse batches into a bounded queue
+            queue: asyncio.Queue[list[ParsedFile] | None] = asyncio.Queue(
+                maxsize=2
+            )
+
+            async def produce() -> None:
                 try:
-                    parse_result = self.parser.parse_file(file_path)
+                    async for batch in self._parse_batches(files):
+                        await queue.put(batch)
+                finally:
+                    await queue.put(None)
+
+            producer = asyncio.create_task(produce())
+
+            # Consumer: collect results in file order and flush as they arrive
+            while (batch := await queue.get()) is not None:
+                for file_path, parse_result, error in batch:
+                    # Report progress
+                    if progress_callback:
+                        progress_callback(processed, total_files, file_path)
+                    processed += 1
+
+                    if error is not None:
+                        result.errors.append(error)
+                        continue
 
                     if parse_result.success:
-                        all_entities.extend(parse_result.entities)
-                        all_relations.extend(parse_result.relations)
                         file_updates.append((file_path, parse_result))
-                        result.entities_count += len(parse_result.entities)
-                        result.relations_count += len(parse_result.relations)
+                        pending += parse_result.entity_count + parse_result.relation_count
+                        result.entities_count += parse_result.entity_count
+                        result.relations_count += parse_result.relation_count
                         # Track changed entity IDs for incremental community
-                        result.changed_entity_ids.extend(
-                            e.id for e in parse_result.entities
-                        )
+                        result.changed_entity_ids.extend(parse_result.entity_ids)
 
                     result.files_indexed += 1
-                except Exception as e:
-                    result.errors.append(f"{file_path}: {e}")
 
-            # Batch write all entities and relations
-            if self._engine:
-                await self._engine.add_entities_batch(all_entities)
-                await self._engine.add_relations_batch(all_relations)
+                if pending >= self.high_water_mark:
+                    await flush()
+
+            # Surface producer errors
+            await producer
+
+            await flush()
+
+            # Resolve placeholder targets (only edges touching changed files
+            # on incremental runs)
+            resolve_result = await ReferenceResolver().resolve(
+                self._engine,
+                changed_files=None if full_scan else files,
+            )
+            result.relations_resolved = resolve_result.resolved
+
+            if embedding is not None:
+                analyzer, store = embedding
+                embedded = await analyzer.embed_entities(self._engine, store=store)
+                result.entities_embedded = embedded.embedded
 
-                # Update file tracking in batch
-                await self._update_files_batch(file_updates)
+            if not full_scan:
+                result.incremental = True
+                result.changed_files = [*files, *self._deleted_files]
+                result.relinked_entity_ids = sorted(
+                    resolve_result.relinked_ids | self._relinked_ids
+                )
+
+            await self._engine.set_index_state("status", "complete")
 
             # Final progress update
             if progress_callback:
@@ -171,15 +316,124 @@ class Indexer:
             result.duration_seconds = time.time() - start_time
 
         finally:
+            if producer is not None and not producer.done():
+                producer.cancel()
+            if embedding is not None:
+                self._engine.vector_store = None
+                await embedding[1].storage.close()
             await self._engine.close()
 
         return result
 
+    async def _open_vector_store(self) -> "tuple[SemanticAnalyzer, VectorStore] | None":
+        """Open the vector store if the config enables embeddings."""
+        semantic = getattr(self.config, "semantic", None)
+        if self._engine is None or semantic is None or not semantic.embeddings_enabled:
+            return None
+
+        from codegraph_mcp.core.semantic import SemanticAnalyzer
+
+        analyzer = SemanticAnalyzer.from_config(semantic)
+        try:
+            store = await analyzer.open_vector_store(self._engine)
+        except ImportError as e:
+            logger.warning(f"Embeddings enabled but unavailable: {e}")
+            return None
+        return analyzer, store
+
+    async def _flush(
+        self,
+        file_updates: list[tuple[Path, ParseResult]],
+    ) -> None:
+        """
+        Write a batch of parse results to the graph.
+
+        Each file's entity set is replaced as a whole, so entities that
+        disappeared from a file (or moved lines) do not linger. File
+        tracking rows are written last, so a file is only considered
+        indexed once its entities and relations are stored.
+        """
+        if not self._engine:
+            return
+
+        replaced = await self._engine.replace_files([
+            (
+                file_path,
+                parse_result.entity_columns or parse_result.entities,
+                parse_result.relation_columns or parse_result.relations,
+            )
+            for file_path, parse_result in file_updates
+        ])
+        self._relinked_ids |= replaced.relinked_ids
+        await self._update_files_batch(file_updates)
+
+    async def _parse_batches(
+        self,
+        files: list[Path],
+    ) -> AsyncIterator[list[ParsedFile]]:
+        """
+        Parse files and yield results in batches of ``batch_size`` files.
+
+        With ``workers > 1`` the batches are parsed in a process pool. At most
+        ``2 * workers`` batches are in flight, and batches are yielded in
+        submission order so the output is identical to the serial path.
+        """
+        chunks = [
+            files[i:i + self.batch_size]
+            for i in range(0, len(files), self.batch_size)
+        ]
+
+        if self.workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                yield _parse_chunk(chunk, self.parser)
+            return
+
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        loop = asyncio.get_running_loop()
+        # spawn: don't fork the event loop and aiosqlite threads
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.workers, len(chunks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_parse_worker,
+        )
+        pending: deque[asyncio.Future[list[ParsedFile]]] = deque()
+        max_in_flight = self.workers * 2
+
+        try:
+            chunk_iter = iter(chunks)
+            for chunk in chunk_iter:
+                pending.append(
+                    loop.run_in_executor(executor, _parse_chunk, chunk)
+                )
+                if len(pending) >= max_in_flight:
+                    break
+
+            while pending:
+                batch = await pending.popleft()
+                next_chunk = next(chunk_iter, None)
+                if next_chunk is not None:
+                    pending.append(
+                        loop.run_in_executor(executor, _parse_chunk, next_chunk)
+                    )
+                yield batch
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+
     async def _update_files_batch(
         self,
         file_updates: list[tuple[Path, ParseResult]],
     ) -> None:
-        """Update file tracking information in batch."""
+        """
+        Update file tracking information in batch.
+
+        Hash and size come from the parse stage, so they describe exactly
+        the content that was indexed; files are only re-read for results
+        that lack them (e.g. from a custom parser).
+        """
         if not self._engine or not self._engine._connection:
             return
         if not file_updates:
@@ -187,22 +441,29 @@ class Indexer:
 
         data = []
         for file_path, parse_result in file_updates:
-            content = file_path.read_bytes()
-            file_hash = hashlib.sha256(content).hexdigest()
+            file_hash = parse_result.content_hash
+            size = parse_result.content_size
+            if file_hash is None or size is None:
+                content = file_path.read_bytes()
+                file_hash = hashlib.sha256(content).hexdigest()
+                size = len(content)
             language = self.parser.detect_language(file_path)
             data.append((
                 str(file_path),
                 language,
                 file_hash,
-                len(content),
-                len(parse_result.entities),
+                size,
+                parse_result.entity_count,
+                # No fingerprint: the next run hashes the file to compare
+                parse_result.content_mtime_ns,
+                parse_result.content_inode,
             ))
 
         await self._engine._connection.executemany(
             """
             INSERT OR REPLACE INTO files
-            (path, language, hash, size, entity_count, indexed_at)
-            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            (path, language, hash, size, entity_count, mtime_ns, inode, indexed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
             """,
             data,
         )
@@ -210,40 +471,34 @@ class Indexer:
 
     async def _get_changed_files(self, repo_path: Path) -> list[Path]:
         """
-        Get list of changed files using Git.
+        Get new and modified files, removing deleted ones from the graph.
+
+        Compares stat fingerprints with the ``files`` table, so it covers
+        commits, dirty trees and non-git directories alike; only files
+        whose fingerprint changed at equal size are hashed.
 
         Requirements: REQ-IDX-002
         """
-        from codegraph_mcp.utils.git import ChangeType, GitOperations
-
-        try:
-            git_ops = GitOperations(repo_path)
-            changes = await git_ops.get_changed_files()
-
-            # Get supported extensions
-            supported_extensions = set(self.parser.LANGUAGE_EXTENSIONS.keys())
-
-            # Filter to supported file types (excluding deleted files)
-            changed_files = []
-            for change in changes:
-                if change.change_type == ChangeType.DELETED:
-                    # Handle deleted files - remove from graph
-                    await self._handle_deleted_file(repo_path / change.path)
-                    continue
+        detector = ChangeDetector(self._engine)
+        changes = await detector.detect(self._get_all_files(repo_path))
 
-                full_path = repo_path / change.path
-                if full_path.suffix.lower() in supported_extensions:
-                    changed_files.append(full_path)
+        for file_path in changes.deleted:
+            await self._handle_deleted_file(file_path)
+        await detector.refresh(changes.refreshed)
 
-            return changed_files
-        except ValueError:
-            # Not a git repository - fall back to full scan
-            return self._get_all_files(repo_path)
+        return changes.changed
 
     async def _handle_deleted_file(self, file_path: Path) -> None:
         """Handle a deleted file by removing its entities from the graph."""
         if self._engine:
-            await self._engine.delete_file_entities(file_path)
+            replaced = await self._engine.replace_files([(file_path, [], [])])
+            self._relinked_ids |= replaced.relinked_ids
+            await self._engine._connection.execute(
+                "DELETE FROM files WHERE path = ?",
+                (str(file_path),),
+            )
+            await self._engine._connection.commit()
+            self._deleted_files.append(file_path)
 
     def _get_all_files(self, repo_path: Path) -> list[Path]:
         """Get all supported files in repository."""
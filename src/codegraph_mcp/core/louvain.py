@@ -0,0 +1,329 @@
+"""
+Louvain Module
+
+Multi-level Louvain community detection on NumPy edge arrays. The graph
+is kept as a coalesced, symmetric edge list (memory linear in the number
+of edges), and each local-moving sweep computes the modularity gain of
+every node towards every neighbouring community at once.
+
+Moves are applied in batches: all nodes with a positive gain move
+together, and if the batch does not improve modularity (e.g. two nodes
+swapping communities) a seeded random subset of it is retried.
+
+``local_moving`` is the sequential counterpart for incremental updates:
+it moves a handful of nodes against an otherwise fixed partition.
+
+Requirements: REQ-SEM-003
+Design Reference: design-core-engine.md §2.5
+"""
+
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+# Smallest fraction of candidate moves tried before a level is finished
+_MIN_MOVE_FRACTION = 1 / 64
+
+
+@dataclass
+class LouvainResult:
+    """Partition of every Louvain level, finest first."""
+
+    # Community label of each input node, one array per level
+    memberships: list[np.ndarray] = field(default_factory=list)
+    # Modularity of each level's partition
+    modularity: list[float] = field(default_factory=list)
+
+
+@dataclass
+class _Graph:
+    """Undirected weighted graph as a coalesced, symmetric edge list."""
+
+    n: int
+    # Each undirected edge appears in both directions, sorted by source
+    src: np.ndarray
+    dst: np.ndarray
+    weight: np.ndarray
+    # A_ii (an undirected self-loop of weight w counts 2w)
+    loops: np.ndarray
+    degree: np.ndarray
+    # Sum of all degrees (2m)
+    total: float
+
+
+def _coalesce(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weight: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sum parallel edges; the result is sorted by (src, dst)."""
+    if len(src) == 0:
+        return src.astype(np.int64), dst.astype(np.int64), weight.astype(np.float64)
+    key = src.astype(np.int64) * n + dst
+    order = np.argsort(key, kind="stable")
+    key = key[order]
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    weight = np.add.reduceat(weight[order].astype(np.float64), starts)
+    key = key[starts]
+    return key // n, key % n, weight
+
+
+def _undirected(
+    n: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+) -> _Graph:
+    """Symmetrize directed edges (weights of both directions add up)."""
+    src = np.concatenate([sources, targets]).astype(np.int64)
+    dst = np.concatenate([targets, sources]).astype(np.int64)
+    weight = np.concatenate([weights, weights]).astype(np.float64)
+
+    loop = src == dst
+    loops = np.bincount(src[loop], weights=weight[loop], minlength=n)
+    src, dst, weight = _coalesce(n, src[~loop], dst[~loop], weight[~loop])
+    degree = np.bincount(src, weights=weight, minlength=n) + loops
+    return _Graph(n, src, dst, weight, loops, degree, float(degree.sum()))
+
+
+def _aggregate(graph: _Graph, communities: np.ndarray, k: int) -> _Graph:
+    """Collapse each community into a node (intra weights become loops)."""
+    src = communities[graph.src]
+    dst = communities[graph.dst]
+    intra = src == dst
+    loops = np.bincount(communities, weights=graph.loops, minlength=k) + np.bincount(
+        src[intra], weights=graph.weight[intra], minlength=k
+    )
+    src, dst, weight = _coalesce(k, src[~intra], dst[~intra], graph.weight[~intra])
+    degree = np.bincount(communities, weights=graph.degree, minlength=k)
+    return _Graph(k, src, dst, weight, loops, degree, graph.total)
+
+
+def _modularity(graph: _Graph, communities: np.ndarray, resolution: float) -> float:
+    """Modularity of a partition of ``graph``."""
+    if graph.total == 0:
+        return 0.0
+    k = int(communities.max()) + 1 if len(communities) else 0
+    intra = communities[graph.src] == communities[graph.dst]
+    internal = np.bincount(
+        communities[graph.src[intra]], weights=graph.weight[intra], minlength=k
+    ) + np.bincount(communities, weights=graph.loops, minlength=k)
+    totals = np.bincount(communities, weights=graph.degree, minlength=k)
+    return float(
+        (internal / graph.total - resolution * (totals / graph.total) ** 2).sum()
+    )
+
+
+def _best_moves(
+    graph: _Graph,
+    communities: np.ndarray,
+    resolution: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Best neighbouring community of every node and the gain of moving there.
+
+    The gain compares inserting the node (taken out of its community)
+    into the best neighbouring community with putting it back; both sides
+    are scaled by 2m, so the values are only compared with each other.
+    """
+    n, k, total = graph.n, graph.degree, graph.total
+    totals = np.bincount(communities, weights=k, minlength=n)
+
+    # Staying with no links into the own community left
+    stay = -resolution * (totals[communities] - k) * k / total
+    target = communities.copy()
+    best = np.full(n, -np.inf)
+
+    # Weight from each node to each neighbouring community
+    key = graph.src * n + communities[graph.dst]
+    order = np.argsort(key, kind="stable")
+    key = key[order]
+    if len(key) == 0:
+        return target, best - stay
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    links = np.add.reduceat(graph.weight[order], starts)
+    key = key[starts]
+    node, candidate = key // n, key % n
+
+    own = candidate == communities[node]
+    owners = node[own]
+    stay[owners] = links[own] - resolution * (totals[communities[owners]] - k[owners]) * k[
+        owners
+    ] / total
+
+    score = links - resolution * totals[candidate] * k[node] / total
+    score[own] = -np.inf
+
+    # Highest score per node; ties go to the lowest community label
+    groups = np.flatnonzero(np.r_[True, node[1:] != node[:-1]])
+    group_best = np.maximum.reduceat(score, groups)
+    sizes = np.diff(np.r_[groups, len(node)])
+    hits = np.flatnonzero(score == np.repeat(group_best, sizes))
+    first = hits[np.r_[True, node[hits][1:] != node[hits][:-1]]]
+    best[node[first]] = score[first]
+    target[node[first]] = candidate[first]
+    return target, best - stay
+
+
+def _move_nodes(
+    graph: _Graph,
+    resolution: float,
+    rng: np.random.Generator,
+    threshold: float,
+) -> np.ndarray:
+    """Local moving phase from singletons; returns compact labels."""
+    communities = np.arange(graph.n)
+    if graph.total == 0:
+        return communities
+    quality = _modularity(graph, communities, resolution)
+    fraction = 1.0
+    while fraction >= _MIN_MOVE_FRACTION:
+        target, gain = _best_moves(graph, communities, resolution)
+        movers = np.flatnonzero(gain > 0)
+        if len(movers) == 0:
+            break
+        if fraction < 1.0:
+            movers = movers[rng.random(len(movers)) < fraction]
+        trial = communities.copy()
+        trial[movers] = target[movers]
+        trial_quality = _modularity(graph, trial, resolution)
+        if trial_quality > quality + threshold:
+            communities, quality = trial, trial_quality
+        else:
+            fraction /= 2
+    return np.unique(communities, return_inverse=True)[1]
+
+
+def louvain(
+    n: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray | None = None,
+    *,
+    resolution: float = 1.0,
+    seed: int = 42,
+    threshold: float = 1e-7,
+) -> LouvainResult:
+    """
+    Detect communities on every level of the Louvain hierarchy.
+
+    Edge direction is ignored. Levels stop when a pass improves
+    modularity by no more than ``threshold``; a graph without any
+    improvement yields a single level of singletons.
+
+    Args:
+        n: Number of nodes (0..n-1)
+        sources: Source node of each edge
+        targets: Target node of each edge
+        weights: Edge weights (1.0 if omitted)
+        resolution: Modularity resolution (higher favours smaller communities)
+        seed: Seed for choosing move subsets (results are deterministic)
+        threshold: Minimum modularity gain per level
+
+    Returns:
+        LouvainResult with one membership array per level, finest first
+    """
+    if weights is None:
+        weights = np.ones(len(sources))
+    graph = _undirected(n, np.asarray(sources), np.asarray(targets), np.asarray(weights))
+    rng = np.random.default_rng(seed)
+
+    result = LouvainResult()
+    membership = np.arange(n)
+    quality = _modularity(graph, membership, resolution)
+    while graph.n > 0:
+        communities = _move_nodes(graph, resolution, rng, threshold)
+        level_quality = _modularity(graph, communities, resolution)
+        if result.memberships and level_quality - quality <= threshold:
+            break
+        membership = communities[membership]
+        result.memberships.append(membership)
+        result.modularity.append(level_quality)
+        if level_quality - quality <= threshold:
+            break
+        quality = level_quality
+        graph = _aggregate(graph, communities, int(communities.max()) + 1)
+
+    return result
+
+
+def modularity(
+    n: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray | None,
+    membership: np.ndarray,
+    *,
+    resolution: float = 1.0,
+) -> float:
+    """Modularity of ``membership`` on the undirected view of the edges."""
+    if weights is None:
+        weights = np.ones(len(sources))
+    graph = _undirected(n, np.asarray(sources), np.asarray(targets), np.asarray(weights))
+    return _modularity(graph, np.asarray(membership), resolution)
+
+
+def local_moving(
+    nodes: Iterable[Hashable],
+    adjacency: dict[Hashable, dict[Hashable, float]],
+    degree: dict[Hashable, float],
+    labels: dict[Hashable, Hashable | None],
+    totals: dict[Hashable, float],
+    *,
+    total: float,
+    resolution: float = 1.0,
+    max_sweeps: int = 10,
+) -> int:
+    """
+    Move ``nodes`` one at a time to the neighbouring community of highest gain.
+
+    All other nodes keep their community. ``labels`` must cover the nodes
+    and their neighbours (None = not in any community); ``totals`` holds
+    the degree sum of every community involved. Both are updated in place.
+
+    Args:
+        nodes: Nodes allowed to move, visited in this order
+        adjacency: Undirected link weights of each movable node
+        degree: Degree of each movable node in the whole graph
+        labels: Community of each node
+        totals: Degree sum of each community in the whole graph
+        total: Sum of all degrees (2m)
+        resolution: Modularity resolution
+        max_sweeps: Maximum passes over ``nodes``
+
+    Returns:
+        Number of moves made
+    """
+    nodes = list(nodes)
+    if total == 0:
+        return 0
+    moves = 0
+    for _ in range(max_sweeps):
+        moved = 0
+        for node in nodes:
+            k = degree[node]
+            current = labels[node]
+            links: dict[Hashable, float] = {}
+            for neighbour, weight in adjacency[node].items():
+                label = labels[neighbour]
+                if neighbour != node and label is not None:
+                    links[label] = links.get(label, 0.0) + weight
+
+            totals[current] -= k
+            best = current
+            best_gain = links.get(current, 0.0) - resolution * totals[current] * k / total
+            for label in sorted(links, key=str):
+                gain = links[label] - resolution * totals[label] * k / total
+                if gain > best_gain + 1e-12:
+                    best, best_gain = label, gain
+            totals[best] += k
+            if best != current:
+                labels[node] = best
+                moved += 1
+        moves += moved
+        if not moved:
+            break
+    return moves
@@ -7,6 +7,8 @@ Requirements: REQ-AST-001 ~ REQ-AST-005
 Design Reference: design-core-engine.md §2.1
 """
 
+import hashlib
+import json
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -42,7 +44,32 @@ class RelationType(str, Enum):
     DEPENDS_ON = "depends_on"
 
 
-@dataclass
+class _EmptyMetadata(dict[str, Any]):
+    """
+    Read-only empty mapping shared as the default ``metadata``.
+
+    Most entities and relations carry no metadata, so they all reference
+    this one object instead of allocating a dict each. Assign a new dict
+    to add metadata.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("default metadata is read-only; assign a new dict")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+
+EMPTY_METADATA: dict[str, Any] = _EmptyMetadata()
+
+
+def _empty_metadata() -> dict[str, Any]:
+    return EMPTY_METADATA
+
+
+@dataclass(slots=True)
 class Location:
     """Source code location."""
 
@@ -56,7 +83,7 @@ class Location:
         return f"{self.file_path}:{self.start_line}:{self.start_column}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Entity:
     """
     Represents a code entity (function, class, module, etc.).
@@ -72,7 +99,7 @@ class Entity:
     signature: str | None = None
     docstring: str | None = None
     source_code: str | None = None
-    metadata: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=_empty_metadata)
 
     @property
     def file_path(self) -> Path:
@@ -87,7 +114,7 @@ class Entity:
         return self.location.end_line
 
 
-@dataclass
+@dataclass(slots=True)
 class Relation:
     """
     Represents a relation between two entities.
@@ -99,10 +126,10 @@ class Relation:
     target_id: str
     type: RelationType
     weight: float = 1.0
-    metadata: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=_empty_metadata)
 
 
-@dataclass
+@dataclass(slots=True)
 class ParseError:
     """Represents a parsing error."""
 
@@ -113,7 +140,133 @@ class ParseError:
     severity: str = "error"
 
 
-@dataclass
+@dataclass(slots=True)
+class EntityColumns:
+    """
+    Entities as parallel column lists.
+
+    Values are already in storage form (type value, path string, JSON
+    metadata), so a batch pickles as a few flat lists and is written with
+    ``executemany`` without touching per-entity objects.
+    """
+
+    id: list[str] = field(default_factory=list)
+    type: list[str] = field(default_factory=list)
+    name: list[str] = field(default_factory=list)
+    qualified_name: list[str] = field(default_factory=list)
+    file_path: list[str] = field(default_factory=list)
+    start_line: list[int] = field(default_factory=list)
+    start_column: list[int] = field(default_factory=list)
+    end_line: list[int] = field(default_factory=list)
+    end_column: list[int] = field(default_factory=list)
+    signature: list[str | None] = field(default_factory=list)
+    docstring: list[str | None] = field(default_factory=list)
+    source_code: list[str | None] = field(default_factory=list)
+    metadata: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    @classmethod
+    def from_entities(cls, entities: list[Entity]) -> "EntityColumns":
+        """Build columns from entity objects."""
+        return cls(
+            id=[e.id for e in entities],
+            type=[e.type.value for e in entities],
+            name=[e.name for e in entities],
+            qualified_name=[e.qualified_name for e in entities],
+            file_path=[str(e.location.file_path) for e in entities],
+            start_line=[e.location.start_line for e in entities],
+            start_column=[e.location.start_column for e in entities],
+            end_line=[e.location.end_line for e in entities],
+            end_column=[e.location.end_column for e in entities],
+            signature=[e.signature for e in entities],
+            docstring=[e.docstring for e in entities],
+            source_code=[e.source_code for e in entities],
+            metadata=[json.dumps(e.metadata) for e in entities],
+        )
+
+    def extend(self, other: "EntityColumns") -> None:
+        """Append another batch's columns in place."""
+        for name in self.__slots__:
+            getattr(self, name).extend(getattr(other, name))
+
+    def to_entities(self) -> list[Entity]:
+        """Rebuild entity objects (for callers that need them)."""
+        paths: dict[str, Path] = {}
+        return [
+            Entity(
+                id=entity_id,
+                type=EntityType(entity_type),
+                name=name,
+                qualified_name=qualified_name,
+                location=Location(
+                    file_path=paths.setdefault(file_path, Path(file_path)),
+                    start_line=start_line,
+                    start_column=start_column,
+                    end_line=end_line,
+                    end_column=end_column,
+                ),
+                signature=signature,
+                docstring=docstring,
+                source_code=source_code,
+                metadata=json.loads(metadata) if metadata != "{}" else EMPTY_METADATA,
+            )
+            for (
+                entity_id, entity_type, name, qualified_name, file_path,
+                start_line, start_column, end_line, end_column,
+                signature, docstring, source_code, metadata,
+            ) in zip(*(getattr(self, name) for name in self.__slots__), strict=True)
+        ]
+
+
+@dataclass(slots=True)
+class RelationColumns:
+    """Relations as parallel column lists (see EntityColumns)."""
+
+    source_id: list[str] = field(default_factory=list)
+    target_id: list[str] = field(default_factory=list)
+    type: list[str] = field(default_factory=list)
+    weight: list[float] = field(default_factory=list)
+    metadata: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.source_id)
+
+    @classmethod
+    def from_relations(cls, relations: list[Relation]) -> "RelationColumns":
+        """Build columns from relation objects."""
+        return cls(
+            source_id=[r.source_id for r in relations],
+            target_id=[r.target_id for r in relations],
+            type=[r.type.value for r in relations],
+            weight=[r.weight for r in relations],
+            metadata=[json.dumps(r.metadata) for r in relations],
+        )
+
+    def extend(self, other: "RelationColumns") -> None:
+        """Append another batch's columns in place."""
+        for name in self.__slots__:
+            getattr(self, name).extend(getattr(other, name))
+
+    def to_relations(self) -> list[Relation]:
+        """Rebuild relation objects (for callers that need them)."""
+        return [
+            Relation(
+                source_id=source_id,
+                target_id=target_id,
+                type=RelationType(relation_type),
+                weight=weight,
+                metadata=json.loads(metadata) if metadata != "{}" else EMPTY_METADATA,
+            )
+            for source_id, target_id, relation_type, weight, metadata in zip(
+                self.source_id, self.target_id, self.type, self.weight, self.metadata,
+                strict=True,
+            )
+        ]
+
+
+@dataclass(slots=True)
 class ParseResult:
     """
     Result of parsing a file or set of files.
@@ -124,18 +277,80 @@ class ParseResult:
     entities: list[Entity] = field(default_factory=list)
     relations: list[Relation] = field(default_factory=list)
     errors: list[ParseError] = field(default_factory=list)
+    # SHA-256 and size of the bytes that were parsed, and the file's
+    # mtime/inode taken before reading (single-file results)
+    content_hash: str | None = None
+    content_size: int | None = None
+    content_mtime_ns: int | None = None
+    content_inode: int | None = None
+
+    # Columnar form (see to_columnar); replaces entities/relations
+    entity_columns: EntityColumns | None = None
+    relation_columns: RelationColumns | None = None
 
     @property
     def success(self) -> bool:
         return len(self.errors) == 0
 
+    @property
+    def columnar(self) -> bool:
+        return self.entity_columns is not None
+
+    @property
+    def entity_count(self) -> int:
+        if self.entity_columns is not None:
+            return len(self.entity_columns)
+        return len(self.entities)
+
+    @property
+    def relation_count(self) -> int:
+        if self.relation_columns is not None:
+            return len(self.relation_columns)
+        return len(self.relations)
+
+    @property
+    def entity_ids(self) -> list[str]:
+        if self.entity_columns is not None:
+            return self.entity_columns.id
+        return [entity.id for entity in self.entities]
+
+    def to_columnar(self) -> "ParseResult":
+        """
+        Convert to columnar form in place and drop the object lists.
+
+        Used to hand results from parse workers to the writer: the columns
+        pickle cheaply and go straight into ``executemany``.
+        """
+        if self.entity_columns is None:
+            self.entity_columns = EntityColumns.from_entities(self.entities)
+            self.relation_columns = RelationColumns.from_relations(self.relations)
+            self.entities = []
+            self.relations = []
+        return self
+
+    def extend(self, other: "ParseResult") -> None:
+        """Append another parse result in place (amortized O(len(other)))."""
+        if self.columnar or other.columnar:
+            self.to_columnar()
+            other_entities = other.entity_columns or EntityColumns.from_entities(
+                other.entities
+            )
+            other_relations = other.relation_columns or RelationColumns.from_relations(
+                other.relations
+            )
+            self.entity_columns.extend(other_entities)
+            self.relation_columns.extend(other_relations)
+        else:
+            self.entities.extend(other.entities)
+            self.relations.extend(other.relations)
+        self.errors.extend(other.errors)
+
     def merge(self, other: "ParseResult") -> "ParseResult":
-        """Merge another parse result into this one."""
-        return ParseResult(
-            entities=self.entities + other.entities,
-            relations=self.relations + other.relations,
-            errors=self.errors + other.errors,
-        )
+        """Merge another parse result into a new one."""
+        merged = ParseResult()
+        merged.extend(self)
+        merged.extend(other)
+        return merged
 
 
 class ASTParser:
@@ -296,7 +511,8 @@ class ASTParser:
             language: Language name (auto-detected if not provided)
 
         Returns:
-            ParseResult with entities and relations
+            ParseResult with entities and relations, plus the hash and
+            size of the content that was read (the file is read once)
 
         Requirements: REQ-AST-001, REQ-AST-004
         """
@@ -326,6 +542,8 @@ class ASTParser:
             )
 
         try:
+            # stat first: a later write moves the mtime past the stored one
+            stat = file_path.stat()
             content = file_path.read_bytes()
             parser = self._parsers[language]
             tree = parser.parse(content)
@@ -333,7 +551,12 @@ class ASTParser:
             # Delegate to language-specific extraction
             from codegraph_mcp.languages import get_extractor
             extractor = get_extractor(language)
-            return extractor.extract(tree, file_path, content.decode("utf-8"))
+            result = extractor.extract(tree, file_path, content.decode("utf-8"))
+            result.content_hash = hashlib.sha256(content).hexdigest()
+            result.content_size = len(content)
+            result.content_mtime_ns = stat.st_mtime_ns
+            result.content_inode = stat.st_ino
+            return result
 
         except Exception as e:
             return ParseResult(
@@ -345,17 +568,24 @@ class ASTParser:
                 )]
             )
 
-    def parse_files(self, file_paths: list[Path]) -> ParseResult:
+    def parse_files(
+        self,
+        file_paths: list[Path],
+        columnar: bool = False,
+    ) -> ParseResult:
         """
         Parse multiple files.
 
         Args:
             file_paths: List of file paths to parse
+            columnar: Accumulate entities and relations as columns
 
         Returns:
             Merged ParseResult
         """
         result = ParseResult()
+        if columnar:
+            result.to_columnar()
         for path in file_paths:
-            result = result.merge(self.parse_file(path))
+            result.extend(self.parse_file(path))
         return result
@@ -0,0 +1,454 @@
+"""
+Reference Resolver Module
+
+Resolves placeholder relation targets emitted by language extractors
+(``unresolved::name`` for calls/inheritance, ``module::name`` for imports)
+into concrete entity IDs using an in-memory symbol table.
+
+Requirements: REQ-GRF-004, REQ-TLS-003, REQ-TLS-004
+Design Reference: design-core-engine.md §2.4
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path, PurePath
+from typing import Any
+
+from codegraph_mcp.core.parser import ASTParser, EntityType, RelationType
+
+
+UNRESOLVED_PREFIX = "unresolved::"
+MODULE_PREFIX = "module::"
+
+# Metadata key recording the placeholder a resolved relation came from
+ORIGINAL_TARGET_KEY = "original_target"
+
+# Receivers that refer to the enclosing class
+_SELF_QUALIFIERS = {"self", "this", "cls", "super", "@", "$this"}
+
+# Separators between qualifier and member in call targets / qualified names
+_MEMBER_SEPARATOR = re.compile(r"::|->|\\|\.")
+
+# Entity types a relation of the given type may point at
+_TARGET_TYPES: dict[RelationType, set[str]] = {
+    RelationType.CALLS: {
+        EntityType.FUNCTION.value,
+        EntityType.METHOD.value,
+        EntityType.CLASS.value,
+        EntityType.STRUCT.value,
+    },
+    RelationType.INHERITS: {
+        EntityType.CLASS.value,
+        EntityType.INTERFACE.value,
+        EntityType.STRUCT.value,
+        EntityType.TRAIT.value,
+        EntityType.MODULE.value,
+    },
+    RelationType.IMPLEMENTS: {
+        EntityType.INTERFACE.value,
+        EntityType.TRAIT.value,
+        EntityType.CLASS.value,
+    },
+}
+
+
+@dataclass
+class ResolveResult:
+    """Result of a resolution pass."""
+
+    examined: int = 0
+    resolved: int = 0
+    reverted: int = 0
+    # Sources whose outgoing relations were rewritten
+    relinked_ids: set[str] = field(default_factory=set)
+
+
+def _placeholder_range(prefix: str) -> tuple[str, str]:
+    """Index-friendly [low, high) bounds matching strings with ``prefix``."""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _split_member(name: str) -> list[str]:
+    """Split ``a.b::c`` style names into their segments."""
+    return [part for part in _MEMBER_SEPARATOR.split(name) if part]
+
+
+class SymbolTable:
+    """
+    In-memory symbol table over all entities in the graph.
+
+    Keys:
+    - name: simple entity name
+    - member: qualified name without its file prefix (``Class.method``)
+    - module: file stem of file-level module entities
+    """
+
+    def __init__(self) -> None:
+        # id -> (type, file_path, member path)
+        self.entities: dict[str, tuple[str, str, str]] = {}
+        self.by_name: dict[str, list[str]] = {}
+        self.by_member: dict[str, list[str]] = {}
+        self.by_module: dict[str, list[str]] = {}
+
+    def add(
+        self,
+        entity_id: str,
+        entity_type: str,
+        name: str,
+        qualified_name: str,
+        file_path: str,
+    ) -> None:
+        """Add an entity to the table."""
+        prefix = f"{file_path}::"
+        if qualified_name == file_path:
+            member = ""
+        elif qualified_name.startswith(prefix):
+            member = ".".join(_split_member(qualified_name[len(prefix):]))
+        else:
+            member = ".".join(_split_member(qualified_name))
+
+        self.entities[entity_id] = (entity_type, file_path, member)
+        self.by_name.setdefault(name, []).append(entity_id)
+        if member:
+            self.by_member.setdefault(member, []).append(entity_id)
+
+        if entity_type == EntityType.MODULE.value and qualified_name == file_path:
+            stem = PurePath(file_path).stem
+            self.by_module.setdefault(stem, []).append(entity_id)
+
+    @classmethod
+    async def load(cls, engine: Any) -> "SymbolTable":
+        """Build the table from all entities in the graph."""
+        table = cls()
+        cursor = await engine._connection.execute(
+            "SELECT id, type, name, qualified_name, file_path FROM entities"
+        )
+        for row in await cursor.fetchall():
+            table.add(*row)
+        return table
+
+    def names_in_files(self, file_paths: set[str]) -> set[str]:
+        """Get the simple names of entities defined in the given files."""
+        return {
+            member.rsplit(".", 1)[-1]
+            for _, file_path, member in self.entities.values()
+            if file_path in file_paths and member
+        }
+
+
+class ReferenceResolver:
+    """
+    Post-index pass rewriting placeholder targets to real entity IDs.
+
+    Resolution prefers, in order: an exact qualified member match
+    (``Class.method``), a unique name match, the receiver's class for
+    ``self``/``this`` calls, and the caller's own file. Ambiguous
+    references are left unresolved rather than guessed.
+
+    Resolved relations keep their placeholder in metadata
+    (``original_target``) so they can be re-resolved when the target's
+    file changes.
+
+    Usage:
+        resolver = ReferenceResolver()
+        result = await resolver.resolve(engine)
+        result = await resolver.resolve(engine, changed_files=[path])
+    """
+
+    async def resolve(
+        self,
+        engine: Any,
+        changed_files: list[Path] | None = None,
+    ) -> ResolveResult:
+        """
+        Resolve placeholder relation targets.
+
+        Args:
+            engine: GraphEngine instance
+            changed_files: Only re-resolve edges touching these files
+                (None resolves every placeholder in the graph)
+
+        Returns:
+            ResolveResult with counts
+        """
+        result = ResolveResult()
+        table = await SymbolTable.load(engine)
+
+        if changed_files is None:
+            rows = await self._fetch_all_placeholders(engine)
+        else:
+            rows = await self._fetch_changed_edges(
+                engine, table, {str(p) for p in changed_files}
+            )
+
+        inserts: list[tuple[Any, ...]] = []
+        deletes: list[tuple[int]] = []
+
+        for rel_id, source_id, target_id, rel_type, weight, metadata in rows:
+            result.examined += 1
+            meta = json.loads(metadata) if metadata else {}
+            placeholder = meta.get(ORIGINAL_TARGET_KEY, target_id)
+
+            new_target = self._resolve_target(table, source_id, placeholder, rel_type)
+            if new_target is None:
+                if placeholder == target_id:
+                    continue
+                # Previously resolved target no longer resolves - revert
+                new_target = placeholder
+                meta.pop(ORIGINAL_TARGET_KEY, None)
+                result.reverted += 1
+            elif new_target == target_id:
+                continue
+            else:
+                meta[ORIGINAL_TARGET_KEY] = placeholder
+                result.resolved += 1
+
+            inserts.append(
+                (source_id, new_target, rel_type, weight, json.dumps(meta))
+            )
+            deletes.append((rel_id,))
+            result.relinked_ids.add(source_id)
+
+        if deletes:
+            await engine._connection.executemany(
+                "DELETE FROM relations WHERE id = ?",
+                deletes,
+            )
+            await engine._connection.executemany(
+                """
+                INSERT OR IGNORE INTO relations
+                (source_id, target_id, type, weight, metadata)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                inserts,
+            )
+            await engine._bump_generation()
+            await engine._connection.commit()
+
+        return result
+
+    async def _fetch_all_placeholders(self, engine: Any) -> list[tuple]:
+        """Fetch every relation whose target is a placeholder."""
+        unresolved_lo, unresolved_hi = _placeholder_range(UNRESOLVED_PREFIX)
+        module_lo, module_hi = _placeholder_range(MODULE_PREFIX)
+        cursor = await engine._connection.execute(
+            """
+            SELECT id, source_id, target_id, type, weight, metadata
+            FROM relations
+            WHERE (target_id >= ? AND target_id < ?)
+               OR (target_id >= ? AND target_id < ?)
+            """,
+            (unresolved_lo, unresolved_hi, module_lo, module_hi),
+        )
+        return await cursor.fetchall()
+
+    async def _fetch_changed_edges(
+        self,
+        engine: Any,
+        table: SymbolTable,
+        changed: set[str],
+    ) -> list[tuple]:
+        """
+        Fetch the edges that may resolve differently after ``changed`` files
+        were re-indexed:
+
+        - placeholder edges whose source lives in a changed file
+        - placeholder edges naming a symbol defined in a changed file
+        - resolved edges whose target lives in a changed file
+        """
+        if not changed:
+            return []
+
+        changed_ids = [
+            entity_id
+            for entity_id, (_, file_path, _) in table.entities.items()
+            if file_path in changed
+        ]
+        unresolved_lo, unresolved_hi = _placeholder_range(UNRESOLVED_PREFIX)
+        module_lo, module_hi = _placeholder_range(MODULE_PREFIX)
+
+        # Distinct placeholder targets come straight from the target index
+        cursor = await engine._connection.execute(
+            """
+            SELECT DISTINCT target_id FROM relations
+            WHERE (target_id >= ? AND target_id < ?)
+               OR (target_id >= ? AND target_id < ?)
+            """,
+            (unresolved_lo, unresolved_hi, module_lo, module_hi),
+        )
+        changed_names = table.names_in_files(changed)
+        changed_stems = {PurePath(p).stem for p in changed}
+        targets = [
+            row[0]
+            for row in await cursor.fetchall()
+            if self._placeholder_tail(row[0]) in changed_names | changed_stems
+        ]
+
+        rows: dict[int, tuple] = {}
+        select = "SELECT id, source_id, target_id, type, weight, metadata FROM relations"
+        chunk_size = 500
+
+        for i in range(0, len(targets), chunk_size):
+            chunk = targets[i:i + chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = await engine._connection.execute(
+                f"{select} WHERE target_id IN ({placeholders})",
+                chunk,
+            )
+            for row in await cursor.fetchall():
+                rows[row[0]] = row
+
+        for i in range(0, len(changed_ids), chunk_size):
+            chunk = changed_ids[i:i + chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = await engine._connection.execute(
+                f"""
+                {select}
+                WHERE source_id IN ({placeholders})
+                  AND ((target_id >= ? AND target_id < ?)
+                       OR (target_id >= ? AND target_id < ?))
+                """,
+                [*chunk, unresolved_lo, unresolved_hi, module_lo, module_hi],
+            )
+            for row in await cursor.fetchall():
+                rows[row[0]] = row
+
+            cursor = await engine._connection.execute(
+                f"""
+                {select}
+                WHERE target_id IN ({placeholders}) AND metadata LIKE ?
+                """,
+                [*chunk, f'%"{ORIGINAL_TARGET_KEY}"%'],
+            )
+            for row in await cursor.fetchall():
+                rows[row[0]] = row
+
+        return [rows[rel_id] for rel_id in sorted(rows)]
+
+    @staticmethod
+    def _placeholder_tail(target_id: str) -> str:
+        """Get the last name segment of a placeholder target."""
+        name = target_id.split("::", 1)[1] if "::" in target_id else target_id
+        segments = _split_member(name.strip("\"'<>"))
+        return segments[-1] if segments else ""
+
+    def _resolve_target(
+        self,
+        table: SymbolTable,
+        source_id: str,
+        target_id: str,
+        rel_type: str,
+    ) -> str | None:
+        """Resolve a single placeholder target to an entity ID."""
+        if target_id.startswith(MODULE_PREFIX):
+            return self._resolve_module(
+                table, source_id, target_id[len(MODULE_PREFIX):]
+            )
+        if not target_id.startswith(UNRESOLVED_PREFIX):
+            return None
+
+        name = target_id[len(UNRESOLVED_PREFIX):]
+        segments = _split_member(name)
+        if not segments:
+            return None
+
+        try:
+            allowed = _TARGET_TYPES.get(RelationType(rel_type))
+        except ValueError:
+            allowed = None
+
+        def allowed_only(ids: list[str]) -> list[str]:
+            if allowed is None:
+                return ids
+            return [i for i in ids if table.entities[i][0] in allowed]
+
+        source = table.entities.get(source_id)
+
+        # Exact qualified member match (e.g. "Calculator.add", "Foo.<init>")
+        member = ".".join(segments)
+        candidates = allowed_only(table.by_member.get(member, []))
+        if len(candidates) == 1:
+            return candidates[0]
+
+        tail = segments[-1]
+        qualifier = segments[-2] if len(segments) > 1 else None
+        candidates = allowed_only(table.by_name.get(tail, []))
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0]
+
+        # self.method() / this.method() -> method of the caller's class
+        if qualifier in _SELF_QUALIFIERS and source is not None:
+            source_class = source[2].rsplit(".", 1)[0] if "." in source[2] else ""
+            narrowed = [
+                c for c in candidates
+                if table.entities[c][1] == source[1]
+                and table.entities[c][2] == f"{source_class}.{tail}"
+            ]
+            if len(narrowed) == 1:
+                return narrowed[0]
+        elif qualifier is not None:
+            # Module.func() / Class.method() -> match the qualifier
+            narrowed = [
+                c for c in candidates
+                if table.entities[c][2].endswith(f"{qualifier}.{tail}")
+                or PurePath(table.entities[c][1]).stem == qualifier
+            ]
+            if len(narrowed) == 1:
+                return narrowed[0]
+            if narrowed:
+                candidates = narrowed
+
+        # Prefer a definition in the caller's own file
+        if source is not None:
+            narrowed = [c for c in candidates if table.entities[c][1] == source[1]]
+            if len(narrowed) == 1:
+                return narrowed[0]
+
+        return None
+
+    def _resolve_module(
+        self,
+        table: SymbolTable,
+        source_id: str,
+        import_name: str,
+    ) -> str | None:
+        """Resolve an import name to a file-level module entity."""
+        path_like = any(ch in import_name for ch in "/\"'<")
+        segments = _split_member(
+            import_name.strip("\"'<>").replace("/", ".")
+        )
+        segments = [s for s in segments if s != "@"]
+        # Drop a trailing file extension from path-style imports (foo.h, ./a.js)
+        if (
+            path_like
+            and len(segments) > 1
+            and f".{segments[-1].lower()}" in ASTParser.LANGUAGE_EXTENSIONS
+        ):
+            segments = segments[:-1]
+        if not segments:
+            return None
+
+        candidates = [
+            c for c in table.by_module.get(segments[-1], [])
+            if list(PurePath(table.entities[c][1]).with_suffix("").parts)[
+                -len(segments):
+            ] == segments
+        ]
+        if len(candidates) == 1:
+            return candidates[0]
+
+        # Prefer the module next to the importing file
+        source = table.entities.get(source_id)
+        if candidates and source is not None:
+            source_dir = PurePath(source[1]).parent
+            narrowed = [
+                c for c in candidates
+                if PurePath(table.entities[c][1]).parent == source_dir
+            ]
+            if len(narrowed) == 1:
+                return narrowed[0]
+
+        return None
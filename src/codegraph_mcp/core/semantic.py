@@ -9,13 +9,22 @@ Design Reference: design-core-engine.md §2.3
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import heapq
+from collections import Counter
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 
 if TYPE_CHECKING:
+    import numpy as np
+
+    from codegraph_mcp.config import SemanticConfig
     from codegraph_mcp.core.community import Community
+    from codegraph_mcp.core.graph import GraphEngine
     from codegraph_mcp.core.parser import Entity
+    from codegraph_mcp.storage.vectors import VectorStore
 
 
 @dataclass
@@ -29,6 +38,26 @@ class SemanticDescription:
     purpose: str
 
 
+@dataclass
+class EmbeddingResult:
+    """Result of a bulk embedding run."""
+
+    embedded: int = 0
+    skipped: int = 0
+    batches: int = 0
+
+
+@dataclass
+class SummaryResult:
+    """Result of a community summarization run."""
+
+    generated: int = 0
+    # Taken from the summary cache (e.g. after re-detection)
+    cached: int = 0
+    # Summary already up to date
+    skipped: int = 0
+
+
 class SemanticAnalyzer:
     """
     Semantic analyzer for code understanding.
@@ -44,10 +73,17 @@ class SemanticAnalyzer:
         desc = await analyzer.generate_description(entity)
     """
 
+    # Stored vectors before an IVF index beats exact search
+    ANN_MIN_VECTORS = 4096
+    # Best-connected members loaded per community summary (the LLM prompt
+    # lists 20, the rule-based summary 5)
+    SUMMARY_SAMPLE = 20
+
     def __init__(
         self,
         embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
         llm_enabled: bool = False,
+        embedding_batch_size: int = 32,
     ) -> None:
         """
         Initialize the semantic analyzer.
@@ -55,11 +91,22 @@ class SemanticAnalyzer:
         Args:
             embedding_model: Model for generating embeddings
             llm_enabled: Whether to use LLM for descriptions
+            embedding_batch_size: Entities encoded per model call
         """
         self.embedding_model = embedding_model
         self.llm_enabled = llm_enabled
+        self.embedding_batch_size = embedding_batch_size
         self._model: Any = None
 
+    @classmethod
+    def from_config(cls, config: SemanticConfig) -> SemanticAnalyzer:
+        """Create an analyzer from the semantic section of the config."""
+        return cls(
+            embedding_model=config.embedding_model,
+            llm_enabled=config.llm_enabled,
+            embedding_batch_size=config.embedding_batch_size,
+        )
+
     def _ensure_initialized(self) -> None:
         """Lazily initialize the embedding model."""
         if self._model is not None:
@@ -90,6 +137,24 @@ class SemanticAnalyzer:
         embedding = self._model.encode(text)
         return embedding.tolist()
 
+    def generate_embeddings(self, texts: list[str]) -> np.ndarray:
+        """
+        Generate embedding vectors for many texts in one model call.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Matrix of shape (len(texts), dimensions)
+
+        Requirements: REQ-SEM-001
+        """
+        import numpy as np
+
+        self._ensure_initialized()
+        embeddings = self._model.encode(texts, batch_size=self.embedding_batch_size)
+        return np.asarray(embeddings, dtype=np.float32)
+
     def generate_entity_embedding(self, entity: Entity) -> list[float]:
         """
         Generate embedding for a code entity.
@@ -102,20 +167,422 @@ class SemanticAnalyzer:
         Returns:
             Embedding vector
         """
-        parts = [entity.name, entity.qualified_name]
+        return self.generate_embedding(
+            self._entity_text(
+                entity.name,
+                entity.qualified_name,
+                entity.signature,
+                entity.docstring,
+                entity.source_code,
+            )
+        )
 
-        if entity.signature:
-            parts.append(entity.signature)
+    @staticmethod
+    def _entity_text(
+        name: str,
+        qualified_name: str,
+        signature: str | None,
+        docstring: str | None,
+        source_code: str | None,
+    ) -> str:
+        """Build the text embedded for an entity."""
+        parts = [name, qualified_name]
 
-        if entity.docstring:
-            parts.append(entity.docstring)
+        if signature:
+            parts.append(signature)
 
-        if entity.source_code:
+        if docstring:
+            parts.append(docstring)
+
+        if source_code:
             # Truncate source code to reasonable length
-            parts.append(entity.source_code[:500])
+            parts.append(source_code[:500])
+
+        return " ".join(parts)
+
+    def _content_hash(self, text: str) -> str:
+        """Hash of the embedded text (and model, so a model change re-embeds)."""
+        digest = hashlib.sha256(self.embedding_model.encode())
+        digest.update(text.encode())
+        return digest.hexdigest()
+
+    async def embed_entities(
+        self,
+        engine: GraphEngine,
+        store: VectorStore | None = None,
+        force: bool = False,
+    ) -> EmbeddingResult:
+        """
+        Embed all entities of a graph in batches.
+
+        Entities are streamed out of the graph ``embedding_batch_size``
+        at a time; each batch is encoded with a single model call in a
+        worker thread (keeping the event loop free for reads) and written
+        back with one bulk store write. Entities whose embedded
+        text is unchanged since the last run are skipped. New vectors are
+        added to the store's ANN index as they are written; the index is
+        trained once the store holds ``ANN_MIN_VECTORS`` and saved next to
+        the database at the end.
+
+        Args:
+            engine: GraphEngine to read entities from
+            store: VectorStore to write to (default: ``open_vector_store``)
+            force: Re-embed every entity
+
+        Returns:
+            EmbeddingResult with counts
+
+        Requirements: REQ-SEM-001
+        """
+        result = EmbeddingResult()
+        owned: VectorStore | None = None
+        batch_size = max(1, self.embedding_batch_size)
+
+        try:
+            last_rowid = 0
+            while True:
+                cursor = await engine._connection.execute(
+                    """
+                    SELECT rowid, id, name, qualified_name, signature, docstring
+                    FROM entities WHERE rowid > ? ORDER BY rowid LIMIT ?
+                    """,
+                    (last_rowid, batch_size),
+                )
+                rows = await cursor.fetchall()
+                if not rows:
+                    break
+                last_rowid = rows[-1][0]
+
+                ids = [row[1] for row in rows]
+                sources = await engine.get_sources(ids)
+                texts = []
+                for row in rows:
+                    _, entity_id, name, qualified_name, signature, docstring = row
+                    texts.append(self._entity_text(
+                        name, qualified_name, signature, docstring, sources.get(entity_id)
+                    ))
+                hashes = [self._content_hash(text) for text in texts]
+
+                known = {} if force else await self._stored_hashes(engine, ids)
+                todo = [
+                    i for i, (entity_id, content_hash) in enumerate(zip(ids, hashes, strict=True))
+                    if known.get(entity_id) != content_hash
+                ]
+                result.skipped += len(rows) - len(todo)
+                if not todo:
+                    continue
+
+                # Encoding is CPU-bound; keep the event loop serving reads
+                vectors = await asyncio.to_thread(
+                    self.generate_embeddings, [texts[i] for i in todo]
+                )
+                if store is None:
+                    store = owned = await self.open_vector_store(engine, vectors.shape[1])
+
+                await store.add_persistent_batch(
+                    [ids[i] for i in todo],
+                    vectors,
+                    content_hashes=[hashes[i] for i in todo],
+                )
+                result.embedded += len(todo)
+                result.batches += 1
+
+            if store is not None:
+                self._save_ann_index(store)
+        finally:
+            if owned is not None:
+                await owned.storage.close()
+
+        return result
+
+    async def open_vector_store(
+        self,
+        engine: GraphEngine,
+        dimensions: int | None = None,
+    ) -> VectorStore:
+        """
+        Open the vector store persisted next to the engine's database,
+        along with its IVF index. Close it with ``store.storage.close()``.
+
+        Args:
+            engine: GraphEngine whose database holds the row mapping
+            dimensions: Vector dimensions (default: the embedding model's)
+        """
+        from codegraph_mcp.storage.sqlite import SQLiteStorage
+        from codegraph_mcp.storage.vectors import IVFIndex, VectorStore
+
+        if dimensions is None:
+            await asyncio.to_thread(self._ensure_initialized)
+            dimensions = int(self._model.get_sentence_embedding_dimension())
+        store = VectorStore(
+            dimensions=dimensions,
+            storage=SQLiteStorage(engine.db_path),
+            ann_index=IVFIndex(),
+        )
+        await store.initialize()
+        return store
+
+    def _save_ann_index(self, store: VectorStore) -> None:
+        """Train the store's ANN index once it pays off, then persist it."""
+        if store.ann_index is None:
+            return
+        if not store.ann_index.is_trained and len(store) >= self.ANN_MIN_VECTORS:
+            store.build_index()
+        store.save_index()
+
+    @staticmethod
+    async def _stored_hashes(engine: GraphEngine, entity_ids: list[str]) -> dict[str, str]:
+        """Get the content hashes of already embedded entities."""
+        placeholders = ",".join("?" * len(entity_ids))
+        cursor = await engine._connection.execute(
+            f"""
+            SELECT entity_id, content_hash FROM embedding_rows
+            WHERE entity_id IN ({placeholders})
+            """,
+            entity_ids,
+        )
+        return dict(await cursor.fetchall())
+
+    async def summarize_communities(
+        self,
+        engine: GraphEngine,
+        concurrency: int = 8,
+        force: bool = False,
+    ) -> SummaryResult:
+        """
+        Generate summaries for all communities of a graph.
+
+        Run after community detection. Each summary is keyed by a hash of
+        the community's members and their source, so communities that did
+        not change since the last run keep their summary, and ones that
+        re-detection recreated under a new ID take it from the cache.
+        Only the remaining communities are summarized, at most
+        ``concurrency`` at a time, from their ``SUMMARY_SAMPLE``
+        best-connected members and the type counts of all of them; all
+        summaries are written in one transaction.
+
+        Args:
+            engine: GraphEngine whose communities to summarize
+            concurrency: Maximum summaries generated at once
+            force: Regenerate every summary
 
-        text = " ".join(parts)
-        return self.generate_embedding(text)
+        Returns:
+            SummaryResult with counts
+
+        Requirements: REQ-SEM-004
+        """
+        result = SummaryResult()
+        communities, members, stored, profiles = await self._community_members(engine)
+        hashes = {
+            community.id: self._summary_hash(members[community.id])
+            for community in communities
+        }
+
+        todo = [
+            community for community in communities
+            if force
+            or stored[community.id] != hashes[community.id]
+            or community.summary is None
+        ]
+        result.skipped = len(communities) - len(todo)
+
+        cached = {} if force else await self._cached_summaries(
+            engine, sorted({hashes[community.id] for community in todo})
+        )
+        result.cached = sum(hashes[community.id] in cached for community in todo)
+
+        # One summary per distinct content (a parent equal to its only child)
+        pending: dict[str, Community] = {}
+        for community in todo:
+            if hashes[community.id] not in cached:
+                pending.setdefault(hashes[community.id], community)
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def summarize(community: Community) -> str:
+            async with semaphore:
+                community.member_ids = [entity_id for entity_id, _ in members[community.id]]
+                sample = heapq.nlargest(
+                    self.SUMMARY_SAMPLE,
+                    community.member_ids,
+                    key=lambda entity_id: profiles[entity_id][1],
+                )
+                return await self.generate_community_summary(
+                    community,
+                    await engine.get_entities_by_ids(sample),
+                    type_counts=Counter(
+                        profiles[entity_id][0] for entity_id in community.member_ids
+                    ),
+                )
+
+        generated = dict(zip(
+            pending,
+            await asyncio.gather(*(summarize(c) for c in pending.values())),
+            strict=True,
+        ))
+        result.generated = len(generated)
+        cached.update(generated)
+
+        await engine._connection.executemany(
+            "INSERT OR REPLACE INTO community_summaries (hash, summary) VALUES (?, ?)",
+            generated.items(),
+        )
+        await engine._connection.executemany(
+            "UPDATE communities SET summary = ?, summary_hash = ? WHERE id = ?",
+            [
+                (cached[hashes[community.id]], hashes[community.id], community.id)
+                for community in todo
+            ],
+        )
+        # Drop summaries of content that no longer exists
+        await engine._connection.execute(
+            """
+            DELETE FROM community_summaries WHERE hash NOT IN (
+                SELECT summary_hash FROM communities WHERE summary_hash IS NOT NULL
+            )
+            """
+        )
+        await engine._bump_generation("community_generation")
+        await engine._connection.commit()
+        return result
+
+    async def embed_communities(
+        self,
+        engine: GraphEngine,
+        force: bool = False,
+    ) -> EmbeddingResult:
+        """
+        Embed the cached community summaries in batches.
+
+        Run after ``summarize_communities``. Vectors are stored with the
+        summary they encode (keyed by content hash), so re-detection only
+        embeds summaries that were newly generated. ``CommunityIndex``
+        loads them into the matrix ``global_search`` ranks against.
+
+        Args:
+            engine: GraphEngine whose community summaries to embed
+            force: Re-embed every summary
+
+        Returns:
+            EmbeddingResult with counts
+
+        Requirements: REQ-SEM-001, REQ-TLS-010
+        """
+        result = EmbeddingResult()
+        cursor = await engine._connection.execute(
+            """
+            SELECT hash, summary, embedding IS NOT NULL AND embedding_model = ?
+            FROM community_summaries ORDER BY hash
+            """,
+            (self.embedding_model,),
+        )
+        rows = await cursor.fetchall()
+        todo = [(content_hash, summary) for content_hash, summary, done in rows if force or not done]
+        result.skipped = len(rows) - len(todo)
+        if not todo:
+            return result
+
+        batch_size = max(1, self.embedding_batch_size)
+        for i in range(0, len(todo), batch_size):
+            batch = todo[i:i + batch_size]
+            vectors = await asyncio.to_thread(
+                self.generate_embeddings, [summary for _, summary in batch]
+            )
+            await engine._connection.executemany(
+                """
+                UPDATE community_summaries SET embedding = ?, embedding_model = ?
+                WHERE hash = ?
+                """,
+                [
+                    (vector.tobytes(), self.embedding_model, content_hash)
+                    for (content_hash, _), vector in zip(batch, vectors, strict=True)
+                ],
+            )
+            result.embedded += len(batch)
+            result.batches += 1
+
+        await engine._bump_generation("community_generation")
+        await engine._connection.commit()
+        return result
+
+    @staticmethod
+    async def _community_members(
+        engine: GraphEngine,
+    ) -> tuple[
+        list[Community],
+        dict[int, list[tuple[str, str]]],
+        dict[int, str | None],
+        dict[str, tuple[str, int]],
+    ]:
+        """
+        Get all communities, their (entity ID, source hash) members, the
+        content hash of their stored summary and the (type, degree) of
+        every member.
+
+        Entities reference level-0 communities; coarser communities
+        collect the members of their descendants.
+        """
+        from codegraph_mcp.core.community import Community
+
+        cursor = await engine._connection.execute(
+            """
+            SELECT id, level, name, summary, parent_id, summary_hash
+            FROM communities ORDER BY level, id
+            """
+        )
+        rows = await cursor.fetchall()
+        communities = [
+            Community(id=row[0], level=row[1], name=row[2], summary=row[3], parent_id=row[4])
+            for row in rows
+        ]
+        stored = {row[0]: row[5] for row in rows}
+        members: dict[int, list[tuple[str, str]]] = {c.id: [] for c in communities}
+        profiles: dict[str, tuple[str, int]] = {}
+
+        cursor = await engine._connection.execute(
+            """
+            SELECT e.community_id, e.id, COALESCE(s.hash, ''), e.type,
+                (SELECT COUNT(*) FROM relations WHERE source_id = e.id)
+                + (SELECT COUNT(*) FROM relations WHERE target_id = e.id)
+            FROM entities e
+            LEFT JOIN entity_sources s ON s.entity_id = e.id
+            WHERE e.community_id IS NOT NULL
+            """
+        )
+        for community_id, entity_id, source_hash, type_, degree in await cursor.fetchall():
+            if community_id in members:
+                members[community_id].append((entity_id, source_hash))
+                profiles[entity_id] = (type_, degree)
+
+        # Children come before their parents (ordered by level)
+        for community in communities:
+            members[community.id].sort()
+            if community.parent_id in members:
+                members[community.parent_id].extend(members[community.id])
+        return communities, members, stored, profiles
+
+    def _summary_hash(self, members: list[tuple[str, str]]) -> str:
+        """Hash of a community's content (and summarizer, so enabling the LLM regenerates)."""
+        digest = hashlib.sha256(b"llm" if self.llm_enabled else b"rules")
+        for entity_id, source_hash in members:
+            digest.update(f"\n{entity_id}\0{source_hash}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    async def _cached_summaries(engine: GraphEngine, hashes: list[str]) -> dict[str, str]:
+        """Get stored summaries by content hash."""
+        summaries: dict[str, str] = {}
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            cursor = await engine._connection.execute(
+                f"""
+                SELECT hash, summary FROM community_summaries
+                WHERE hash IN ({",".join("?" * len(chunk))})
+                """,
+                chunk,
+            )
+            summaries.update(await cursor.fetchall())
+        return summaries
 
     async def generate_description(self, entity: Entity) -> SemanticDescription:
         """
@@ -207,13 +674,16 @@ class SemanticAnalyzer:
         self,
         community: Community,
         entities: list[Entity],
+        type_counts: dict[str, int] | None = None,
     ) -> str:
         """
         Generate summary for a community of related entities.
 
         Args:
             community: Community to summarize
-            entities: Entities in the community
+            entities: Entities in the community (or a representative sample)
+            type_counts: Entity type counts of all members (default:
+                counted from ``entities``)
 
         Returns:
             Natural language summary
@@ -234,13 +704,10 @@ class SemanticAnalyzer:
                 pass  # Fall back to rule-based
 
         # Collect entity names and types
-        type_counts: dict[str, int] = {}
-        names: list[str] = []
-
-        for entity in entities:
-            type_name = entity.type.value
-            type_counts[type_name] = type_counts.get(type_name, 0) + 1
-            names.append(entity.name)
+        if type_counts is None:
+            type_counts = Counter(entity.type.value for entity in entities)
+        names = [entity.name for entity in entities]
+        total = sum(type_counts.values())
 
         # Build summary
         parts = []
@@ -256,8 +723,8 @@ class SemanticAnalyzer:
         if names:
             key_names = names[:5]
             summary += f" Key entities: {', '.join(key_names)}"
-            if len(names) > 5:
-                summary += f" and {len(names) - 5} more."
+            if total > len(key_names):
+                summary += f" and {total - len(key_names)} more."
 
         return summary
 
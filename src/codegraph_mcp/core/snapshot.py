@@ -0,0 +1,147 @@
+"""
+Graph Snapshot Module
+
+Long-lived in-memory adjacency snapshot of the code graph, shared by
+path finding, subgraph extraction and community detection so they do not
+rebuild the graph from SQLite on every call.
+
+Requirements: REQ-GRF-001, REQ-TLS-005
+Design Reference: design-core-engine.md §2.2
+"""
+
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import networkx as nx
+
+from codegraph_mcp.core.csr import CSRGraph
+
+
+def _empty_graph() -> CSRGraph:
+    return CSRGraph.build(nodes=(), edges=())
+
+
+class GraphSnapshot:
+    """
+    In-memory snapshot of entities (nodes) and relations (edges).
+
+    The graph is held as a compact ``CSRGraph``; a NetworkX view is only
+    materialized on request (community detection). The snapshot records
+    the graph generation it was built from (see
+    ``GraphEngine.get_generation``). When the database generation moves
+    on, the snapshot is either patched for the files an in-process
+    indexer reports, or rebuilt on next use.
+
+    Usage:
+        snapshot = GraphSnapshot()
+        csr = await snapshot.get_csr(engine)
+        await snapshot.patch(engine, changed_files)
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty (unloaded) snapshot."""
+        self.csr: CSRGraph = _empty_graph()
+        self.generation: int | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.generation is not None
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; it is rebuilt on next use."""
+        self.csr = _empty_graph()
+        self.generation = None
+
+    async def get_csr(self, engine: Any) -> CSRGraph:
+        """Get the snapshot graph, rebuilding it if the database changed."""
+        generation = await engine.get_generation()
+        if generation != self.generation:
+            await self.load(engine, generation)
+        return self.csr
+
+    async def get_graph(self, engine: Any) -> nx.DiGraph:
+        """Get a NetworkX copy of the (up to date) snapshot graph."""
+        return (await self.get_csr(engine)).to_networkx()
+
+    async def load(self, engine: Any, generation: int | None = None) -> None:
+        """Rebuild the snapshot from the database."""
+        if generation is None:
+            generation = await engine.get_generation()
+
+        cursor = await engine._connection.execute(
+            "SELECT id, type, file_path FROM entities"
+        )
+        nodes = await cursor.fetchall()
+        cursor = await engine._connection.execute(
+            "SELECT source_id, target_id, type, weight FROM relations"
+        )
+        edges = await cursor.fetchall()
+
+        self.csr = CSRGraph.build(nodes, edges)
+        self.generation = generation
+
+    async def patch(
+        self,
+        engine: Any,
+        file_paths: Iterable[Path | str],
+        entity_ids: Iterable[str] = (),
+    ) -> None:
+        """
+        Patch the snapshot after files were re-indexed.
+
+        Args:
+            engine: GraphEngine instance
+            file_paths: Files whose entities were replaced or deleted
+            entity_ids: Entities outside those files whose outgoing
+                relations were rewritten (e.g. by reference resolution)
+        """
+        if not self.is_loaded:
+            return
+
+        files = [str(p) for p in file_paths]
+        relinked = [e for e in entity_ids if e in self.csr]
+
+        # Reload entities of changed files
+        nodes: list[tuple] = []
+        for i in range(0, len(files), 500):
+            chunk = files[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = await engine._connection.execute(
+                f"""
+                SELECT id, type, file_path FROM entities
+                WHERE file_path IN ({placeholders})
+                """,
+                chunk,
+            )
+            nodes.extend(await cursor.fetchall())
+
+        # Reload edges touching the new nodes and relinked sources
+        new_ids = [row[0] for row in nodes]
+        edges: dict[tuple, tuple] = {}
+        for column, ids in (("source_id", new_ids + relinked), ("target_id", new_ids)):
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = await engine._connection.execute(
+                    f"""
+                    SELECT source_id, target_id, type, weight FROM relations
+                    WHERE {column} IN ({placeholders})
+                    """,
+                    chunk,
+                )
+                for row in await cursor.fetchall():
+                    edges[row[:3]] = row
+
+        self.csr = self.csr.patched(files, relinked, nodes, edges.values())
+        self.generation = await engine.get_generation()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get snapshot statistics."""
+        return {
+            "loaded": self.is_loaded,
+            "generation": self.generation,
+            "nodes": self.csr.number_of_nodes(),
+            "edges": self.csr.number_of_edges(),
+            "bytes": self.csr.nbytes,
+        }
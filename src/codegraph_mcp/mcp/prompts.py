@@ -172,7 +172,7 @@ async def _prompt_code_review(
     config: Config,
 ) -> list[PromptMessage]:
     """Generate code review prompt (REQ-PRM-001)."""
-    entity = await engine.get_entity(args["entity_id"])
+    entity = await engine.get_entity(args["entity_id"], include_source=True)
     focus = args.get("focus", "general")
 
     if not entity:
@@ -231,7 +231,11 @@ async def _prompt_explain_codebase(
 
     # Get community summaries for high-level overview
     cursor = await engine._connection.execute(
-        "SELECT name, summary, member_count FROM communities ORDER BY member_count DESC LIMIT 10"
+        """
+        SELECT name, summary, member_count FROM communities
+        WHERE level = 0
+        ORDER BY member_count DESC LIMIT 10
+        """
     )
     communities = await cursor.fetchall()
 
@@ -363,7 +367,7 @@ async def _prompt_refactor_guidance(
     config: Config,
 ) -> list[PromptMessage]:
     """Generate refactoring guidance prompt (REQ-PRM-005)."""
-    entity = await engine.get_entity(args["entity_id"])
+    entity = await engine.get_entity(args["entity_id"], include_source=True)
     goal = args.get("goal", "improve code quality")
 
     if not entity:
@@ -416,7 +420,7 @@ async def _prompt_test_generation(
     config: Config,
 ) -> list[PromptMessage]:
     """Generate test generation prompt (REQ-PRM-006)."""
-    entity = await engine.get_entity(args["entity_id"])
+    entity = await engine.get_entity(args["entity_id"], include_source=True)
     test_type = args.get("test_type", "unit")
 
     if not entity:
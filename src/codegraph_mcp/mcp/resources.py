@@ -13,6 +13,7 @@ from mcp.server import Server
 from mcp.types import Resource
 
 from codegraph_mcp.config import Config
+from codegraph_mcp.core.community import COMMUNITY_TREE_CTE
 
 
 def register(server: Server, config: Config) -> None:
@@ -88,7 +89,7 @@ async def _dispatch_resource(uri: str, engine: Any) -> dict[str, Any]:
 
 async def _read_entity(entity_id: str, engine: Any) -> dict[str, Any]:
     """Read entity resource (REQ-RSC-001)."""
-    entity = await engine.get_entity(entity_id)
+    entity = await engine.get_entity(entity_id, include_source=True)
 
     if not entity:
         return {"error": "Entity not found", "entity_id": entity_id}
@@ -173,7 +174,7 @@ async def _read_community(community_id: int, engine: Any) -> dict[str, Any]:
     """Read community resource (REQ-RSC-003)."""
     # Get community info
     cursor = await engine._connection.execute(
-        "SELECT id, level, name, summary, member_count FROM communities WHERE id = ?",
+        "SELECT id, level, name, summary, member_count, parent_id FROM communities WHERE id = ?",
         (community_id,),
     )
     row = await cursor.fetchone()
@@ -181,11 +182,12 @@ async def _read_community(community_id: int, engine: Any) -> dict[str, Any]:
     if not row:
         return {"error": "Community not found", "community_id": community_id}
 
-    # Get member entities
+    # Get member entities (coarse communities through their descendants)
     cursor = await engine._connection.execute(
-        """
+        f"""
+        {COMMUNITY_TREE_CTE}
         SELECT id, type, name, file_path
-        FROM entities WHERE community_id = ?
+        FROM entities WHERE community_id IN (SELECT id FROM community_tree)
         ORDER BY type, name
         """,
         (community_id,),
@@ -202,6 +204,7 @@ async def _read_community(community_id: int, engine: Any) -> dict[str, Any]:
             "name": row[2],
             "summary": row[3],
             "member_count": row[4],
+            "parent_id": row[5],
         },
         "members": members,
     }
@@ -343,7 +343,7 @@ def register(server: Server, config: Config) -> None:
 
         try:
             # Use singleton EngineManager for connection pooling
-            manager = await EngineManager.get_instance(config.repo_path)
+            manager = await EngineManager.get_instance(config.repo_path, config.storage)
             engine = await manager.get_engine()
         except FileNotFoundError as e:
             logger.error(f"Database not found: {e}")
@@ -359,7 +359,12 @@ def register(server: Server, config: Config) -> None:
             )]
 
         try:
-            result = await _dispatch_tool(name, arguments, engine, config)
+            if name in _WRITE_TOOLS:
+                result = await _dispatch_tool(name, arguments, engine, config)
+            else:
+                # Read-only tools run on pooled connections in parallel
+                async with manager.read_engine() as reader:
+                    result = await _dispatch_tool(name, arguments, reader, config)
             logger.info(f"Tool {name} completed successfully")
             return [TextContent(type="text", text=str(result))]
         except KeyError as e:
@@ -384,6 +389,10 @@ def register(server: Server, config: Config) -> None:
         # Note: No finally/close - EngineManager handles connection lifecycle
 
 
+# Tools that write to the index and must use the writer connection
+_WRITE_TOOLS = frozenset({"reindex_repository"})
+
+
 async def _dispatch_tool(
     name: str,
     args: dict[str, Any],
@@ -513,7 +522,7 @@ async def _handle_find_implementations(
     # Query for entities that implement the given interface
     cursor = await engine._connection.execute(
         """
-        SELECT e.* FROM entities e
+        SELECT e.id, e.name, e.type FROM entities e
         JOIN relations r ON e.id = r.source_id
         WHERE r.target_id = ? AND r.type = 'implements'
         """,
@@ -522,7 +531,7 @@ async def _handle_find_implementations(
     rows = await cursor.fetchall()
     return {
         "implementations": [
-            {"id": row[0], "name": row[2], "type": row[1]}
+            {"id": row[0], "name": row[1], "type": row[2]}
             for row in rows
         ]
     }
@@ -557,7 +566,7 @@ async def _handle_get_code_snippet(
     config: Config,
 ) -> dict[str, Any]:
     """Handle get_code_snippet tool."""
-    entity = await engine.get_entity(args["entity_id"])
+    entity = await engine.get_entity(args["entity_id"], include_source=True)
     if not entity:
         return {"error": "Entity not found"}
 
@@ -688,7 +697,7 @@ async def _handle_suggest_refactoring(
     config: Config,
 ) -> dict[str, Any]:
     """Handle suggest_refactoring tool."""
-    entity = await engine.get_entity(args["entity_id"])
+    entity = await engine.get_entity(args["entity_id"], include_source=True)
     if not entity:
         return {"error": "Entity not found"}
 
@@ -715,14 +724,19 @@ async def _handle_reindex(
     config: Config,
 ) -> dict[str, Any]:
     """Handle reindex_repository tool."""
+    from codegraph_mcp.core.engine_manager import EngineManager
     from codegraph_mcp.core.indexer import Indexer
 
-    indexer = Indexer()
+    indexer = Indexer(config=config)
     result = await indexer.index_repository(
         config.repo_path,
         incremental=args.get("incremental", True),
     )
 
+    # Patch the shared graph snapshot and drop stale caches
+    manager = await EngineManager.get_instance(config.repo_path)
+    await manager.apply_index_result(result)
+
     return {
         "entities": result.entities_count,
         "relations": result.relations_count,
@@ -12,11 +12,12 @@ Design Reference: design-storage.md
 
 from codegraph_mcp.storage.cache import FileCache
 from codegraph_mcp.storage.sqlite import SQLiteStorage
-from codegraph_mcp.storage.vectors import VectorStore
+from codegraph_mcp.storage.vectors import IVFIndex, VectorStore
 
 
 __all__ = [
     "FileCache",
+    "IVFIndex",
     "SQLiteStorage",
     "VectorStore",
 ]
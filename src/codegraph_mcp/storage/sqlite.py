@@ -56,7 +56,8 @@ class SQLiteStorage:
         schema_sql = """
         -- Entities table
         CREATE TABLE IF NOT EXISTS entities (
-            id TEXT PRIMARY KEY,
+            rowid INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
             type TEXT NOT NULL,
             name TEXT NOT NULL,
             qualified_name TEXT NOT NULL,
@@ -106,7 +107,27 @@ class SQLiteStorage:
             hash TEXT NOT NULL,
             size INTEGER,
             entity_count INTEGER DEFAULT 0,
-            indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            mtime_ns INTEGER,
+            inode INTEGER
+        );
+
+        -- Embedding row mapping (vectors live in embeddings.f32)
+        CREATE TABLE IF NOT EXISTS embedding_rows (
+            entity_id TEXT PRIMARY KEY,
+            row INTEGER NOT NULL,
+            content_hash TEXT
+        );
+
+        -- Entity bodies, zlib-compressed and shared by content hash
+        CREATE TABLE IF NOT EXISTS source_blobs (
+            hash TEXT PRIMARY KEY,
+            data BLOB NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS entity_sources (
+            entity_id TEXT PRIMARY KEY,
+            hash TEXT NOT NULL
         );
 
         -- Indexes
@@ -120,6 +141,7 @@ class SQLiteStorage:
         CREATE INDEX IF NOT EXISTS idx_relations_type ON relations(type);
         CREATE UNIQUE INDEX IF NOT EXISTS idx_relations_unique
             ON relations(source_id, target_id, type);
+        CREATE INDEX IF NOT EXISTS idx_entity_sources_hash ON entity_sources(hash);
         """
 
         for statement in schema_sql.split(";"):
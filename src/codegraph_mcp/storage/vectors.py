@@ -8,11 +8,16 @@ Design Reference: design-storage.md §4
 """
 
 from dataclasses import dataclass
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
 @dataclass
 class SearchResult:
     """Vector search result."""
@@ -22,6 +27,162 @@ class SearchResult:
     distance: float
 
 
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (zero rows are left as-is)."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index.
+
+    Vectors are bucketed by their nearest of ``nlist`` centroids (trained
+    with spherical k-means); a query only scores the vectors in its
+    ``nprobe`` closest buckets. Raising ``nprobe`` trades speed for
+    recall (``nprobe == nlist`` is exact search).
+
+    The index stores row numbers of the owning ``VectorStore`` matrix,
+    not vectors. Buckets are append-only; a row's current bucket is
+    tracked separately so stale entries left behind by updates and
+    removals are filtered out at query time.
+
+    Usage:
+        index = IVFIndex(nprobe=8)
+        store = VectorStore(dimensions=384, ann_index=index)
+        store.build_index()
+        store.search(query_vector)  # approximate
+    """
+
+    MAX_POINTS_PER_CENTROID = 256
+
+    def __init__(
+        self,
+        nlist: int | None = None,
+        nprobe: int = 8,
+        train_iterations: int = 10,
+        seed: int = 42,
+    ) -> None:
+        """
+        Initialize an untrained index.
+
+        Args:
+            nlist: Number of buckets (default: about sqrt(n) at training)
+            nprobe: Buckets scanned per query
+            train_iterations: k-means iterations
+            seed: Random seed for centroid initialization
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_iterations = train_iterations
+        self.seed = seed
+
+        self.centroids: np.ndarray | None = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lists: list[list[int]] = []
+        self._arrays: dict[int, np.ndarray] = {}
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, vectors: np.ndarray) -> None:
+        """
+        Train centroids with spherical k-means and drop all assignments.
+
+        Args:
+            vectors: Normalized training vectors (n, dimensions)
+        """
+        n = len(vectors)
+        if n == 0:
+            raise ValueError("Cannot train an IVF index without vectors")
+        nlist = min(self.nlist or max(1, int(np.sqrt(n))), n)
+
+        rng = np.random.default_rng(self.seed)
+        # Like FAISS, a few hundred points per centroid are plenty
+        if n > nlist * self.MAX_POINTS_PER_CENTROID:
+            vectors = vectors[rng.choice(n, nlist * self.MAX_POINTS_PER_CENTROID, replace=False)]
+            n = len(vectors)
+        centroids = vectors[rng.choice(n, nlist, replace=False)].copy()
+        for _ in range(self.train_iterations):
+            labels = self._nearest(vectors, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, vectors)
+            counts = np.bincount(labels, minlength=nlist)
+            # Re-seed empty buckets from random vectors
+            empty = np.flatnonzero(counts == 0)
+            sums[empty] = vectors[rng.choice(n, len(empty))]
+            centroids = _normalize(sums)
+
+        self.centroids = centroids.astype(np.float32)
+        self.reset()
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Get the nearest centroid per vector (chunked to bound memory)."""
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for i in range(0, len(vectors), 8192):
+            labels[i:i + 8192] = np.argmax(vectors[i:i + 8192] @ centroids.T, axis=1)
+        return labels
+
+    def reset(self) -> None:
+        """Drop all assignments (centroids are kept)."""
+        nlist = 0 if self.centroids is None else len(self.centroids)
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lists = [[] for _ in range(nlist)]
+        self._arrays = {}
+
+    def add(self, rows: list[int], vectors: np.ndarray) -> None:
+        """Assign (or re-assign) store rows to their nearest bucket."""
+        if self.centroids is None or not rows:
+            return
+        labels = self._nearest(vectors, self.centroids)
+        self.assign(rows, labels)
+
+    def assign(self, rows: list[int], labels: np.ndarray) -> None:
+        """Put store rows into the given buckets."""
+        size = max(rows) + 1
+        if size > len(self._assignments):
+            grown = np.full(max(size, 2 * len(self._assignments)), -1, dtype=np.int32)
+            grown[:len(self._assignments)] = self._assignments
+            self._assignments = grown
+        self._assignments[rows] = labels
+        for row, label in zip(rows, labels.tolist(), strict=True):
+            self._lists[label].append(row)
+            self._arrays.pop(label, None)
+
+    def remove(self, row: int) -> None:
+        """Unassign a store row."""
+        if row < len(self._assignments):
+            self._assignments[row] = -1
+
+    def assignments(self, rows: int) -> np.ndarray:
+        """Get the bucket of the first ``rows`` store rows (-1 if none)."""
+        out = np.full(rows, -1, dtype=np.int32)
+        n = min(rows, len(self._assignments))
+        out[:n] = self._assignments[:n]
+        return out
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        """Get the store rows in the query's ``nprobe`` closest buckets."""
+        if self.centroids is None:
+            return np.empty(0, dtype=np.int64)
+        scores = self.centroids @ query
+        nprobe = min(self.nprobe, len(scores))
+        probes = np.argpartition(-scores, nprobe - 1)[:nprobe]
+
+        parts = []
+        for label in probes.tolist():
+            array = self._arrays.get(label)
+            if array is None:
+                array = self._arrays[label] = np.unique(
+                    np.asarray(self._lists[label], dtype=np.int64)
+                )
+            # Skip entries that moved to another bucket or were removed
+            parts.append(array[self._assignments[array] == label])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
 class VectorStore:
     """
     Vector storage for code embeddings with similarity search.
@@ -29,8 +190,20 @@ class VectorStore:
     Requirements: REQ-STR-003
     Design Reference: design-storage.md §4
 
-    Uses SQLite BLOB storage for vectors with in-memory
-    index for fast similarity search.
+    Vectors live in one contiguous float32 matrix with a parallel ID
+    list, so a search is a single matrix-vector product plus an
+    ``argpartition`` top-k. Removed rows are tombstoned and compacted
+    once they make up half the matrix.
+
+    When persisted, the matrix is a fixed-stride raw float32 file next
+    to ``graph.db`` (``embeddings.f32``) with the entity-ID -> row
+    mapping in the ``embedding_rows`` table. ``initialize`` maps the
+    file copy-on-write instead of reading it, so startup is cheap and
+    server processes on one host share the page cache. Legacy
+    ``entities.embedding`` BLOBs are migrated to the file on first load.
+
+    With an ``IVFIndex`` attached and trained, searches are approximate
+    and only score the vectors of the closest buckets.
 
     Usage:
         store = VectorStore(dimensions=384)
@@ -38,10 +211,15 @@ class VectorStore:
         results = store.search(query_vector, top_k=10)
     """
 
+    INITIAL_CAPACITY = 1024
+    INDEX_FILENAME = "vectors.ivf.npz"
+    EMBEDDINGS_FILENAME = "embeddings.f32"
+
     def __init__(
         self,
         dimensions: int = 384,
         storage: Any = None,
+        ann_index: IVFIndex | None = None,
     ) -> None:
         """
         Initialize vector store.
@@ -49,30 +227,116 @@ class VectorStore:
         Args:
             dimensions: Vector dimensions (must match embedding model)
             storage: SQLiteStorage instance for persistence
+            ann_index: Optional approximate nearest-neighbour index
         """
         self.dimensions = dimensions
         self.storage = storage
+        self.ann_index = ann_index
 
         # In-memory index for fast search
-        self._vectors: dict[str, np.ndarray] = {}
+        self._matrix = np.zeros((0, dimensions), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids: list[str | None] = []
+        self._rows: dict[str, int] = {}
         self._loaded = False
+        # True while matrix rows match the embeddings file row for row
+        self._file_backed = False
+        # (inode, size) of the embeddings file when it was mapped
+        self._file_state: tuple[int, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self._rows
+
+    @property
+    def embeddings_path(self) -> Path | None:
+        """Embeddings file, stored next to the SQLite database."""
+        db_path = getattr(self.storage, "db_path", None)
+        return None if db_path is None else Path(db_path).with_name(self.EMBEDDINGS_FILENAME)
 
     async def initialize(self) -> None:
-        """Load vectors from storage into memory."""
+        """Map (or, for legacy databases, load) vectors from storage."""
         if self._loaded or self.storage is None:
             return
 
-        rows = await self.storage.fetch_all(
-            "SELECT id, embedding FROM entities WHERE embedding IS NOT NULL"
-        )
+        path = self.embeddings_path
+        mapping = []
+        if path is not None and path.exists():
+            mapping = await self.storage.fetch_all(
+                "SELECT entity_id, row FROM embedding_rows"
+            )
 
-        for entity_id, embedding_blob in rows:
-            if embedding_blob:
-                vector = self._deserialize_vector(embedding_blob)
-                self._vectors[entity_id] = vector
+        if mapping:
+            self._map_file(path, mapping)
+        else:
+            rows = await self.storage.fetch_all(
+                "SELECT id, embedding FROM entities WHERE embedding IS NOT NULL"
+            )
+            rows = [(entity_id, blob) for entity_id, blob in rows if blob]
+            if rows:
+                self.add_batch(
+                    [entity_id for entity_id, _ in rows],
+                    np.stack([self._deserialize_vector(blob) for _, blob in rows]),
+                )
+                if path is not None:
+                    await self.save()
+
+        if self.ann_index is not None:
+            self.load_index()
 
         self._loaded = True
 
+    def _map_file(self, path: Path, mapping: list[tuple[str, int]]) -> None:
+        """Use the embeddings file as the (copy-on-write) matrix."""
+        stride = self.dimensions * 4
+        count = path.stat().st_size // stride
+        if count:
+            matrix = np.memmap(path, dtype=np.float32, mode="c", shape=(count, self.dimensions))
+        else:
+            matrix = np.zeros((0, self.dimensions), dtype=np.float32)
+
+        ids: list[str | None] = [None] * count
+        rows: dict[str, int] = {}
+        alive = np.zeros(count, dtype=bool)
+        for entity_id, row in mapping:
+            if row < count:
+                ids[row] = entity_id
+                rows[entity_id] = row
+                alive[row] = True
+
+        self._matrix, self._alive, self._ids, self._rows = matrix, alive, ids, rows
+        self._file_backed = True
+        stat = path.stat()
+        self._file_state = (stat.st_ino, stat.st_size)
+
+    def _prepare(
+        self,
+        entity_ids: list[str],
+        vectors: list[list[float]] | np.ndarray,
+    ) -> tuple[np.ndarray, list[int]]:
+        """Validate and normalize vectors, and allocate their rows."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dimensions:
+            raise ValueError(
+                f"Vector dimension mismatch: expected {self.dimensions}, "
+                f"got {vectors.shape[-1]}"
+            )
+        if len(entity_ids) != len(vectors):
+            raise ValueError("entity_ids and vectors must have the same length")
+
+        rows = []
+        for entity_id in entity_ids:
+            row = self._rows.get(entity_id)
+            if row is None:
+                row = self._rows[entity_id] = len(self._ids)
+                self._ids.append(entity_id)
+            rows.append(row)
+
+        # Normalize for cosine similarity
+        return _normalize(vectors), rows
+
     def add(self, entity_id: str, vector: list[float] | np.ndarray) -> None:
         """
         Add vector to store.
@@ -81,21 +345,51 @@ class VectorStore:
             entity_id: Entity identifier
             vector: Embedding vector
         """
-        if isinstance(vector, list):
-            vector = np.array(vector, dtype=np.float32)
-
+        vector = np.asarray(vector, dtype=np.float32)
         if vector.shape[0] != self.dimensions:
             raise ValueError(
                 f"Vector dimension mismatch: expected {self.dimensions}, "
                 f"got {vector.shape[0]}"
             )
+        self.add_batch([entity_id], vector[np.newaxis, :])
 
-        # Normalize for cosine similarity
-        norm = np.linalg.norm(vector)
-        if norm > 0:
-            vector = vector / norm
+    def add_batch(
+        self,
+        entity_ids: list[str],
+        vectors: list[list[float]] | np.ndarray,
+    ) -> None:
+        """
+        Add (or replace) many vectors at once (in memory only).
 
-        self._vectors[entity_id] = vector
+        Args:
+            entity_ids: Entity identifiers
+            vectors: Matrix of shape (len(entity_ids), dimensions)
+        """
+        vectors, rows = self._prepare(entity_ids, vectors)
+
+        self._file_backed = False
+        self._reserve(len(self._ids))
+        self._matrix[rows] = vectors
+        self._alive[rows] = True
+        if self.ann_index is not None:
+            self.ann_index.add(rows, vectors)
+
+    def _reserve(self, size: int) -> None:
+        """Grow the matrix geometrically to hold ``size`` rows."""
+        capacity = len(self._matrix)
+        if size <= capacity:
+            return
+        new_capacity = max(self.INITIAL_CAPACITY, capacity * 2, size)
+        matrix = np.zeros((new_capacity, self.dimensions), dtype=np.float32)
+        matrix[:capacity] = self._matrix
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:capacity] = self._alive
+        self._matrix, self._alive = matrix, alive
+
+    def get_vector(self, entity_id: str) -> np.ndarray | None:
+        """Get the (normalized) vector of an entity."""
+        row = self._rows.get(entity_id)
+        return None if row is None else self._matrix[row]
 
     async def add_persistent(
         self,
@@ -103,21 +397,145 @@ class VectorStore:
         vector: list[float] | np.ndarray,
     ) -> None:
         """Add vector and persist to storage."""
-        self.add(entity_id, vector)
+        vector = np.asarray(vector, dtype=np.float32)
+        await self.add_persistent_batch([entity_id], vector[np.newaxis, :])
 
-        if self.storage:
-            blob = self._serialize_vector(self._vectors[entity_id])
-            await self.storage.execute(
+    async def add_persistent_batch(
+        self,
+        entity_ids: list[str],
+        vectors: list[list[float]] | np.ndarray,
+        content_hashes: list[str] | None = None,
+    ) -> None:
+        """
+        Add (or replace) many vectors and persist them to storage.
+
+        Rows are written in place into the embeddings file, which is
+        then re-mapped; if the in-memory layout has diverged from the
+        file (e.g. after compaction), the whole file is rewritten by
+        ``save``. In place the file only grows, since read-only stores in
+        other processes may map it. If another writer appended to or
+        replaced the file since it was mapped, the row mapping is reloaded
+        first, so new rows go after theirs.
+
+        Args:
+            entity_ids: Entity identifiers
+            vectors: Matrix of shape (len(entity_ids), dimensions)
+            content_hashes: Hashes of the embedded content, recorded so
+                unchanged entities can be skipped next time
+        """
+        path = self.embeddings_path
+        known: Iterable[str | None] = content_hashes or [None] * len(entity_ids)
+        hashes: dict[str, str | None] = dict(zip(entity_ids, known, strict=True))
+        if self.storage is None or path is None or not self._file_backed:
+            self.add_batch(entity_ids, vectors)
+            if self.storage is None:
+                return
+            if path is not None:
+                await self.save(hashes)
+                return
+            # Storage without a file location: keep vectors as BLOBs
+            await self.storage.execute_many(
                 "UPDATE entities SET embedding = ? WHERE id = ?",
-                (blob, entity_id),
+                [
+                    (self._serialize_vector(self._matrix[self._rows[e]]), e)
+                    for e in entity_ids
+                ],
+            )
+            return
+
+        stat = path.stat()
+        if self._file_state != (stat.st_ino, stat.st_size):
+            await self._remap(path)
+
+        vectors, rows = self._prepare(entity_ids, vectors)
+        count = len(self._ids)
+        if count * self.dimensions * 4 > path.stat().st_size:
+            with path.open("r+b") as f:
+                f.truncate(count * self.dimensions * 4)
+        if count:
+            writable = np.memmap(path, dtype=np.float32, mode="r+", shape=(count, self.dimensions))
+            writable[rows] = vectors
+            writable.flush()
+            del writable
+
+        await self.storage.execute_many(
+            """
+            INSERT OR REPLACE INTO embedding_rows (entity_id, row, content_hash)
+            VALUES (?, ?, ?)
+            """,
+            [(entity_id, self._rows[entity_id], hashes[entity_id]) for entity_id in hashes],
+        )
+
+        self._map_file(path, list(self._rows.items()))
+        if self.ann_index is not None:
+            self.ann_index.add(rows, vectors)
+
+    async def _remap(self, path: Path) -> None:
+        """Map the embeddings file again with the stored row mapping."""
+        self._map_file(path, await self.storage.fetch_all(
+            "SELECT entity_id, row FROM embedding_rows"
+        ))
+        if self.ann_index is not None and self.ann_index.is_trained:
+            live = np.flatnonzero(self._alive)
+            self.ann_index.reset()
+            self.ann_index.add(live.tolist(), self._matrix[live])
+
+    async def remove_persistent(self, entity_id: str) -> bool:
+        """Remove vector and its row mapping from storage."""
+        removed = self.remove(entity_id)
+        if removed and self.storage is not None and self.embeddings_path is not None:
+            await self.storage.execute(
+                "DELETE FROM embedding_rows WHERE entity_id = ?", (entity_id,)
             )
             await self.storage.commit()
+        return removed
+
+    async def save(self, content_hashes: dict[str, str | None] | None = None) -> Path | None:
+        """
+        Rewrite the embeddings file and row mapping from memory.
+
+        Tombstoned rows are dropped. The file is replaced atomically, so
+        processes that still map the old file keep a consistent view.
+
+        Args:
+            content_hashes: New content hashes by entity ID (others keep
+                their stored hash)
+
+        Returns:
+            Path written, or None if the store has no file location
+        """
+        path = self.embeddings_path
+        if self.storage is None or path is None:
+            return None
+
+        live = np.flatnonzero(self._alive[:len(self._ids)])
+        ids = [self._ids[row] for row in live.tolist()]
+        tmp_path = path.with_suffix(".tmp")
+        np.ascontiguousarray(self._matrix[live], dtype=np.float32).tofile(tmp_path)
+        tmp_path.replace(path)
+
+        hashes = dict(
+            await self.storage.fetch_all("SELECT entity_id, content_hash FROM embedding_rows")
+        )
+        hashes.update(content_hashes or {})
+        await self.storage.execute("DELETE FROM embedding_rows")
+        await self.storage.execute_many(
+            "INSERT INTO embedding_rows (entity_id, row, content_hash) VALUES (?, ?, ?)",
+            [(entity_id, row, hashes.get(entity_id)) for row, entity_id in enumerate(ids)],
+        )
+
+        self._map_file(path, list(zip(ids, range(len(ids)), strict=True)))
+        if self.ann_index is not None and self.ann_index.is_trained:
+            self.ann_index.reset()
+            self.ann_index.add(list(range(len(ids))), self._matrix[:len(ids)])
+        return path
 
     def search(
         self,
         query_vector: list[float] | np.ndarray,
         top_k: int = 10,
         threshold: float = 0.0,
+        exact: bool = False,
     ) -> list[SearchResult]:
         """
         Search for similar vectors.
@@ -126,39 +544,171 @@ class VectorStore:
             query_vector: Query embedding vector
             top_k: Number of results to return
             threshold: Minimum similarity score (0-1)
+            exact: Bypass the ANN index and score every vector
 
         Returns:
             List of SearchResult sorted by similarity
         """
-        if isinstance(query_vector, list):
-            query_vector = np.array(query_vector, dtype=np.float32)
+        query = np.asarray(query_vector, dtype=np.float32)
+        return self.search_batch(query[np.newaxis, :], top_k, threshold, exact)[0]
 
-        # Normalize query vector
-        norm = np.linalg.norm(query_vector)
-        if norm > 0:
-            query_vector = query_vector / norm
+    def search_batch(
+        self,
+        query_vectors: list[list[float]] | np.ndarray,
+        top_k: int = 10,
+        threshold: float = 0.0,
+        exact: bool = False,
+    ) -> list[list[SearchResult]]:
+        """
+        Search for many query vectors with one matrix product.
 
-        if not self._vectors:
-            return []
+        Args:
+            query_vectors: Matrix of shape (n_queries, dimensions)
+            top_k: Number of results per query
+            threshold: Minimum similarity score (0-1)
+            exact: Bypass the ANN index and score every vector
+
+        Returns:
+            One list of SearchResult (sorted by similarity) per query
+        """
+        queries = _normalize(np.asarray(query_vectors, dtype=np.float32))
+        if not self._rows or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        if not exact and self.ann_index is not None and self.ann_index.is_trained:
+            return [
+                self._search_candidates(
+                    query, self.ann_index.candidates(query), top_k, threshold
+                )
+                for query in queries
+            ]
+
+        size = len(self._ids)
+        # Cosine similarity (vectors are normalized)
+        scores = queries @ self._matrix[:size].T
+        scores[:, ~self._alive[:size]] = -np.inf
+
+        k = min(top_k, len(self._rows))
+        if k < size:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(size), (len(queries), size))
+
+        results = []
+        for query_scores, candidates in zip(scores, top, strict=True):
+            # Row order first so ties keep insertion order
+            candidates = np.sort(candidates)
+            ranked = candidates[np.argsort(-query_scores[candidates], kind="stable")]
+            results.append([
+                SearchResult(
+                    entity_id=self._ids[row],
+                    score=score,
+                    distance=1.0 - score,
+                )
+                for row, score in zip(
+                    ranked.tolist(), query_scores[ranked].tolist(), strict=True
+                )
+                if score >= threshold
+            ])
+        return results
+
+    def _search_candidates(
+        self,
+        query: np.ndarray,
+        candidates: np.ndarray,
+        top_k: int,
+        threshold: float,
+    ) -> list[SearchResult]:
+        """Score and rank a subset of rows for one query."""
+        candidates = candidates[self._alive[candidates]]
+        scores = self._matrix[candidates] @ query
+        if top_k < len(candidates):
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            candidates, scores = candidates[top], scores[top]
+        order = np.lexsort((candidates, -scores))
+        return [
+            SearchResult(entity_id=self._ids[row], score=score, distance=1.0 - score)
+            for row, score in zip(
+                candidates[order].tolist(), scores[order].tolist(), strict=True
+            )
+            if score >= threshold
+        ]
 
-        # Compute similarities
-        results: list[SearchResult] = []
+    def build_index(self, ann_index: IVFIndex | None = None) -> None:
+        """
+        Train the ANN index on the current vectors and index them all.
 
-        for entity_id, vector in self._vectors.items():
-            # Cosine similarity (vectors are normalized)
-            similarity = float(np.dot(query_vector, vector))
+        Args:
+            ann_index: Index to attach (default: the attached one, or a
+                new IVFIndex)
+        """
+        self.ann_index = ann_index or self.ann_index or IVFIndex()
+        live = np.flatnonzero(self._alive[:len(self._ids)])
+        self.ann_index.train(self._matrix[live])
+        self.ann_index.add(live.tolist(), self._matrix[live])
+
+    @property
+    def index_path(self) -> Path | None:
+        """ANN index file, stored next to the SQLite database."""
+        db_path = getattr(self.storage, "db_path", None)
+        return None if db_path is None else Path(db_path).with_name(self.INDEX_FILENAME)
+
+    def save_index(self, path: Path | None = None) -> Path | None:
+        """
+        Persist the trained ANN index (centroids and assignments).
 
-            if similarity >= threshold:
-                results.append(SearchResult(
-                    entity_id=entity_id,
-                    score=similarity,
-                    distance=1.0 - similarity,
-                ))
+        Returns:
+            Path written, or None if there is nothing to save
+        """
+        path = path or self.index_path
+        index = self.ann_index
+        if path is None or index is None or index.centroids is None:
+            return None
+
+        live = np.flatnonzero(self._alive[:len(self._ids)])
+        with path.open("wb") as f:
+            np.savez(
+                f,
+                centroids=index.centroids,
+                nprobe=index.nprobe,
+                ids=np.array([self._ids[row] for row in live.tolist()], dtype=str),
+                labels=index.assignments(len(self._ids))[live],
+            )
+        return path
 
-        # Sort by score descending
-        results.sort(key=lambda x: -x.score)
+    def load_index(self, path: Path | None = None) -> bool:
+        """
+        Load a persisted ANN index for the vectors in memory.
 
-        return results[:top_k]
+        Vectors without a stored assignment (added since the index was
+        saved) are assigned to their nearest centroid.
+
+        Returns:
+            True if an index was loaded
+        """
+        path = path or self.index_path
+        if path is None or not path.exists():
+            return False
+
+        with np.load(path) as data:
+            centroids = data["centroids"]
+            if centroids.shape[1] != self.dimensions:
+                return False
+            index = self.ann_index or IVFIndex()
+            index.centroids = centroids
+            index.nlist = len(centroids)
+            index.nprobe = int(data["nprobe"])
+            labels = dict(zip(data["ids"].tolist(), data["labels"].tolist(), strict=True))
+        index.reset()
+        self.ann_index = index
+
+        known = [(row, labels[eid]) for eid, row in self._rows.items() if labels.get(eid, -1) >= 0]
+        if known:
+            rows, assigned = zip(*known, strict=True)
+            index.assign(list(rows), np.asarray(assigned, dtype=np.int32))
+        unknown = [row for eid, row in self._rows.items() if labels.get(eid, -1) < 0]
+        index.add(unknown, self._matrix[unknown])
+        return True
 
     def search_by_entity(
         self,
@@ -177,10 +727,10 @@ class VectorStore:
         Returns:
             List of similar entities
         """
-        if entity_id not in self._vectors:
+        query_vector = self.get_vector(entity_id)
+        if query_vector is None:
             return []
 
-        query_vector = self._vectors[entity_id]
         results = self.search(query_vector, top_k=top_k + 1)
 
         if exclude_self:
@@ -198,15 +748,44 @@ class VectorStore:
         Returns:
             True if removed
         """
-        if entity_id in self._vectors:
-            del self._vectors[entity_id]
-            return True
-        return False
+        row = self._rows.pop(entity_id, None)
+        if row is None:
+            return False
+
+        # Tombstone; compact once half the rows are dead
+        self._alive[row] = False
+        self._ids[row] = None
+        if self.ann_index is not None:
+            self.ann_index.remove(row)
+        if len(self._ids) - len(self._rows) > max(len(self._rows), self.INITIAL_CAPACITY):
+            self._compact()
+        return True
+
+    def _compact(self) -> None:
+        """Drop tombstoned rows."""
+        live = np.flatnonzero(self._alive[:len(self._ids)])
+        ids = [self._ids[row] for row in live.tolist()]
+        matrix = self._matrix[live]
+
+        self._matrix = np.zeros((0, self.dimensions), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids = []
+        self._rows = {}
+        if self.ann_index is not None:
+            self.ann_index.reset()
+        if ids:
+            self.add_batch(ids, matrix)
 
     def clear(self) -> None:
         """Clear all vectors from memory."""
-        self._vectors.clear()
+        self._matrix = np.zeros((0, self.dimensions), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids = []
+        self._rows = {}
+        if self.ann_index is not None:
+            self.ann_index.reset()
         self._loaded = False
+        self._file_backed = False
 
     def _serialize_vector(self, vector: np.ndarray) -> bytes:
         """Serialize vector to bytes for storage."""
@@ -220,7 +799,13 @@ class VectorStore:
         """Get vector store statistics."""
         return {
             "dimensions": self.dimensions,
-            "vector_count": len(self._vectors),
-            "memory_bytes": len(self._vectors) * self.dimensions * 4,
+            "vector_count": len(self._rows),
+            "tombstones": len(self._ids) - len(self._rows),
+            "memory_bytes": self._matrix.nbytes,
+            "memory_mapped": isinstance(self._matrix, np.memmap),
             "loaded": self._loaded,
+            "ann_index": (
+                None if self.ann_index is None or not self.ann_index.is_trained
+                else {"nlist": len(self.ann_index.centroids), "nprobe": self.ann_index.nprobe}
+            ),
         }
@@ -0,0 +1,135 @@
+"""
+Unit tests for the Change Detection module.
+
+Tests: REQ-IDX-002
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from codegraph_mcp.core.changes import ChangeDetector
+from codegraph_mcp.core.graph import GraphEngine
+from codegraph_mcp.core.indexer import Indexer
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """Create a non-git repository with two files."""
+    (tmp_path / "a.py").write_text("def a():\n    pass\n")
+    (tmp_path / "b.py").write_text("def b():\n    pass\n")
+    return tmp_path.resolve()
+
+
+async def detect(repo: Path):
+    """Run the detector over the repository files."""
+    engine = GraphEngine(repo)
+    await engine.initialize()
+    try:
+        detector = ChangeDetector(engine)
+        changes = await detector.detect(sorted(repo.glob("*.py")))
+        await detector.refresh(changes.refreshed)
+        return changes
+    finally:
+        await engine.close()
+
+
+def bump_mtime(path: Path) -> None:
+    """Move a file's mtime forward without changing its content."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class TestChangeDetector:
+    """Tests for ChangeDetector."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_files_are_not_hashed(self, repo: Path):
+        """Test that matching fingerprints skip files without reading them."""
+        await Indexer().index_repository(repo, incremental=False)
+
+        changes = await detect(repo)
+
+        assert changes.changed == []
+        assert changes.deleted == []
+        assert changes.hashed == 0
+
+    @pytest.mark.asyncio
+    async def test_touched_file_is_refreshed(self, repo: Path):
+        """Test that a new mtime with the same content is not a change."""
+        await Indexer().index_repository(repo, incremental=False)
+        bump_mtime(repo / "a.py")
+
+        changes = await detect(repo)
+        assert changes.changed == []
+        assert [path for path, _, _ in changes.refreshed] == [repo / "a.py"]
+        assert changes.hashed == 1
+
+        # The refreshed fingerprint matches on the next run
+        assert (await detect(repo)).hashed == 0
+
+    @pytest.mark.asyncio
+    async def test_modified_new_and_deleted(self, repo: Path):
+        """Test same-size edits, size changes, new files and deletions."""
+        await Indexer().index_repository(repo, incremental=False)
+
+        (repo / "a.py").write_text("def x():\n    pass\n")  # same size
+        bump_mtime(repo / "a.py")
+        (repo / "b.py").unlink()
+        (repo / "c.py").write_text("def c():\n    return 1\n")
+
+        changes = await detect(repo)
+
+        assert sorted(changes.changed) == [repo / "a.py", repo / "c.py"]
+        assert changes.deleted == [repo / "b.py"]
+        assert changes.hashed == 1
+
+    @pytest.mark.asyncio
+    async def test_rows_without_fingerprint_are_hashed(self, repo: Path):
+        """Test that rows from older indexes are verified by hash once."""
+        await Indexer().index_repository(repo, incremental=False)
+        engine = GraphEngine(repo)
+        await engine.initialize()
+        await engine._connection.execute("UPDATE files SET mtime_ns = NULL, inode = NULL")
+        await engine._connection.commit()
+        await engine.close()
+
+        changes = await detect(repo)
+
+        assert changes.changed == []
+        assert changes.hashed == 2
+        assert (await detect(repo)).hashed == 0
+
+
+class TestIncrementalIndexing:
+    """Tests for incremental indexing without git."""
+
+    @pytest.mark.asyncio
+    async def test_only_changed_files_are_reindexed(self, repo: Path):
+        """Test that an incremental run parses the edited file and drops deleted ones."""
+        indexer = Indexer()
+        await indexer.index_repository(repo, incremental=False)
+
+        (repo / "a.py").write_text("def a():\n    return 42\n")
+        (repo / "b.py").unlink()
+
+        result = await indexer.index_repository(repo, incremental=True)
+
+        assert result.incremental is True
+        assert result.files_indexed == 1
+        assert set(result.changed_files) == {repo / "a.py", repo / "b.py"}
+
+        engine = GraphEngine(repo)
+        await engine.initialize()
+        try:
+            cursor = await engine._connection.execute("SELECT path FROM files")
+            assert [row[0] for row in await cursor.fetchall()] == [str(repo / "a.py")]
+            assert await engine.search_by_name("b") == []
+        finally:
+            await engine.close()
+
+        # Nothing changed since: no files parsed
+        result = await indexer.index_repository(repo, incremental=True)
+        assert result.files_indexed == 0
+        assert result.changed_files == []
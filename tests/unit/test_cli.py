@@ -53,6 +53,14 @@ class TestCLIParser:
 
         assert args.community is True
 
+    def test_index_command_workers(self):
+        """Test index command parse worker option."""
+        from codegraph_mcp.__main__ import create_parser
+
+        parser = create_parser()
+        assert parser.parse_args(["index", "."]).workers == 1
+        assert parser.parse_args(["index", ".", "--workers", "8"]).workers == 8
+
     def test_all_commands_available(self):
         """Test that all expected commands are available."""
         from codegraph_mcp.__main__ import create_parser
@@ -0,0 +1,300 @@
+"""
+Unit tests for the Community Detection module.
+
+Tests: REQ-SEM-003, REQ-SEM-004
+"""
+
+from pathlib import Path
+
+import pytest
+
+from codegraph_mcp.core.community import Community, CommunityDetector
+from codegraph_mcp.core.graph import GraphEngine
+from codegraph_mcp.core.graphrag import GraphRAGSearch
+from codegraph_mcp.core.parser import (
+    Entity,
+    EntityType,
+    Location,
+    Relation,
+    RelationType,
+)
+
+
+def make_entity(name: str) -> Entity:
+    """Create a function entity in its own module."""
+    return Entity(
+        id=f"/repo/{name}.py::{name}::1",
+        type=EntityType.FUNCTION,
+        name=name,
+        qualified_name=f"{name}.{name}",
+        location=Location(Path(f"/repo/{name}.py"), 1, 0, 2, 0),
+    )
+
+
+def ring_of_cliques(cliques: int, size: int) -> tuple[list[Entity], list[Relation]]:
+    """Cliques of calling functions, each linked to the next in a ring."""
+    entities = [make_entity(f"c{i}_{j}") for i in range(cliques) for j in range(size)]
+    relations = []
+    for i in range(cliques):
+        members = entities[i * size:(i + 1) * size]
+        relations += [
+            Relation(a.id, b.id, RelationType.CALLS)
+            for k, a in enumerate(members)
+            for b in members[k + 1:]
+        ]
+        successor = entities[((i + 1) % cliques) * size]
+        relations.append(Relation(members[-1].id, successor.id, RelationType.CALLS))
+    return entities, relations
+
+
+@pytest.fixture
+async def engine(temp_dir: Path):
+    """Engine holding a ring of 16 four-node cliques."""
+    engine = GraphEngine(temp_dir)
+    await engine.initialize()
+    entities, relations = ring_of_cliques(16, 4)
+    await engine.add_entities_batch(entities)
+    await engine.add_relations_batch(relations)
+    yield engine
+    await engine.close()
+
+
+class TestHierarchy:
+    """Tests for the multi-level community hierarchy."""
+
+    def test_build_hierarchy_links_levels(self):
+        """Test that nested partitions become linked communities."""
+        detector = CommunityDetector(min_size=2)
+        communities = detector._build_hierarchy([
+            [{"a", "b"}, {"c", "d"}, {"e"}],
+            [{"a", "b", "c", "d"}, {"e"}],
+        ])
+
+        assert [(c.id, c.level, c.member_ids) for c in communities] == [
+            (0, 0, ["a", "b"]),
+            (1, 0, ["c", "d"]),
+            (2, 1, ["a", "b", "c", "d"]),
+        ]
+        assert [c.parent_id for c in communities] == [2, 2, None]
+
+    @pytest.mark.asyncio
+    async def test_detect_stores_dendrogram(self, engine: GraphEngine):
+        """Test that every Louvain level is stored with parent links."""
+        result = await CommunityDetector(min_size=1).detect(engine)
+
+        assert result.levels >= 2
+        by_id: dict[int, Community] = {c.id: c for c in result.communities}
+        for community in result.communities:
+            if community.parent_id is not None:
+                parent = by_id[community.parent_id]
+                assert parent.level == community.level + 1
+                assert set(community.member_ids) <= set(parent.member_ids)
+
+        cursor = await engine._connection.execute(
+            "SELECT COUNT(*) FROM communities WHERE parent_id IS NOT NULL"
+        )
+        assert (await cursor.fetchone())[0] == len(
+            [c for c in result.communities if c.parent_id is not None]
+        )
+
+        # Entities reference leaf communities only
+        cursor = await engine._connection.execute(
+            """
+            SELECT DISTINCT c.level FROM entities e
+            JOIN communities c ON c.id = e.community_id
+            """
+        )
+        assert await cursor.fetchall() == [(0,)]
+
+    @pytest.mark.asyncio
+    async def test_detect_covers_every_entity(self, engine: GraphEngine):
+        """Test that every entity is clustered and placeholders are skipped."""
+        await engine.add_relations_batch([
+            Relation(make_entity("c0_0").id, "unresolved::missing", RelationType.CALLS),
+        ])
+        result = await CommunityDetector(min_size=1).detect(engine)
+
+        leaves = [c for c in result.communities if c.level == 0]
+        members = [m for c in leaves for m in c.member_ids]
+        assert len(members) == len(set(members)) == 64
+        assert "unresolved::missing" not in members
+        assert result.modularity > 0.7
+
+
+class TestHierarchicalGlobalSearch:
+    """Tests for global search descending the hierarchy."""
+
+    @pytest.mark.asyncio
+    async def test_descends_into_matching_branch(self, engine: GraphEngine):
+        """Test that only children of promising branches are scored."""
+        result = await CommunityDetector(min_size=1).detect(engine)
+        leaves = [c for c in result.communities if c.level == 0]
+        target = leaves[-1]
+        await engine._connection.execute(
+            "UPDATE communities SET summary = 'payment gateway' WHERE id = ?",
+            (target.id,),
+        )
+        by_id = {c.id: c for c in result.communities}
+        parent_id = target.parent_id
+        while parent_id is not None:
+            await engine._connection.execute(
+                "UPDATE communities SET summary = 'payment processing' WHERE id = ?",
+                (parent_id,),
+            )
+            parent_id = by_id[parent_id].parent_id
+        await engine._connection.commit()
+
+        search = GraphRAGSearch(engine, use_llm=False, max_communities=1)
+        found = await search.global_search("payment gateway", community_level=0)
+
+        assert found.relevant_communities[0]["id"] == target.id
+        assert found.communities_searched < len(result.communities)
+        assert {e.entity_id for e in found.supporting_entities} <= set(target.member_ids)
+
+    @pytest.mark.asyncio
+    async def test_coarse_community_entities(self, engine: GraphEngine):
+        """Test that coarse communities reach entities through their leaves."""
+        result = await CommunityDetector(min_size=1).detect(engine)
+        coarse = next(c for c in result.communities if c.level == 1)
+
+        search = GraphRAGSearch(engine, use_llm=False)
+        entities = await search._get_community_entities(coarse.id, limit=100)
+
+        assert {e.id for e in entities} == set(coarse.member_ids)
+
+
+async def community_counts(engine: GraphEngine) -> dict[int, tuple[int, int]]:
+    """Stored and actual member count of every level-0 community."""
+    cursor = await engine._connection.execute(
+        """
+        SELECT c.id, c.member_count,
+               (SELECT COUNT(*) FROM entities e WHERE e.community_id = c.id)
+        FROM communities c WHERE c.level = 0
+        """
+    )
+    return {row[0]: (row[1], row[2]) for row in await cursor.fetchall()}
+
+
+async def bowtie(engine: GraphEngine) -> dict[str, Entity]:
+    """
+    Two pairs joined through a hub, all in community 0 (parent 1), plus a
+    triangle in community 2 (parent 3) that ``b1`` also calls.
+    """
+    entities = {name: make_entity(name) for name in ("hub", "a1", "a2", "b1", "b2", "c1", "c2", "c3")}
+    edges = [
+        ("a1", "a2"), ("a1", "hub"), ("a2", "hub"),
+        ("b1", "b2"), ("b1", "hub"), ("b2", "hub"),
+        ("c1", "c2"), ("c2", "c3"), ("c1", "c3"), ("b1", "c1"),
+    ]
+    await engine.add_entities_batch(list(entities.values()))
+    await engine.add_relations_batch([
+        Relation(entities[a].id, entities[b].id, RelationType.CALLS) for a, b in edges
+    ])
+    await engine._connection.executemany(
+        "INSERT INTO communities (id, level, member_count, parent_id) VALUES (?, ?, ?, ?)",
+        [(1, 1, 5, None), (3, 1, 3, None), (0, 0, 5, 1), (2, 0, 3, 3)],
+    )
+    await engine._connection.executemany(
+        "UPDATE entities SET community_id = ? WHERE id = ?",
+        [(0 if name[0] in "hab" else 2, entity.id) for name, entity in entities.items()],
+    )
+    await engine._connection.execute(
+        "DELETE FROM relations WHERE source_id = ? OR target_id = ?",
+        (entities["hub"].id, entities["hub"].id),
+    )
+    await engine._connection.execute("DELETE FROM entities WHERE id = ?", (entities["hub"].id,))
+    await engine._connection.commit()
+    return entities
+
+
+class TestIncrementalUpdate:
+    """Tests for local-moving community maintenance."""
+
+    @pytest.mark.asyncio
+    async def test_reindexed_entities_keep_community(self, engine: GraphEngine):
+        """Test that re-parsed entities keep and confirm their community."""
+        await CommunityDetector(min_size=1).detect(engine)
+        entities, _ = ring_of_cliques(16, 4)
+        before = {e.id: e.community_id for e in await engine.search_by_name("c3_")}
+
+        await engine.add_entities_batch(entities[12:16])
+        result = await CommunityDetector(min_size=1).update_incremental(
+            engine, [e.id for e in entities[12:16]]
+        )
+
+        after = {e.id: e.community_id for e in await engine.search_by_name("c3_")}
+        assert after == before
+        assert result.communities == []
+        assert all(stored == actual for stored, actual in (await community_counts(engine)).values())
+
+    @pytest.mark.asyncio
+    async def test_new_entity_joins_neighbours(self, engine: GraphEngine):
+        """Test that a new entity joins the community it calls into."""
+        await CommunityDetector(min_size=1).detect(engine)
+        entities, _ = ring_of_cliques(16, 4)
+        target = await engine.get_entity(entities[20].id)
+        cursor = await engine._connection.execute(
+            "SELECT parent_id FROM communities WHERE id = ?", (target.community_id,)
+        )
+        parent_id = (await cursor.fetchone())[0]
+        cursor = await engine._connection.execute(
+            "SELECT member_count FROM communities WHERE id = ?", (parent_id,)
+        )
+        parent_count = (await cursor.fetchone())[0]
+
+        new = make_entity("new")
+        await engine.add_entities_batch([new])
+        await engine.add_relations_batch([
+            Relation(new.id, entities[20].id, RelationType.CALLS),
+            Relation(new.id, entities[21].id, RelationType.CALLS),
+        ])
+        await CommunityDetector(min_size=1).update_incremental(engine, [new.id])
+
+        assert (await engine.get_entity(new.id)).community_id == target.community_id
+        assert all(stored == actual for stored, actual in (await community_counts(engine)).values())
+        cursor = await engine._connection.execute(
+            "SELECT member_count FROM communities WHERE id = ?", (parent_id,)
+        )
+        assert (await cursor.fetchone())[0] == parent_count + 1
+
+    @pytest.mark.asyncio
+    async def test_disconnected_community_is_split(self, temp_dir: Path):
+        """Test that removing a bridging entity splits its community."""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        try:
+            entities = await bowtie(engine)
+            result = await CommunityDetector(min_size=2).update_incremental(
+                engine, [entities["a1"].id]
+            )
+
+            by_id = {c.id: c for c in result.communities}
+            assert by_id[0].member_ids == sorted([entities["a1"].id, entities["a2"].id])
+            (split,) = [c for c in result.communities if c.id not in (0, 2)]
+            assert split.member_ids == sorted([entities["b1"].id, entities["b2"].id])
+            assert split.parent_id == 1
+            assert await community_counts(engine) == {0: (2, 2), 2: (3, 3), split.id: (2, 2)}
+        finally:
+            await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_undersized_parts_are_merged(self, temp_dir: Path):
+        """Test that parts below min_size merge into a linked community or dissolve."""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        try:
+            entities = await bowtie(engine)
+            await CommunityDetector(min_size=3).update_incremental(engine, [entities["a1"].id])
+
+            communities = {
+                name: (await engine.get_entity(entities[name].id)).community_id
+                for name in ("a1", "a2", "b1", "b2", "c1")
+            }
+            assert communities == {"a1": None, "a2": None, "b1": 2, "b2": 2, "c1": 2}
+            assert await community_counts(engine) == {2: (5, 5)}
+            cursor = await engine._connection.execute(
+                "SELECT id, member_count FROM communities WHERE level = 1 ORDER BY id"
+            )
+            assert await cursor.fetchall() == [(1, 0), (3, 5)]
+        finally:
+            await engine.close()
@@ -0,0 +1,183 @@
+"""
+Unit tests for the Community Index module.
+
+Tests: REQ-TLS-010
+"""
+
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from codegraph_mcp.core.community_index import CommunityIndex
+from codegraph_mcp.core.graph import GraphEngine
+from codegraph_mcp.core.graphrag import GraphRAGSearch
+from codegraph_mcp.core.semantic import SemanticAnalyzer
+
+
+SUMMARIES = {
+    1: "Checks password authentication",
+    2: "Login password reset",
+    3: "Database storage and query helpers",
+    4: "Renders page template",
+}
+
+
+class ConceptModel:
+    """Embedding model stub that maps words onto a few concept axes."""
+
+    CONCEPTS = {
+        "login": 0, "password": 0, "authentication": 0,
+        "database": 1, "storage": 1, "query": 1, "persist": 1,
+        "renders": 2, "template": 2,
+    }
+
+    def encode(self, texts, batch_size=32):
+        vectors = np.zeros((len(texts), 4), dtype=np.float32)
+        vectors[:, 3] = 0.1
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                if word in self.CONCEPTS:
+                    vectors[i, self.CONCEPTS[word]] += 1
+        return vectors
+
+
+class MissingModel(SemanticAnalyzer):
+    """Analyzer without sentence-transformers installed."""
+
+    def generate_embeddings(self, texts):
+        raise ImportError("sentence-transformers not installed")
+
+
+def concept_analyzer() -> SemanticAnalyzer:
+    analyzer = SemanticAnalyzer()
+    analyzer._model = ConceptModel()
+    return analyzer
+
+
+async def add_communities(engine: GraphEngine, summaries: dict[int, str]) -> None:
+    """Store leaf communities with cached summaries."""
+    await engine._connection.executemany(
+        """
+        INSERT INTO communities (id, level, summary, summary_hash, member_count)
+        VALUES (?, 0, ?, ?, 1)
+        """,
+        [(id_, summary, f"hash{id_}") for id_, summary in summaries.items()],
+    )
+    await engine._connection.executemany(
+        "INSERT INTO community_summaries (hash, summary) VALUES (?, ?)",
+        [(f"hash{id_}", summary) for id_, summary in summaries.items()],
+    )
+    await engine._bump_generation("community_generation")
+    await engine._connection.commit()
+
+
+@pytest.fixture
+async def engine(temp_dir: Path):
+    """Engine holding four summarized communities."""
+    engine = GraphEngine(temp_dir)
+    await engine.initialize()
+    await add_communities(engine, SUMMARIES)
+    yield engine
+    await engine.close()
+
+
+class TestCommunityIndex:
+    """Tests for CommunityIndex."""
+
+    @pytest.mark.asyncio
+    async def test_bm25_without_embeddings(self, engine: GraphEngine):
+        """Test that only communities sharing query terms are scored."""
+        index = CommunityIndex()
+        await index.refresh(engine)
+
+        scores = await index.score("database query")
+
+        assert index.vectors is None
+        assert list(scores) == [3]
+        assert scores[3] == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_vectors_match_without_shared_terms(self, engine: GraphEngine):
+        """Test that summary embeddings rank related communities."""
+        await concept_analyzer().embed_communities(engine)
+        index = CommunityIndex(analyzer=concept_analyzer())
+        await index.refresh(engine)
+
+        scores = await index.score("persist records")
+
+        assert index.vectors.shape == (4, 4)
+        assert max(scores, key=scores.__getitem__) == 3
+
+    @pytest.mark.asyncio
+    async def test_exact_terms_break_ties(self, engine: GraphEngine):
+        """Test that BM25 separates communities with equal embeddings."""
+        await concept_analyzer().embed_communities(engine)
+        index = CommunityIndex(analyzer=concept_analyzer())
+        await index.refresh(engine)
+
+        scores = await index.score("login")
+
+        assert np.array_equal(index.vectors[0], index.vectors[1])
+        assert scores[2] > scores[1] > scores[3]
+
+    @pytest.mark.asyncio
+    async def test_query_embedded_off_event_loop(self, engine: GraphEngine):
+        """Test that the query is encoded in a worker thread."""
+        threads = []
+
+        class ThreadModel(ConceptModel):
+            def encode(self, texts, batch_size=32):
+                threads.append(threading.current_thread())
+                return super().encode(texts, batch_size)
+
+        await concept_analyzer().embed_communities(engine)
+        analyzer = SemanticAnalyzer()
+        analyzer._model = ThreadModel()
+        index = CommunityIndex(analyzer=analyzer)
+        await index.refresh(engine)
+
+        await index.score("persist records")
+
+        assert threads and threading.main_thread() not in threads
+
+    @pytest.mark.asyncio
+    async def test_missing_model_falls_back_to_bm25(self, engine: GraphEngine):
+        """Test that queries still rank without sentence-transformers."""
+        await concept_analyzer().embed_communities(engine)
+        index = CommunityIndex(analyzer=MissingModel())
+        await index.refresh(engine)
+
+        assert await index.score("login") == {2: pytest.approx(1.0)}
+        assert index.vectors is None
+
+    @pytest.mark.asyncio
+    async def test_reloads_when_generation_changes(self, engine: GraphEngine):
+        """Test that the index is rebuilt only after community writes."""
+        index = CommunityIndex()
+        await index.refresh(engine)
+        generation = index.generation
+
+        await engine._connection.execute("UPDATE communities SET summary = 'cache' WHERE id = 4")
+        await engine._connection.commit()
+        await index.refresh(engine)
+        assert index.generation == generation
+        assert await index.score("cache") == {}
+
+        await add_communities(engine, {5: "Cache eviction"})
+        await index.refresh(engine)
+        assert index.generation == generation + 1
+        assert set(await index.score("cache")) == {4, 5}
+
+    @pytest.mark.asyncio
+    async def test_global_search_uses_attached_index(self, engine: GraphEngine):
+        """Test that global search ranks with the engine's shared index."""
+        await concept_analyzer().embed_communities(engine)
+        engine.community_index = CommunityIndex(analyzer=concept_analyzer())
+
+        search = GraphRAGSearch(engine, use_llm=False, max_communities=2)
+        result = await search.global_search("persist records")
+
+        assert result.relevant_communities[0]["id"] == 3
+        assert engine.community_index.is_loaded
@@ -0,0 +1,154 @@
+"""
+Unit tests for the CSR Graph module.
+
+Tests: REQ-GRF-001, REQ-TLS-002, REQ-TLS-005
+"""
+
+import random
+import sys
+
+import networkx as nx
+import pytest
+
+from codegraph_mcp.core.csr import CSRGraph
+
+
+NODES = [
+    ("a", "function", "/repo/a.py"),
+    ("b", "function", "/repo/b.py"),
+    ("c", "function", "/repo/c.py"),
+    ("d", "class", "/repo/c.py"),
+]
+EDGES = [
+    ("a", "b", "calls", 1.0),
+    ("a", "c", "imports", 1.0),
+    ("b", "c", "calls", 1.0),
+    ("c", "d", "contains", 1.0),
+    ("b", "unresolved::x", "calls", 1.0),
+]
+
+
+@pytest.fixture
+def csr() -> CSRGraph:
+    """Create a small graph."""
+    return CSRGraph.build(NODES, EDGES)
+
+
+def random_graph(n: int, m: int, seed: int = 7) -> list[tuple[str, str, str, float]]:
+    """Create random edges over ``n`` nodes."""
+    rng = random.Random(seed)
+    return [
+        (f"n{rng.randrange(n)}", f"n{rng.randrange(n)}", rng.choice(["calls", "uses"]), 1.0)
+        for _ in range(m)
+    ]
+
+
+class TestCSRGraph:
+    """Tests for CSRGraph."""
+
+    def test_build(self, csr):
+        """Test node mapping, edge-only nodes and adjacency."""
+        assert csr.number_of_nodes() == 5
+        assert csr.number_of_edges() == 5
+        assert "unresolved::x" in csr
+        assert csr.node_type("d") == "class"
+        assert csr.node_type("unresolved::x") == ""
+        assert csr.successors("a") == ["b", "c"]
+        assert sorted(csr.predecessors("c")) == ["a", "b"]
+
+    def test_bfs_levels_and_edge_types(self, csr):
+        """Test bounded BFS with direction and edge type filters."""
+        assert csr.bfs("a", depth=1) == {"a": 0, "b": 1, "c": 1}
+        assert csr.bfs("a") == {"a": 0, "b": 1, "c": 1, "unresolved::x": 2, "d": 2}
+        assert csr.bfs("a", edge_types=["calls"]) == {
+            "a": 0, "b": 1, "unresolved::x": 2, "c": 2,
+        }
+        assert csr.bfs("d", direction="in") == {"d": 0, "c": 1, "a": 2, "b": 2}
+        assert csr.bfs("missing") == {}
+
+    def test_k_hop(self, csr):
+        """Test k-hop neighborhoods over both directions."""
+        assert set(csr.k_hop("c", 1)) == {"a", "b", "d"}
+        assert set(csr.k_hop("d", 2)) == {"a", "b", "c"}
+
+    def test_shortest_path(self, csr):
+        """Test shortest path reconstruction."""
+        assert csr.shortest_path("a", "d") == ["a", "c", "d"]
+        assert csr.shortest_path("d", "a") is None
+        assert csr.shortest_path("a", "d", max_depth=1) is None
+
+    def test_all_simple_paths_match_networkx(self):
+        """Test path enumeration against NetworkX."""
+        edges = random_graph(30, 120)
+        csr = CSRGraph.build((), edges)
+        G = nx.DiGraph((s, t) for s, t, _, _ in edges)
+
+        for source, target in [("n1", "n2"), ("n3", "n4"), ("n5", "n5")]:
+            if source not in G or target not in G:
+                continue
+            expected = {tuple(p) for p in nx.all_simple_paths(G, source, target, cutoff=4)}
+            actual = {tuple(p) for p in csr.all_simple_paths(source, target, cutoff=4)}
+            assert actual == expected
+
+    def test_patched_matches_rebuild(self, csr):
+        """Test replacing a file's nodes and a node's out-edges."""
+        patched = csr.patched(
+            removed_files=["/repo/c.py"],
+            relinked=["a"],
+            nodes=[("c2", "function", "/repo/c.py")],
+            edges=[("a", "c2", "imports", 1.0), ("b", "c2", "calls", 1.0)],
+        )
+
+        assert "c" not in patched and "d" not in patched
+        assert set(patched.successors("a")) == {"c2"}
+        assert set(patched.successors("b")) == {"c2", "unresolved::x"}
+        assert patched.node_type("c2") == "function"
+
+    def test_patched_random_graph_matches_build(self):
+        """Test that spliced arrays equal a full rebuild of the same tuples."""
+        nodes = [(f"n{i}", "function", f"/repo/f{i % 20}.py") for i in range(200)]
+        edges = random_graph(200, 1000)
+        csr = CSRGraph.build(nodes, edges)
+        removed = {"/repo/f3.py", "/repo/f7.py"}
+        new_nodes = [("n3", "class", "/repo/f3.py"), ("fresh", "function", "/repo/new.py")]
+        new_edges = [("n3", "fresh", "calls", 2.0), ("n5", "n3", "uses", 1.0)]
+
+        patched = csr.patched(removed, ["n5"], new_nodes, new_edges)
+
+        dropped = {n[0] for n in nodes if n[2] in removed}
+        expected = CSRGraph.build(
+            [n for n in nodes if n[2] not in removed] + new_nodes,
+            [
+                e for e in edges
+                if e[0] not in dropped and e[1] not in dropped and e[0] != "n5"
+            ] + new_edges,
+        )
+        assert patched.ids == expected.ids
+        assert list(patched.edges()) == list(expected.edges())
+        assert [patched.node_type(n) for n in patched.ids] == [
+            expected.node_type(n) for n in expected.ids
+        ]
+
+    def test_to_networkx(self, csr):
+        """Test NetworkX conversion."""
+        G = csr.to_networkx()
+        assert set(G.edges()) == {(s, t) for s, t, _, _ in EDGES}
+        assert G.nodes["d"]["type"] == "class"
+        assert G.edges["a", "c"]["type"] == "imports"
+
+    def test_memory_per_edge(self):
+        """Test that CSR edges are at least 10x smaller than NetworkX edges."""
+        edges = random_graph(2_000, 20_000)
+        csr = CSRGraph.build((), edges)
+        G = nx.DiGraph()
+        G.add_edges_from((s, t, {"type": et, "weight": w}) for s, t, et, w in edges)
+
+        def deep_size(obj: object) -> int:
+            size = sys.getsizeof(obj)
+            if isinstance(obj, dict):
+                size += sum(deep_size(v) for v in obj.values())
+            return size
+
+        nx_edge_bytes = deep_size(G._succ) + deep_size(G._pred)
+        csr_edge_bytes = csr.nbytes
+        assert nx_edge_bytes >= 10 * csr_edge_bytes
@@ -276,3 +276,87 @@ class TestModuleFunctions:
         with patch.object(EngineManager, 'close_all', new_callable=AsyncMock) as mock_close:
             await shutdown_all()
             mock_close.assert_called_once()
+
+
+class TestEngineManagerSnapshot:
+    """グラフスナップショット管理のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_attached_and_patched(self, temp_repo: Path):
+        """Manager shares one snapshot and patches it after incremental runs."""
+        from codegraph_mcp.core.engine_manager import EngineManager
+        from codegraph_mcp.core.indexer import IndexResult
+
+        EngineManager._instances.clear()
+
+        manager = await EngineManager.get_instance(temp_repo)
+        engine = await manager.get_engine()
+        assert engine.snapshot is manager._snapshot
+
+        graph = await manager.get_graph()
+        assert manager._snapshot.is_loaded
+        assert graph.number_of_nodes() == 0
+
+        with patch.object(manager._snapshot, "patch", new_callable=AsyncMock) as mock_patch:
+            await manager.apply_index_result(
+                IndexResult(incremental=True, changed_files=[temp_repo / "a.py"])
+            )
+            mock_patch.assert_called_once_with(engine, [temp_repo / "a.py"], [])
+
+        await manager.apply_index_result(IndexResult())
+        assert not manager._snapshot.is_loaded
+
+        await EngineManager.close_all()
+
+
+class TestEngineManagerReadPool:
+    """読み取り専用接続プールのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_readers_are_pooled(self, temp_repo: Path):
+        """Concurrent borrowers get distinct read-only engines."""
+        from codegraph_mcp.config import StorageConfig
+        from codegraph_mcp.core.engine_manager import EngineManager
+
+        EngineManager._instances.clear()
+        manager = await EngineManager.get_instance(temp_repo, StorageConfig(read_pool_size=2))
+        writer = await manager.get_engine()
+
+        async with manager.read_engine() as r1, manager.read_engine() as r2:
+            assert r1 is not r2
+            assert r1.read_only and r2.read_only
+            assert r1.snapshot is manager._snapshot
+
+        # Third borrower waits until one is returned
+        async with manager.read_engine() as r1:
+            waiter = asyncio.ensure_future(_borrow_twice(manager))
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+        assert len(await waiter) == 2
+
+        assert (await manager.healthcheck())["read_connections"] == 2
+        await manager.close()
+        assert manager._readers == []
+        assert writer._connection is None
+
+        await EngineManager.close_all()
+
+    @pytest.mark.asyncio
+    async def test_pool_disabled_uses_writer(self, temp_repo: Path):
+        """read_pool_size=0 shares the writer connection."""
+        from codegraph_mcp.config import StorageConfig
+        from codegraph_mcp.core.engine_manager import EngineManager
+
+        EngineManager._instances.clear()
+        manager = await EngineManager.get_instance(temp_repo, StorageConfig(read_pool_size=0))
+
+        async with manager.read_engine() as reader:
+            assert reader is await manager.get_engine()
+
+        await EngineManager.close_all()
+
+
+async def _borrow_twice(manager) -> set:
+    """Hold two pooled readers at once."""
+    async with manager.read_engine() as a, manager.read_engine() as b:
+        return {id(a), id(b)}
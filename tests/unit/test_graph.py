@@ -526,6 +526,592 @@ class TestPartialEntityIdMatching:
         await engine.close()
 
 
+class TestFrontierExpansion:
+    """レベル単位のフロンティア展開のテスト"""
+
+    @staticmethod
+    async def make_hub(engine: GraphEngine, fan_out: int = 50) -> Entity:
+        """Create hub -> mid_i -> leaf_i and return the hub entity."""
+        hub = make_entity("hub")
+        entities = [hub]
+        relations = []
+        for i in range(fan_out):
+            mid = make_entity(f"mid_{i}", line=10 + i)
+            leaf = make_entity(f"leaf_{i}", line=100 + i)
+            entities += [mid, leaf]
+            relations += [
+                Relation(hub.id, mid.id, RelationType.CALLS),
+                Relation(mid.id, leaf.id, RelationType.CALLS),
+            ]
+        await engine.add_entities_batch(entities)
+        await engine.add_relations_batch(relations)
+        return hub
+
+    @staticmethod
+    def count_queries(engine: GraphEngine) -> list[str]:
+        """Record SQL statements executed on the engine's connection."""
+        statements: list[str] = []
+        execute = engine._connection.execute
+
+        def counting_execute(sql, *args, **kwargs):
+            statements.append(sql)
+            return execute(sql, *args, **kwargs)
+
+        engine._connection.execute = counting_execute
+        return statements
+
+    @pytest.mark.asyncio
+    async def test_find_dependencies_queries_per_level(self, temp_dir):
+        """Dependency traversal issues O(depth) queries, not O(nodes)."""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        hub = await self.make_hub(engine)
+
+        statements = self.count_queries(engine)
+        result = await engine.find_dependencies(hub.id, depth=2)
+
+        assert len(result.entities) == 101
+        assert len(result.relations) == 100
+        assert len(statements) <= 6
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_get_subgraph_queries_per_level(self, temp_dir):
+        """Subgraph extraction issues O(depth) queries and no duplicate edges."""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        await self.make_hub(engine)
+
+        statements = self.count_queries(engine)
+        result = await engine.get_subgraph("hub", depth=1)
+
+        assert {e.name for e in result.entities} == {"hub"} | {
+            f"mid_{i}" for i in range(50)
+        }
+        assert len(result.relations) == 100
+        assert len(statements) <= 8
+
+        await engine.close()
+
+
+class TestFullTextSearch:
+    """FTS5全文検索インデックスのテスト"""
+
+    @staticmethod
+    async def make_engine(temp_dir) -> GraphEngine:
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        docs = make_entity("load_config", line=30)
+        docs.docstring = "Read the user name from disk."
+        await engine.add_entities_batch([
+            make_entity("getUserName", line=1),
+            make_entity("set_user_name", line=10),
+            make_entity("HTTPServer", EntityType.CLASS, line=20),
+            docs,
+        ])
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_identifier_aware_matching(self, temp_dir):
+        """camelCase と snake_case の分割で一致する"""
+        engine = await self.make_engine(temp_dir)
+
+        names = {e.name for e in await engine.search_entities("userName")}
+        assert {"getUserName", "set_user_name"} <= names
+        assert [e.name for e in await engine.search_by_name("server")] == ["HTTPServer"]
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_bm25_ranks_name_over_docstring(self, temp_dir):
+        """名前の一致はdocstringの一致より上位になる"""
+        engine = await self.make_engine(temp_dir)
+
+        names = [e.name for e in await engine.search_entities("user name")]
+        assert names[-1] == "load_config"
+        assert {e.name for e in await engine.search_by_name("user name")} == {
+            "getUserName", "set_user_name",
+        }
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_index_follows_writes(self, temp_dir):
+        """置換・削除で全文インデックスが同期される"""
+        engine = await self.make_engine(temp_dir)
+
+        renamed = make_entity("getUserName", line=1)
+        renamed.name = "fetchAccount"
+        renamed.qualified_name = "/test/file.py::fetchAccount"
+        await engine.add_entity(renamed)
+        assert "fetchAccount" in {e.name for e in await engine.search_entities("account")}
+        assert "fetchAccount" not in {e.name for e in await engine.search_entities("user")}
+
+        await engine.delete_file_entities("/test/file.py")
+        assert await engine.search_entities("account") == []
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_substring_fallback_and_backfill(self, temp_dir):
+        """部分文字列はトライグラムで検索され、既存DBはバックフィルされる"""
+        engine = await self.make_engine(temp_dir)
+        assert [e.name for e in await engine.search_entities("TTPServ")] == ["HTTPServer"]
+
+        # Simulate a database indexed before the full-text table existed
+        await engine._connection.execute("DELETE FROM entities_fts")
+        await engine._connection.execute("DELETE FROM index_state WHERE key = 'fts_built'")
+        await engine._connection.commit()
+        await engine.close()
+
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        result = await engine.query("server")
+        assert [e.name for e in result.entities] == ["HTTPServer"]
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_token_and_infix_matches_are_merged(self, temp_dir):
+        """トークン一致の後に部分文字列一致が続く"""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        try:
+            await engine.add_entities_batch([
+                make_entity("reparse", line=1),
+                make_entity("parse_file", line=10),
+                make_entity("preparsed", line=20),
+            ])
+
+            names = [e.name for e in await engine.search_entities("parse")]
+            assert names[0] == "parse_file"
+            assert sorted(names[1:]) == ["preparsed", "reparse"]
+            assert [e.name for e in await engine.search_by_name("parse", limit=2)] == [
+                "parse_file", "reparse",
+            ]
+            result = await engine.query("parse")
+            assert {e.name for e in result.entities} == {"parse_file", "reparse", "preparsed"}
+
+            # Type filters apply to both the full-text and substring hits
+            assert await engine.search_entities("parse", entity_type=EntityType.CLASS) == []
+            assert await engine.search_by_name("parse", entity_types=[EntityType.CLASS]) == []
+        finally:
+            await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_search_after_vacuum(self, temp_dir):
+        """VACUUM 後も索引が正しいエンティティを指す"""
+        from codegraph_mcp.storage.sqlite import SQLiteStorage
+
+        engine = await self.make_engine(temp_dir)
+        storage = SQLiteStorage(engine.db_path)
+        try:
+            # Leave gaps in the rowids for VACUUM to close
+            await engine.delete_file_entities("/test/file.py")
+            await engine.add_entities_batch([
+                make_entity(f"filler{i}", file_path="/test/other.py", line=i) for i in range(5)
+            ])
+            await engine.add_entity(make_entity("getUserName", file_path="/test/b.py"))
+            await engine.delete_file_entities("/test/other.py")
+
+            await storage.initialize()
+            await storage.vacuum()
+
+            assert [e.name for e in await engine.search_entities("userName")] == ["getUserName"]
+            assert [e.name for e in await engine.search_entities("etUser")] == ["getUserName"]
+        finally:
+            await storage.close()
+            await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_legacy_entity_table_is_rebuilt(self, temp_dir):
+        """暗黙のrowidを使う既存テーブルはrowidを保ったまま再構築される"""
+        import sqlite3
+
+        db_path = temp_dir / ".codegraph" / "graph.db"
+        db_path.parent.mkdir()
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE entities (
+                    id TEXT PRIMARY KEY, type TEXT NOT NULL, name TEXT NOT NULL,
+                    qualified_name TEXT NOT NULL, file_path TEXT NOT NULL,
+                    start_line INTEGER NOT NULL, end_line INTEGER NOT NULL,
+                    start_column INTEGER DEFAULT 0, end_column INTEGER DEFAULT 0,
+                    signature TEXT, docstring TEXT, source_code TEXT, embedding BLOB,
+                    community_id INTEGER, metadata TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            conn.executemany(
+                """
+                INSERT INTO entities (rowid, id, type, name, qualified_name,
+                                      file_path, start_line, end_line)
+                VALUES (?, ?, 'function', ?, ?, 'a.py', 1, 2)
+                """,
+                [(7, "a.py::load_user", "load_user", "a.py::load_user"),
+                 (3, "a.py::save_user", "save_user", "a.py::save_user")],
+            )
+
+        engine = GraphEngine(temp_dir)
+        try:
+            await engine.initialize()
+            cursor = await engine._connection.execute("SELECT rowid, id FROM entities ORDER BY id")
+            assert await cursor.fetchall() == [(7, "a.py::load_user"), (3, "a.py::save_user")]
+            cursor = await engine._connection.execute("PRAGMA table_info(entities)")
+            assert "rowid" in {row[1] for row in await cursor.fetchall()}
+
+            await engine._connection.execute("VACUUM")
+            assert [e.name for e in await engine.search_entities("save")] == ["save_user"]
+        finally:
+            await engine.close()
+
+
+
+
+class TestReplaceFiles:
+    """ファイル単位のエンティティ集合置換のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_vanished_entities_removed(self, temp_dir):
+        """消えたエンティティとその関係が削除され、残りは置換される"""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        keep = make_entity("keep", file_path="/test/a.py", line=1)
+        gone = make_entity("gone", file_path="/test/a.py", line=10)
+        other = make_entity("other", file_path="/test/b.py")
+        await engine.add_entities_batch([keep, gone, other])
+        await engine.add_relations_batch([
+            Relation(keep.id, gone.id, RelationType.CALLS),
+            Relation(keep.id, other.id, RelationType.CALLS),
+            Relation(other.id, gone.id, RelationType.CALLS),
+        ])
+
+        moved = make_entity("gone", file_path="/test/a.py", line=12)
+        result = await engine.replace_files([
+            (Path("/test/a.py"), [keep, moved], [Relation(keep.id, moved.id, RelationType.CALLS)]),
+        ])
+
+        assert result.entities_removed == 1
+        assert result.relinked_ids == {other.id}
+        assert await engine.get_entities_by_ids([gone.id]) == []
+        cursor = await engine._connection.execute(
+            "SELECT source_id, target_id FROM relations ORDER BY source_id"
+        )
+        # keep -> other was not re-emitted; other -> gone had no placeholder
+        assert await cursor.fetchall() == [(keep.id, moved.id)]
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_resolved_edges_revert_to_placeholder(self, temp_dir):
+        """解決済みの参照は元のプレースホルダーに戻る"""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        target = make_entity("target", file_path="/test/a.py", line=3)
+        caller = make_entity("caller", file_path="/test/b.py")
+        await engine.add_entities_batch([target, caller])
+        await engine.add_relation(Relation(
+            caller.id, target.id, RelationType.CALLS,
+            metadata={"original_target": "unresolved::target", "line": 7},
+        ))
+
+        await engine.delete_file_entities(Path("/test/a.py"))
+
+        cursor = await engine._connection.execute(
+            "SELECT target_id, metadata FROM relations WHERE source_id = ?",
+            (caller.id,),
+        )
+        assert await cursor.fetchall() == [("unresolved::target", '{"line":7}')]
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_columnar_input(self, temp_dir):
+        """列形式のバッチもオブジェクトと同じように書き込まれる"""
+        from codegraph_mcp.core.parser import EntityColumns, RelationColumns
+
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        caller, callee = make_entity("caller"), make_entity("callee")
+        callee.source_code = "def callee(): pass"
+        relation = make_relation("caller", "callee")
+
+        result = await engine.replace_files([(
+            Path("/test/file.py"),
+            EntityColumns.from_entities([caller, callee]),
+            RelationColumns.from_relations([relation]),
+        )])
+
+        assert (result.entities_written, result.relations_written) == (2, 1)
+        assert [e.name for e in await engine.find_callers(callee.id)] == ["caller"]
+        assert [e.name for e in await engine.search_entities("callee")] == ["callee"]
+        assert await engine.get_sources([callee.id]) == {callee.id: callee.source_code}
+
+        await engine.close()
+
+
+class TestEntitySources:
+    """圧縮・重複排除されたソース本文のテスト"""
+
+    @staticmethod
+    async def blob_count(engine: GraphEngine) -> int:
+        cursor = await engine._connection.execute("SELECT COUNT(*) FROM source_blobs")
+        return (await cursor.fetchone())[0]
+
+    @pytest.mark.asyncio
+    async def test_batch_write_stores_source_lazily(self, temp_dir):
+        """バッチ書き込みでソースが保存され、要求時のみ読み込まれる"""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        entity = make_entity("with_body")
+        entity.source_code = "def with_body():\n    return 1\n"
+        await engine.add_entities_batch([entity])
+
+        assert (await engine.get_entity(entity.id)).source_code is None
+        loaded = await engine.get_entity(entity.id, include_source=True)
+        assert loaded.source_code == entity.source_code
+
+        cursor = await engine._connection.execute("SELECT source_code FROM entities")
+        assert (await cursor.fetchone())[0] is None
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_identical_bodies_are_shared(self, temp_dir):
+        """同一内容は1つのblobを共有し、参照がなくなると削除される"""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        a = make_entity("dup", file_path="/test/a.py")
+        b = make_entity("dup", file_path="/test/b.py")
+        a.source_code = b.source_code = "def dup():\n    pass\n"
+        await engine.add_entities_batch([a, b])
+        assert await self.blob_count(engine) == 1
+
+        await engine.delete_file_entities(Path("/test/a.py"))
+        assert await engine.get_sources([b.id]) == {b.id: b.source_code}
+
+        b.source_code = "def dup():\n    return 2\n"
+        await engine.add_entities_batch([b])
+        assert await self.blob_count(engine) == 1
+        assert await engine.get_sources([b.id]) == {b.id: b.source_code}
+
+        await engine.delete_file_entities(Path("/test/b.py"))
+        assert await self.blob_count(engine) == 0
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_inline_legacy_source(self, temp_dir):
+        """旧形式のインラインsource_codeも読める"""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        entity = make_entity("legacy")
+        await engine.add_entity(entity)
+        await engine._connection.execute(
+            "UPDATE entities SET source_code = 'def legacy(): pass' WHERE id = ?",
+            (entity.id,),
+        )
+        await engine._connection.commit()
+
+        assert await engine.get_sources([entity.id]) == {entity.id: "def legacy(): pass"}
+
+        await engine.close()
+
+
+class TestEntityProjection:
+    """列を絞った読み込みと遅延デコードのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_metadata_decoded_on_access(self, temp_dir):
+        """metadata は初回アクセス時にデコードされる"""
+        from codegraph_mcp.core.graph import StoredEntity
+
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        entity = make_entity("lazy_meta")
+        entity.metadata = {"decorators": ["cached"]}
+        entity.source_code = "def lazy_meta(): pass"
+        await engine.add_entities_batch([entity])
+        await engine._connection.execute(
+            "UPDATE entities SET community_id = 7, embedding = x'00' WHERE id = ?",
+            (entity.id,),
+        )
+        await engine._connection.commit()
+
+        (found,) = await engine.search_entities("lazy_meta")
+        assert isinstance(found, StoredEntity)
+        assert found._metadata is None
+        assert found.community_id == 7
+        assert found.source_code is None
+
+        assert found.metadata == {"decorators": ["cached"]}
+        assert found.metadata is found.metadata
+        found.metadata = {}
+        assert found.metadata == {}
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_read_paths_return_projected_entities(self, temp_dir):
+        """各読み込み経路が同じ射影からエンティティを復元する"""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        caller, callee = make_entity("caller"), make_entity("callee")
+        caller.metadata = {"async": True}
+        await engine.add_entities_batch([caller, callee])
+        await engine.add_relations_batch([make_relation("caller", "callee")])
+
+        def view(entities):
+            return [(e.id, e.type, e.location, e.metadata) for e in entities]
+
+        try:
+            expected = view([caller])
+            assert view(await engine.find_callers(callee.id)) == expected
+            assert view(await engine.get_neighbors(callee.id)) == expected
+            assert view([await engine.get_entity(caller.id)]) == expected
+            assert view(await engine.find_callees(caller.id)) == view([callee])
+            assert view(await engine.get_entities_by_ids([callee.id, caller.id])) == view(
+                [callee, caller]
+            )
+        finally:
+            await engine.close()
+
+
+class TestConnectionSettings:
+    """接続プラグマと読み取り専用接続のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_wal_and_pragmas(self, temp_dir):
+        """既定でWALと設定済みプラグマが適用される"""
+        from codegraph_mcp.config import StorageConfig
+
+        engine = GraphEngine(temp_dir, storage=StorageConfig(cache_size_mb=8))
+        await engine.initialize()
+
+        async def pragma(name):
+            cursor = await engine._connection.execute(f"PRAGMA {name}")
+            return (await cursor.fetchone())[0]
+
+        assert await pragma("journal_mode") == "wal"
+        assert await pragma("synchronous") == 1  # NORMAL
+        assert await pragma("temp_store") == 2  # MEMORY
+        assert await pragma("cache_size") == -8 * 1024
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_pragma_value(self, temp_dir):
+        """不正なプラグマ値は ValueError"""
+        from codegraph_mcp.config import StorageConfig
+
+        engine = GraphEngine(temp_dir, storage=StorageConfig(synchronous="fast"))
+        with pytest.raises(ValueError):
+            await engine.initialize()
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_read_only_engine(self, temp_dir):
+        """読み取り専用接続は書き込み中のコミット済みデータを読める"""
+        import sqlite3
+
+        with pytest.raises(FileNotFoundError):
+            await GraphEngine(temp_dir, read_only=True).initialize()
+
+        writer = GraphEngine(temp_dir)
+        await writer.initialize()
+        await writer.add_entity(make_entity("reader_visible"))
+
+        reader = GraphEngine(temp_dir, read_only=True)
+        await reader.initialize()
+        assert await reader.resolve_entity_id("reader_visible") is not None
+        assert [e.name for e in await reader.search_entities("der_visi")] == ["reader_visible"]
+        with pytest.raises(sqlite3.OperationalError):
+            await reader.add_entity(make_entity("rejected"))
+
+        await reader.close()
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_adds_missing_columns(self, temp_dir):
+        """既存データベースに後から追加された列が補われる"""
+        import sqlite3
+
+        db_path = temp_dir / ".codegraph" / "graph.db"
+        db_path.parent.mkdir()
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE embedding_rows (entity_id TEXT PRIMARY KEY, row INTEGER NOT NULL)"
+            )
+
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        try:
+            cursor = await engine._connection.execute("PRAGMA table_info(embedding_rows)")
+            assert "content_hash" in {row[1] for row in await cursor.fetchall()}
+        finally:
+            await engine.close()
+
+
+class TestTrigramResolution:
+    """トライグラムインデックスによる部分ID解決のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_partial_id_suffix(self, temp_dir):
+        """IDの末尾（ファイル::名前::行）で解決できる"""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        e1 = make_entity("handler", file_path="/repo/api/views.py", line=12)
+        e2 = make_entity("handler", file_path="/repo/cli/views.py", line=40)
+        await engine.add_entities_batch([e1, e2])
+
+        assert await engine.resolve_entity_id("api/views.py::handler::12") == e1.id
+        assert await engine.resolve_entity_id("cli/views.py::handler") == e2.id
+        # Ambiguous suffixes still resolve to nothing
+        assert await engine.resolve_entity_id("views.py::handler") is None
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_underscore_is_literal(self, temp_dir):
+        """LIKEのワイルドカード文字はそのまま一致する"""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        await engine.add_entities_batch([
+            make_entity("parse_x", line=1),
+            make_entity("parsex", line=2),
+        ])
+
+        assert [e.name for e in await engine.search_by_name("arse_")] == ["parse_x"]
+        assert await engine.resolve_entity_id("file.py::parse_x") == "/test/file.py::parse_x::1"
+
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_index_follows_writes(self, temp_dir):
+        """置換・削除・clearでトライグラムインデックスが同期される"""
+        engine = GraphEngine(temp_dir)
+        await engine.initialize()
+        entity = make_entity("ReportBuilder", EntityType.CLASS, file_path="/a/report.py")
+        await engine.add_entity(entity)
+        await engine.add_entity(entity)
+        assert [e.name for e in await engine.search_entities("ortBuil")] == ["ReportBuilder"]
+
+        await engine.delete_file_entities("/a/report.py")
+        assert await engine.search_entities("ortBuil") == []
+        assert await engine.resolve_entity_id("report.py::ReportBuilder") is None
+
+        await engine.add_entity(entity)
+        await engine.clear()
+        cursor = await engine._connection.execute("SELECT COUNT(*) FROM entities_trigram")
+        assert (await cursor.fetchone())[0] == 0
+
+        await engine.close()
+
+
 class TestQueryScoring:
     """クエリスコアリング機能のテスト"""
 
@@ -101,6 +101,10 @@ class TestGraphRAGSearch:
         """Create a mock graph engine."""
         engine = MagicMock()
         engine._connection = MagicMock()
+        engine.community_index = None
+        engine.snapshot = None
+        engine.get_generation = AsyncMock(return_value=0)
+        engine.load_sources = AsyncMock()
         return engine
 
     def test_init(self, mock_engine):
@@ -122,6 +126,7 @@ class TestGraphRAGSearch:
         """Test global search with no communities."""
         # Mock empty communities
         cursor_mock = AsyncMock()
+        cursor_mock.fetchone = AsyncMock(return_value=(None,))  # MAX(level)
         cursor_mock.fetchall = AsyncMock(return_value=[])
         mock_engine._connection.execute = AsyncMock(return_value=cursor_mock)
 
@@ -135,24 +140,25 @@ class TestGraphRAGSearch:
     @pytest.mark.asyncio
     async def test_global_search_with_communities(self, mock_engine):
         """Test global search with communities."""
-        # Mock for communities and entities queries
-        call_count = [0]
-
-        async def mock_fetchall():
-            call_count[0] += 1
-            if call_count[0] == 1:
-                # First call: _get_communities_with_summaries
-                return [
-                    (1, 0, "Auth Module", "Authentication and authorization", 10),
-                    (2, 0, "Data Module", "Data processing utilities", 8),
-                ]
+        communities = [
+            (1, 0, "Auth Module", "Authentication and authorization", 10),
+            (2, 0, "Data Module", "Data processing utilities", 8),
+        ]
+
+        async def mock_execute(sql, *args):
+            cursor_mock = AsyncMock()
+            cursor_mock.fetchone = AsyncMock(return_value=(0,))  # MAX(level)
+            if "community_summaries" in sql:
+                # Community index: id, name, summary, embedding, model
+                rows = [(c[0], c[2], c[3], None, None) for c in communities]
+            elif "FROM communities" in sql and "community_tree" not in sql:
+                rows = communities
             else:
-                # Subsequent calls: _get_community_entities
-                return []  # No entities for simplicity
+                rows = []  # No entities for simplicity
+            cursor_mock.fetchall = AsyncMock(return_value=rows)
+            return cursor_mock
 
-        cursor_mock = AsyncMock()
-        cursor_mock.fetchall = mock_fetchall
-        mock_engine._connection.execute = AsyncMock(return_value=cursor_mock)
+        mock_engine._connection.execute = mock_execute
 
         search = GraphRAGSearch(mock_engine, use_llm=False)
         result = await search.global_search("authentication")
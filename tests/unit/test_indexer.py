@@ -9,6 +9,7 @@ from pathlib import Path
 
 import pytest
 
+from codegraph_mcp.core.graph import GraphEngine
 from codegraph_mcp.core.indexer import FileInfo, Indexer, IndexResult
 from codegraph_mcp.core.parser import ASTParser
 
@@ -195,6 +196,198 @@ class TestIndexer:
         # Should still succeed, but may have errors
         assert result.files_indexed >= 1
 
+    def test_indexer_workers(self):
+        """Test worker count configuration."""
+        assert Indexer().workers == 1
+        assert Indexer(workers=4).workers == 4
+        assert Indexer(workers=0).workers >= 1
+
+    @pytest.mark.asyncio
+    async def test_parse_batches_bounded(self, temp_repo: Path):
+        """Test that parse results are yielded in bounded, ordered batches."""
+        indexer = Indexer(batch_size=2)
+        files = indexer._get_all_files(temp_repo)
+
+        batches = [batch async for batch in indexer._parse_batches(files)]
+
+        assert [len(b) for b in batches] == [2, 1]
+        assert [path for b in batches for path, _, _ in b] == files
+
+    @pytest.mark.asyncio
+    async def test_parallel_matches_serial(self, temp_repo: Path):
+        """Test that the process-pool path produces the serial result."""
+        files = Indexer()._get_all_files(temp_repo)
+
+        serial = [
+            b async for b in Indexer(batch_size=1)._parse_batches(files)
+        ]
+        parallel = [
+            b async for b in Indexer(workers=2, batch_size=1)._parse_batches(files)
+        ]
+
+        def flatten(batches):
+            return [
+                (
+                    path,
+                    [e.id for e in result.entities],
+                    [(r.source_id, r.target_id, r.type) for r in result.relations],
+                )
+                for batch in batches
+                for path, result, _ in batch
+            ]
+
+        assert flatten(parallel) == flatten(serial)
+
+    @pytest.mark.asyncio
+    async def test_streaming_flush_at_high_water_mark(self, temp_repo: Path):
+        """Test that parsed batches are flushed as they are produced."""
+        indexer = Indexer(batch_size=1, high_water_mark=1)
+        flushed_files: list[int] = []
+        original_flush = indexer._flush
+
+        async def tracking_flush(file_updates):
+            flushed_files.append(len(file_updates))
+            await original_flush(file_updates)
+
+        indexer._flush = tracking_flush  # type: ignore[method-assign]
+        result = await indexer.index_repository(temp_repo, incremental=False)
+
+        assert result.success is True
+        assert flushed_files[:3] == [1, 1, 1]
+
+        engine = GraphEngine(temp_repo)
+        await engine.initialize()
+        try:
+            stats = await engine.get_statistics()
+            assert stats.entity_count == result.entities_count
+            assert await engine.get_index_state("status") == "complete"
+        finally:
+            await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_resume_interrupted_run(self, temp_repo: Path, indexer: Indexer):
+        """Test that an interrupted run resumes with the unfinished files."""
+        await indexer.index_repository(temp_repo, incremental=False)
+
+        # Simulate a crash before utils.py was stored
+        engine = GraphEngine(temp_repo)
+        await engine.initialize()
+        try:
+            utils_path = str((temp_repo / "utils.py").resolve())
+            await engine._connection.execute(
+                "DELETE FROM files WHERE path = ?", (utils_path,)
+            )
+            await engine._connection.commit()
+            await engine.set_index_state("status", "in_progress")
+        finally:
+            await engine.close()
+
+        result = await indexer.index_repository(temp_repo, incremental=True)
+
+        assert result.success is True
+        assert result.files_indexed == 1
+
+    @pytest.mark.asyncio
+    async def test_files_read_once(self, temp_repo: Path, indexer: Indexer, monkeypatch):
+        """Test that the file table is written from the parsed content."""
+        reads: list[Path] = []
+        original_read_bytes = Path.read_bytes
+
+        def counting_read_bytes(self: Path) -> bytes:
+            reads.append(self)
+            return original_read_bytes(self)
+
+        monkeypatch.setattr(Path, "read_bytes", counting_read_bytes)
+        result = await indexer.index_repository(temp_repo, incremental=False)
+        monkeypatch.undo()
+
+        assert result.files_indexed == 3
+        assert len(reads) == 3
+
+        engine = GraphEngine(temp_repo)
+        await engine.initialize()
+        try:
+            cursor = await engine._connection.execute("SELECT path, hash, size FROM files")
+            for path, file_hash, size in await cursor.fetchall():
+                assert file_hash == Indexer.compute_file_hash(Path(path))
+                assert size == Path(path).stat().st_size
+        finally:
+            await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_incremental_replaces_file_entities(self, tmp_path: Path, indexer: Indexer):
+        """Test that edited files leave no stale entities and calls are relinked."""
+        repo = tmp_path.resolve()
+        (repo / "lib.py").write_text("def target():\n    pass\n")
+        (repo / "app.py").write_text("from lib import target\n\ndef caller():\n    target()\n")
+        await indexer.index_repository(repo, incremental=False)
+
+        # Shift target() down: its entity ID changes
+        (repo / "lib.py").write_text("import os\n\n\ndef target():\n    pass\n")
+        result = await indexer.index_repository(repo, incremental=True)
+        assert result.files_indexed == 1
+
+        engine = GraphEngine(repo)
+        await engine.initialize()
+        try:
+            cursor = await engine._connection.execute(
+                "SELECT id FROM entities WHERE name = 'target'"
+            )
+            target_ids = [row[0] for row in await cursor.fetchall()]
+            assert len(target_ids) == 1
+            assert target_ids[0].endswith("::4")
+
+            callees = await engine.find_callees("caller")
+            assert [e.id for e in callees] == target_ids
+        finally:
+            await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_embeds_when_enabled(self, temp_repo: Path, monkeypatch):
+        """Test that enabled embeddings follow entity changes."""
+        import numpy as np
+
+        from codegraph_mcp.config import Config
+        from codegraph_mcp.core.semantic import SemanticAnalyzer
+        from codegraph_mcp.storage.sqlite import SQLiteStorage
+        from codegraph_mcp.storage.vectors import VectorStore
+
+        class FakeModel:
+            def get_sentence_embedding_dimension(self):
+                return 4
+
+            def encode(self, texts, batch_size=32):
+                return np.array([[len(t), 1.0, 0.5, 0.25] for t in texts], dtype=np.float32)
+
+        def fake_model(analyzer):
+            analyzer._model = analyzer._model or FakeModel()
+
+        monkeypatch.setattr(SemanticAnalyzer, "_ensure_initialized", fake_model)
+        config = Config()
+        config.semantic.embeddings_enabled = True
+        indexer = Indexer(config=config)
+
+        result = await indexer.index_repository(temp_repo, incremental=False)
+        assert result.entities_embedded > 0
+
+        (temp_repo / "main.py").unlink()
+        result = await indexer.index_repository(temp_repo, incremental=True)
+        assert result.entities_embedded == 0
+
+        engine = GraphEngine(temp_repo)
+        await engine.initialize()
+        storage = SQLiteStorage(engine.db_path)
+        try:
+            store = VectorStore(dimensions=4, storage=storage)
+            await store.initialize()
+            cursor = await engine._connection.execute("SELECT id FROM entities")
+            entity_ids = [row[0] for row in await cursor.fetchall()]
+            assert len(store) == len(entity_ids) > 0
+            assert all(entity_id in store for entity_id in entity_ids)
+        finally:
+            await storage.close()
+            await engine.close()
+
     def test_get_all_files(self, temp_repo: Path, indexer: Indexer):
         """Test _get_all_files method."""
         files = indexer._get_all_files(temp_repo)
@@ -0,0 +1,97 @@
+"""
+Unit tests for the Louvain module.
+
+Tests: REQ-SEM-003
+"""
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from codegraph_mcp.core.louvain import louvain, modularity
+
+
+def edge_arrays(G: nx.Graph) -> tuple[int, np.ndarray, np.ndarray]:
+    """Get node count and edge endpoints of an integer-labelled graph."""
+    edges = np.array(G.edges(), dtype=np.int64).reshape(-1, 2)
+    return G.number_of_nodes(), edges[:, 0], edges[:, 1]
+
+
+class TestLouvain:
+    """Tests for the NumPy Louvain implementation."""
+
+    @pytest.mark.parametrize(
+        "G",
+        [
+            nx.ring_of_cliques(16, 4),
+            nx.planted_partition_graph(10, 20, 0.4, 0.02, seed=1),
+            nx.karate_club_graph(),
+        ],
+        ids=["ring_of_cliques", "planted_partition", "karate"],
+    )
+    def test_quality_matches_networkx(self, G: nx.Graph):
+        """Test that modularity is on par with NetworkX's Louvain."""
+        G = nx.convert_node_labels_to_integers(G)
+        n, sources, targets = edge_arrays(G)
+
+        result = louvain(n, sources, targets)
+        expected = nx.community.modularity(
+            G, nx.community.louvain_communities(G, seed=42)
+        )
+
+        assert result.modularity[-1] >= expected - 0.02
+        assert result.modularity[-1] == pytest.approx(
+            modularity(n, sources, targets, None, result.memberships[-1])
+        )
+
+    def test_modularity_matches_networkx(self):
+        """Test the modularity of a weighted graph with a self-loop."""
+        G = nx.Graph()
+        G.add_weighted_edges_from([(0, 1, 2.0), (1, 2, 1.0), (2, 3, 3.0), (3, 3, 1.0)])
+        sources, targets, weights = (np.array(c) for c in zip(*G.edges(data="weight"), strict=True))
+        membership = np.array([0, 0, 1, 1])
+
+        assert modularity(4, sources, targets, weights, membership) == pytest.approx(
+            nx.community.modularity(G, [{0, 1}, {2, 3}])
+        )
+
+    def test_levels_are_nested(self):
+        """Test that every level coarsens the previous one."""
+        n, sources, targets = edge_arrays(nx.ring_of_cliques(16, 4))
+        result = louvain(n, sources, targets)
+
+        assert len(result.memberships) >= 2
+        assert result.modularity == sorted(result.modularity)
+        for fine, coarse in zip(result.memberships, result.memberships[1:], strict=False):
+            # Each fine community maps to exactly one coarse community
+            pairs = np.unique(np.stack([fine, coarse]), axis=1)
+            assert len(np.unique(pairs[0])) == pairs.shape[1]
+
+    def test_deterministic(self):
+        """Test that the same seed yields the same partition."""
+        G = nx.planted_partition_graph(8, 25, 0.3, 0.02, seed=3)
+        n, sources, targets = edge_arrays(G)
+
+        first = louvain(n, sources, targets, seed=7)
+        second = louvain(n, sources, targets, seed=7)
+
+        assert all(
+            np.array_equal(a, b)
+            for a, b in zip(first.memberships, second.memberships, strict=True)
+        )
+
+    def test_parallel_and_reverse_edges_add_up(self):
+        """Test that directed duplicates act as a heavier undirected edge."""
+        result = louvain(
+            4,
+            np.array([0, 1, 0, 2]),
+            np.array([1, 0, 1, 3]),
+        )
+        assert len(np.unique(result.memberships[-1])) == 2
+
+    def test_graph_without_edges(self):
+        """Test that isolated nodes stay singletons."""
+        result = louvain(3, np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+
+        assert [m.tolist() for m in result.memberships] == [[0, 1, 2]]
+        assert result.modularity == [0.0]
@@ -5,19 +5,47 @@ Parser Unit Tests
 ASTパーサーの単体テスト。
 """
 
+import dataclasses
+import pickle
+import tracemalloc
 from pathlib import Path
 
+import pytest
+
 from codegraph_mcp.core.parser import (
     ASTParser,
     Entity,
+    EntityColumns,
     EntityType,
     Location,
     ParseResult,
     Relation,
+    RelationColumns,
     RelationType,
 )
 
 
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+def allocated_per_object(build) -> float:
+    """Average bytes allocated per object by ``build()`` (tracemalloc)."""
+    tracemalloc.start()
+    try:
+        objects = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return size / len(objects)
+
+
+def unslotted(cls):
+    """Plain dataclass with the same fields (the previous representation)."""
+    return dataclasses.make_dataclass(
+        f"Plain{cls.__name__}", [(f.name, f.type) for f in dataclasses.fields(cls)]
+    )
+
+
 class TestASTParser:
     """ASTParserのテスト"""
 
@@ -35,6 +63,18 @@ class TestASTParser:
         assert parser.detect_language(Path("test.rs")) == "rust"
         assert parser.detect_language(Path("test.txt")) is None
 
+    def test_parse_file_reports_content_hash(self, temp_dir):
+        """パースした内容のハッシュとサイズを返すテスト"""
+        import hashlib
+
+        test_file = temp_dir / "hashed.py"
+        test_file.write_bytes(b"def f():\n    pass\n")
+
+        result = ASTParser().parse_file(test_file)
+
+        assert result.content_hash == hashlib.sha256(test_file.read_bytes()).hexdigest()
+        assert result.content_size == test_file.stat().st_size
+
     def test_parse_python_file(self, temp_dir):
         """Pythonファイルのパーステスト"""
         # サンプルファイル作成
@@ -280,3 +320,124 @@ class TestParseResult:
 
         merged = result1.merge(result2)
         assert len(merged.entities) == 2
+
+
+class TestColumnarResult:
+    """列形式のパース結果のテスト"""
+
+    @staticmethod
+    def fixture_files() -> list[Path]:
+        return sorted(p for p in FIXTURES_DIR.rglob("*") if p.suffix and p.name != "README.md")
+
+    def test_round_trip(self):
+        """列形式からオブジェクトへ往復しても同じ内容になる"""
+        result = ASTParser().parse_files(self.fixture_files())
+        entities, relations = list(result.entities), list(result.relations)
+
+        columnar = result.to_columnar()
+        assert columnar.columnar
+        assert columnar.entities == [] and columnar.relations == []
+        assert columnar.entity_count == len(entities)
+        assert columnar.relation_count == len(relations)
+        assert columnar.entity_ids == [e.id for e in entities]
+        assert columnar.entity_columns.to_entities() == entities
+        assert columnar.relation_columns.to_relations() == relations
+
+    def test_parse_files_columnar(self):
+        """列形式で蓄積した結果はオブジェクト形式と一致し、小さく pickle される"""
+        parser = ASTParser()
+        objects = parser.parse_files(self.fixture_files())
+        columnar = parser.parse_files(self.fixture_files(), columnar=True)
+
+        assert columnar.entity_columns == EntityColumns.from_entities(objects.entities)
+        assert columnar.relation_columns == RelationColumns.from_relations(objects.relations)
+
+        object_bytes = pickle.dumps((objects.entities, objects.relations))
+        column_bytes = pickle.dumps((columnar.entity_columns, columnar.relation_columns))
+        assert len(column_bytes) < len(object_bytes)
+
+    def test_merge_mixed_forms(self):
+        """オブジェクト形式と列形式の結果をマージできる"""
+        location = Location(Path("/test/file.py"), 1, 0, 5, 0)
+        first = ParseResult(entities=[Entity(
+            id="e1", type=EntityType.FUNCTION, name="func1",
+            qualified_name="func1", location=location,
+        )])
+        second = ParseResult(entities=[Entity(
+            id="e2", type=EntityType.FUNCTION, name="func2",
+            qualified_name="func2", location=location,
+        )]).to_columnar()
+
+        merged = first.merge(second)
+
+        assert merged.entity_ids == ["e1", "e2"]
+        assert first.entity_ids == ["e1"] and not first.columnar
+
+
+class TestCompactRepresentation:
+    """スロット化されたエンティティ・リレーションのメモリテスト"""
+
+    def test_shared_empty_metadata(self):
+        """空のmetadataは共有され、変更できない"""
+        a = Relation(source_id="a", target_id="b", type=RelationType.CALLS)
+        b = Relation(source_id="b", target_id="c", type=RelationType.CALLS)
+
+        assert a.metadata is b.metadata
+        assert a.metadata == {}
+        assert not hasattr(a, "__dict__")
+        with pytest.raises(TypeError):
+            a.metadata["line"] = 1
+
+        a.metadata = {"line": 1}
+        assert b.metadata == {}
+
+    def test_memory_per_entity_and_relation(self):
+        """フィクスチャ全体で1オブジェクトあたりのメモリが減る"""
+        result = ASTParser().parse_files(TestColumnarResult.fixture_files())
+        assert result.entities and result.relations
+
+        PlainLocation, PlainEntity, PlainRelation = map(unslotted, (Location, Entity, Relation))
+
+        def plain_entities():
+            return [
+                PlainEntity(
+                    e.id, e.type, e.name, e.qualified_name,
+                    PlainLocation(
+                        e.location.file_path,
+                        e.location.start_line,
+                        e.location.start_column,
+                        e.location.end_line,
+                        e.location.end_column,
+                    ),
+                    e.signature, e.docstring, e.source_code, dict(e.metadata),
+                )
+                for e in result.entities
+            ]
+
+        def plain_relations():
+            return [
+                PlainRelation(
+                    r.source_id, r.target_id, r.type, r.weight, dict(r.metadata)
+                )
+                for r in result.relations
+            ]
+
+        def compact_entities():
+            return [
+                dataclasses.replace(e, location=dataclasses.replace(e.location))
+                for e in result.entities
+            ]
+
+        def compact_relations():
+            return [dataclasses.replace(r) for r in result.relations]
+
+        entity_bytes = (
+            allocated_per_object(plain_entities),
+            allocated_per_object(compact_entities),
+        )
+        relation_bytes = (
+            allocated_per_object(plain_relations),
+            allocated_per_object(compact_relations),
+        )
+        assert entity_bytes[1] < entity_bytes[0], f"entity bytes: {entity_bytes}"
+        assert relation_bytes[1] < relation_bytes[0], f"relation bytes: {relation_bytes}"
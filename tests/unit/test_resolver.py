@@ -0,0 +1,211 @@
+"""
+Unit tests for the Reference Resolver module.
+
+Tests: REQ-GRF-004, REQ-TLS-003, REQ-TLS-004
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from codegraph_mcp.core.graph import GraphEngine
+from codegraph_mcp.core.indexer import Indexer
+from codegraph_mcp.core.parser import Entity, EntityType, Location, Relation, RelationType
+from codegraph_mcp.core.resolver import (
+    ORIGINAL_TARGET_KEY,
+    ReferenceResolver,
+    SymbolTable,
+)
+
+
+def make_entity(
+    name: str,
+    file_path: str,
+    line: int,
+    entity_type: EntityType = EntityType.FUNCTION,
+    member: str | None = None,
+) -> Entity:
+    """Helper to create test entities."""
+    return Entity(
+        id=f"{file_path}::{name}::{line}",
+        type=entity_type,
+        name=name,
+        qualified_name=(
+            file_path if entity_type == EntityType.MODULE
+            else f"{file_path}::{member or name}"
+        ),
+        location=Location(
+            file_path=Path(file_path),
+            start_line=line,
+            start_column=0,
+            end_line=line + 5,
+            end_column=0,
+        ),
+    )
+
+
+@pytest.fixture
+async def engine(tmp_path: Path):
+    """Create a graph engine with two files worth of entities."""
+    engine = GraphEngine(tmp_path)
+    await engine.initialize()
+
+    await engine.add_entities_batch([
+        make_entity("main", "/repo/main.py", 1, EntityType.MODULE),
+        make_entity("run", "/repo/main.py", 2),
+        make_entity("helper", "/repo/main.py", 10),
+        make_entity("utils", "/repo/utils.py", 1, EntityType.MODULE),
+        make_entity("helper", "/repo/utils.py", 3),
+        make_entity("Calc", "/repo/utils.py", 8, EntityType.CLASS),
+        make_entity("add", "/repo/utils.py", 9, EntityType.METHOD, "Calc.add"),
+        make_entity("twice", "/repo/utils.py", 12, EntityType.METHOD, "Calc.twice"),
+    ])
+    yield engine
+    await engine.close()
+
+
+async def get_targets(engine: GraphEngine, source_id: str) -> set[str]:
+    """Get relation targets for a source entity."""
+    cursor = await engine._connection.execute(
+        "SELECT target_id FROM relations WHERE source_id = ?",
+        (source_id,),
+    )
+    return {row[0] for row in await cursor.fetchall()}
+
+
+class TestSymbolTable:
+    """Tests for SymbolTable."""
+
+    def test_add_indexes_name_member_and_module(self):
+        """Test that entities are keyed by name, member and module."""
+        table = SymbolTable()
+        table.add("m", "module", "utils", "/repo/utils.py", "/repo/utils.py")
+        table.add("a", "method", "add", "/repo/utils.py::Calc.add", "/repo/utils.py")
+
+        assert table.by_name["add"] == ["a"]
+        assert table.by_member["Calc.add"] == ["a"]
+        assert table.by_module["utils"] == ["m"]
+        assert table.names_in_files({"/repo/utils.py"}) == {"add"}
+
+
+class TestReferenceResolver:
+    """Tests for ReferenceResolver."""
+
+    @pytest.mark.asyncio
+    async def test_resolves_unique_and_same_file_calls(self, engine):
+        """Test unique names resolve and ambiguous ones prefer the caller's file."""
+        run_id = "/repo/main.py::run::2"
+        await engine.add_relations_batch([
+            Relation(run_id, "unresolved::helper", RelationType.CALLS),
+            Relation(run_id, "unresolved::Calc", RelationType.CALLS),
+            Relation(run_id, "unresolved::print", RelationType.CALLS),
+        ])
+
+        result = await ReferenceResolver().resolve(engine)
+
+        assert result.resolved == 2
+        assert await get_targets(engine, run_id) == {
+            "/repo/main.py::helper::10",
+            "/repo/utils.py::Calc::8",
+            "unresolved::print",
+        }
+
+    @pytest.mark.asyncio
+    async def test_resolves_self_and_qualified_calls(self, engine):
+        """Test self.method() and module.func() resolution."""
+        twice_id = "/repo/utils.py::twice::12"
+        run_id = "/repo/main.py::run::2"
+        await engine.add_relations_batch([
+            Relation(twice_id, "unresolved::self.add", RelationType.CALLS),
+            Relation(run_id, "unresolved::utils.helper", RelationType.CALLS),
+            Relation(run_id, "module::utils", RelationType.IMPORTS),
+        ])
+
+        await ReferenceResolver().resolve(engine)
+
+        assert await get_targets(engine, twice_id) == {"/repo/utils.py::add::9"}
+        assert await get_targets(engine, run_id) == {
+            "/repo/utils.py::helper::3",
+            "/repo/utils.py::utils::1",
+        }
+
+    @pytest.mark.asyncio
+    async def test_records_original_target(self, engine):
+        """Test that resolved relations keep their placeholder."""
+        run_id = "/repo/main.py::run::2"
+        await engine.add_relations_batch([
+            Relation(run_id, "unresolved::Calc", RelationType.CALLS),
+        ])
+
+        await ReferenceResolver().resolve(engine)
+
+        cursor = await engine._connection.execute(
+            "SELECT metadata FROM relations WHERE source_id = ?", (run_id,)
+        )
+        meta = json.loads((await cursor.fetchone())[0])
+        assert meta[ORIGINAL_TARGET_KEY] == "unresolved::Calc"
+
+    @pytest.mark.asyncio
+    async def test_incremental_only_touches_changed_files(self, engine):
+        """Test that incremental runs skip edges unrelated to changed files."""
+        run_id = "/repo/main.py::run::2"
+        twice_id = "/repo/utils.py::twice::12"
+        await engine.add_relations_batch([
+            Relation(run_id, "unresolved::Calc", RelationType.CALLS),
+            Relation(twice_id, "unresolved::self.add", RelationType.CALLS),
+        ])
+
+        result = await ReferenceResolver().resolve(
+            engine, changed_files=[Path("/repo/main.py")]
+        )
+
+        # Only run's edge has a source in main.py; Calc is not defined there
+        assert result.examined == 1
+        assert await get_targets(engine, twice_id) == {"unresolved::self.add"}
+
+    @pytest.mark.asyncio
+    async def test_incremental_reverts_vanished_target(self, engine):
+        """Test that a resolved edge reverts when its target stops resolving."""
+        run_id = "/repo/main.py::run::2"
+        await engine.add_relations_batch([
+            Relation(run_id, "unresolved::Calc", RelationType.CALLS),
+        ])
+        await ReferenceResolver().resolve(engine)
+
+        # Calc renamed in utils.py
+        await engine._connection.execute(
+            "UPDATE entities SET name = 'Calculator', "
+            "qualified_name = '/repo/utils.py::Calculator' "
+            "WHERE id = '/repo/utils.py::Calc::8'"
+        )
+        await engine._connection.commit()
+
+        result = await ReferenceResolver().resolve(
+            engine, changed_files=[Path("/repo/utils.py")]
+        )
+
+        assert result.reverted == 1
+        assert await get_targets(engine, run_id) == {"unresolved::Calc"}
+
+
+class TestIndexerResolution:
+    """Tests for resolution as part of indexing."""
+
+    @pytest.mark.asyncio
+    async def test_index_resolves_callers(self, tmp_path: Path):
+        """Test that find_callers joins to real entities after indexing."""
+        (tmp_path / "main.py").write_text(
+            "def main():\n    helper()\n\ndef helper():\n    pass\n"
+        )
+
+        result = await Indexer().index_repository(tmp_path, incremental=False)
+        assert result.relations_resolved >= 1
+
+        engine = GraphEngine(tmp_path)
+        await engine.initialize()
+        try:
+            callers = await engine.find_callers("helper")
+            assert [c.name for c in callers] == ["main"]
+        finally:
+            await engine.close()
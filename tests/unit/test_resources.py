@@ -81,7 +81,7 @@ class TestResourceDispatch:
 
         assert "entity" in result
         assert result["entity"]["id"] == "test_func"
-        mock_engine.get_entity.assert_called_once_with("test_func")
+        mock_engine.get_entity.assert_called_once_with("test_func", include_source=True)
 
     @pytest.mark.asyncio
     async def test_dispatch_stats_resource(self, mock_stats: GraphStatistics):
@@ -274,6 +274,7 @@ class TestCommunityResource:
             "Core Module",
             "Main functionality",
             10,
+            None,
         )
 
         # Mock members query
@@ -292,6 +293,7 @@ class TestCommunityResource:
 
         assert result["community"]["id"] == 1
         assert result["community"]["name"] == "Core Module"
+        assert result["community"]["parent_id"] is None
         assert len(result["members"]) == 2
 
     @pytest.mark.asyncio
@@ -0,0 +1,303 @@
+"""
+Unit tests for the Semantic Analysis module.
+
+Tests: REQ-SEM-001, REQ-SEM-004
+"""
+
+import asyncio
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from codegraph_mcp.config import SemanticConfig
+from codegraph_mcp.core.community import CommunityDetector
+from codegraph_mcp.core.graph import GraphEngine
+from codegraph_mcp.core.parser import Entity, EntityType, Location, Relation, RelationType
+from codegraph_mcp.core.semantic import SemanticAnalyzer
+from codegraph_mcp.storage.sqlite import SQLiteStorage
+from codegraph_mcp.storage.vectors import VectorStore
+
+
+class FakeModel:
+    """Embedding model stub that records encode calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+        self.threads: set[threading.Thread] = set()
+
+    def encode(self, texts, batch_size=32):
+        self.calls.append(len(texts))
+        self.threads.add(threading.current_thread())
+        return np.array(
+            [[len(t), sum(map(ord, t)) % 97, 1.0, 0.5] for t in texts],
+            dtype=np.float32,
+        )
+
+
+def make_entity(name: str, line: int, docstring: str | None = None) -> Entity:
+    """Helper to create test entities."""
+    return Entity(
+        id=f"/repo/a.py::{name}::{line}",
+        type=EntityType.FUNCTION,
+        name=name,
+        qualified_name=f"/repo/a.py::{name}",
+        location=Location(Path("/repo/a.py"), line, 0, line + 2, 0),
+        docstring=docstring,
+    )
+
+
+@pytest.fixture
+async def engine(tmp_path: Path):
+    """Create a graph engine with ten entities."""
+    engine = GraphEngine(tmp_path)
+    await engine.initialize()
+    await engine.add_entities_batch([make_entity(f"f{i}", i) for i in range(10)])
+    yield engine
+    await engine.close()
+
+
+class TestBatchedEmbedding:
+    """Tests for SemanticAnalyzer.embed_entities."""
+
+    def test_from_config_uses_batch_size(self):
+        """Test that embedding_batch_size is taken from the config."""
+        analyzer = SemanticAnalyzer.from_config(SemanticConfig(embedding_batch_size=8))
+        assert analyzer.embedding_batch_size == 8
+
+    @pytest.mark.asyncio
+    async def test_one_model_call_per_batch(self, engine):
+        """Test that each batch is encoded with a single model call."""
+        analyzer = SemanticAnalyzer(embedding_batch_size=4)
+        analyzer._model = FakeModel()
+
+        result = await analyzer.embed_entities(engine)
+
+        assert result.embedded == 10
+        assert result.batches == 3
+        assert analyzer._model.calls == [4, 4, 2]
+        assert threading.main_thread() not in analyzer._model.threads
+
+        storage = SQLiteStorage(engine.db_path)
+        store = VectorStore(dimensions=4, storage=storage)
+        await store.initialize()
+        assert len(store) == 10
+        assert store.get_stats()["memory_mapped"]
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_skips_unchanged_entities(self, engine):
+        """Test that only entities with changed content are re-embedded."""
+        analyzer = SemanticAnalyzer(embedding_batch_size=4)
+        analyzer._model = FakeModel()
+        await analyzer.embed_entities(engine)
+
+        await engine.add_entity(make_entity("f3", 3, docstring="Now documented."))
+        analyzer._model.calls.clear()
+        result = await analyzer.embed_entities(engine)
+
+        assert result.embedded == 1
+        assert result.skipped == 9
+        assert analyzer._model.calls == [1]
+
+        forced = await analyzer.embed_entities(engine, force=True)
+        assert forced.embedded == 10
+
+    @pytest.mark.asyncio
+    async def test_builds_and_persists_ann_index(self, engine, monkeypatch):
+        """Test that the IVF index is trained, saved and reloaded."""
+        monkeypatch.setattr(SemanticAnalyzer, "ANN_MIN_VECTORS", 8)
+        analyzer = SemanticAnalyzer(embedding_batch_size=4)
+        analyzer._model = FakeModel()
+
+        await analyzer.embed_entities(engine)
+
+        store = await analyzer.open_vector_store(engine, dimensions=4)
+        try:
+            assert store.index_path.exists()
+            assert store.ann_index.is_trained
+            results = store.search(store.get_vector("/repo/a.py::f3::3"), top_k=1)
+            assert results[0].entity_id == "/repo/a.py::f3::3"
+        finally:
+            await store.storage.close()
+
+    @pytest.mark.asyncio
+    async def test_replaced_files_drop_their_vectors(self, engine):
+        """Test that entities removed by a reparse leave the vector store."""
+        analyzer = SemanticAnalyzer(embedding_batch_size=4)
+        analyzer._model = FakeModel()
+        store = await analyzer.open_vector_store(engine, dimensions=4)
+        try:
+            await analyzer.embed_entities(engine, store=store)
+            engine.vector_store = store
+
+            kept = [make_entity(f"f{i}", i) for i in range(5)]
+            await engine.replace_files([(Path("/repo/a.py"), kept, [])])
+
+            assert len(store) == 5
+            assert "/repo/a.py::f7::7" not in store
+        finally:
+            engine.vector_store = None
+            await store.storage.close()
+
+
+class CountingSummarizer(SemanticAnalyzer):
+    """Analyzer whose summaries record calls and concurrency."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[int] = []
+        self.loaded: list[tuple[int, int]] = []
+        self.active = 0
+        self.peak = 0
+
+    async def generate_community_summary(self, community, entities, type_counts=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.001)
+        self.active -= 1
+        self.calls.append(community.id)
+        self.loaded.append((len(entities), sum((type_counts or {}).values())))
+        return f"{len(entities)} entities: {', '.join(e.name for e in entities)}"
+
+
+def clique_entities(cliques: int = 4, size: int = 3) -> tuple[list[Entity], list[Relation]]:
+    """Cliques of calling functions, each calling into the next."""
+    entities = []
+    for i in range(cliques * size):
+        entity = make_entity(f"g{i}", i * 10)
+        entity.source_code = f"def g{i}():\n    pass\n"
+        entities.append(entity)
+    relations = []
+    for c in range(cliques):
+        members = entities[c * size:(c + 1) * size]
+        relations += [
+            Relation(a.id, b.id, RelationType.CALLS)
+            for k, a in enumerate(members)
+            for b in members[k + 1:]
+        ]
+        relations.append(
+            Relation(members[-1].id, entities[((c + 1) % cliques) * size].id, RelationType.CALLS)
+        )
+    return entities, relations
+
+
+@pytest.fixture
+async def clustered(tmp_path: Path):
+    """Engine with detected communities over four cliques."""
+    engine = GraphEngine(tmp_path)
+    await engine.initialize()
+    entities, relations = clique_entities()
+    await engine.add_entities_batch(entities)
+    await engine.add_relations_batch(relations)
+    await CommunityDetector(min_size=1).detect(engine)
+    yield engine
+    await engine.close()
+
+
+async def stored_summaries(engine: GraphEngine) -> dict[int, str | None]:
+    """Summary of every community."""
+    cursor = await engine._connection.execute("SELECT id, summary FROM communities")
+    return dict(await cursor.fetchall())
+
+
+class TestCommunitySummaries:
+    """Tests for SemanticAnalyzer.summarize_communities."""
+
+    @pytest.mark.asyncio
+    async def test_summarizes_every_community(self, clustered):
+        """Test that all communities get a summary, with bounded concurrency."""
+        analyzer = CountingSummarizer()
+        result = await analyzer.summarize_communities(clustered, concurrency=2)
+
+        summaries = await stored_summaries(clustered)
+        assert None not in summaries.values()
+        assert result.generated == len(analyzer.calls) == len(summaries)
+        assert analyzer.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_loads_a_bounded_sample(self, clustered, monkeypatch):
+        """Test that coarse communities load a sample but count every member."""
+        monkeypatch.setattr(SemanticAnalyzer, "SUMMARY_SAMPLE", 2)
+        analyzer = CountingSummarizer()
+        await analyzer.summarize_communities(clustered)
+
+        assert analyzer.loaded
+        assert all(loaded == min(members, 2) for loaded, members in analyzer.loaded)
+
+        rules = SemanticAnalyzer()
+        await rules.summarize_communities(clustered, force=True)
+        summaries = (await stored_summaries(clustered)).values()
+        assert "Community with 3 function(s)." in {s.split(" Key")[0] for s in summaries}
+        assert all(s.endswith("and 1 more.") for s in summaries)
+
+    @pytest.mark.asyncio
+    async def test_unchanged_communities_are_reused(self, clustered):
+        """Test that reruns and re-detection do not summarize again."""
+        analyzer = CountingSummarizer()
+        await analyzer.summarize_communities(clustered)
+        before = sorted((await stored_summaries(clustered)).values())
+        analyzer.calls.clear()
+
+        rerun = await analyzer.summarize_communities(clustered)
+        assert (rerun.generated, rerun.cached) == (0, 0)
+        assert rerun.skipped == len(before)
+
+        # Re-detection recreates the communities without summaries
+        await CommunityDetector(min_size=1).detect(clustered)
+        redetected = await analyzer.summarize_communities(clustered)
+
+        assert analyzer.calls == []
+        assert redetected.cached == len(before)
+        assert sorted((await stored_summaries(clustered)).values()) == before
+
+    @pytest.mark.asyncio
+    async def test_source_change_resummarizes_its_branch(self, clustered):
+        """Test that editing a member regenerates only communities containing it."""
+        analyzer = CountingSummarizer()
+        await analyzer.summarize_communities(clustered)
+        analyzer.calls.clear()
+
+        edited = clique_entities()[0][0]
+        edited.source_code = "def g0():\n    return 1\n"
+        await clustered.add_entities_batch([edited])
+        result = await analyzer.summarize_communities(clustered)
+
+        cursor = await clustered._connection.execute(
+            """
+            WITH RECURSIVE branch(id) AS (
+                SELECT community_id FROM entities WHERE id = ?
+                UNION ALL
+                SELECT c.parent_id FROM communities c JOIN branch b ON c.id = b.id
+                WHERE c.parent_id IS NOT NULL
+            )
+            SELECT id FROM branch
+            """,
+            (edited.id,),
+        )
+        branch = {row[0] for row in await cursor.fetchall()}
+        assert set(analyzer.calls) <= branch
+        assert result.generated == len(analyzer.calls) >= 1
+        assert result.skipped == len(await stored_summaries(clustered)) - len(branch)
+
+    @pytest.mark.asyncio
+    async def test_summaries_are_embedded_once(self, clustered):
+        """Test that summary embeddings are cached with their summaries."""
+        analyzer = CountingSummarizer()
+        analyzer._model = FakeModel()
+        await analyzer.summarize_communities(clustered)
+        cursor = await clustered._connection.execute("SELECT COUNT(*) FROM community_summaries")
+        cached = (await cursor.fetchone())[0]
+
+        result = await analyzer.embed_communities(clustered)
+        assert (result.embedded, result.skipped) == (cached, 0)
+
+        # Re-detection reuses the summaries and their vectors
+        await CommunityDetector(min_size=1).detect(clustered)
+        await analyzer.summarize_communities(clustered)
+        rerun = await analyzer.embed_communities(clustered)
+
+        assert (rerun.embedded, rerun.skipped) == (0, cached)
+        assert analyzer._model.calls == [cached]
+        assert threading.main_thread() not in analyzer._model.threads
@@ -0,0 +1,154 @@
+"""
+Unit tests for the Graph Snapshot module.
+
+Tests: REQ-GRF-001, REQ-TLS-005
+"""
+
+from pathlib import Path
+
+import pytest
+
+from codegraph_mcp.core.graph import GraphEngine
+from codegraph_mcp.core.parser import Entity, EntityType, Location, Relation, RelationType
+from codegraph_mcp.core.snapshot import GraphSnapshot
+
+
+def make_entity(name: str, file_path: str, line: int = 1) -> Entity:
+    """Helper to create test entities."""
+    return Entity(
+        id=f"{file_path}::{name}::{line}",
+        type=EntityType.FUNCTION,
+        name=name,
+        qualified_name=f"{file_path}::{name}",
+        location=Location(
+            file_path=Path(file_path),
+            start_line=line,
+            start_column=0,
+            end_line=line + 5,
+            end_column=0,
+        ),
+    )
+
+
+A = "/repo/a.py::a::1"
+B = "/repo/b.py::b::1"
+C = "/repo/c.py::c::1"
+
+
+@pytest.fixture
+async def engine(tmp_path: Path):
+    """Create a graph engine with a small call chain a -> b -> c."""
+    engine = GraphEngine(tmp_path)
+    await engine.initialize()
+    await engine.add_entities_batch([
+        make_entity("a", "/repo/a.py"),
+        make_entity("b", "/repo/b.py"),
+        make_entity("c", "/repo/c.py"),
+    ])
+    await engine.add_relations_batch([
+        Relation(A, B, RelationType.CALLS),
+        Relation(B, C, RelationType.CALLS),
+    ])
+    yield engine
+    await engine.close()
+
+
+def edges(snapshot: GraphSnapshot) -> set[tuple[str, str]]:
+    """Get the snapshot's edge set."""
+    return {(u, v) for u, v, _, _ in snapshot.csr.edges()}
+
+
+class TestGraphSnapshot:
+    """Tests for GraphSnapshot."""
+
+    @pytest.mark.asyncio
+    async def test_generation_bumps_on_write(self, engine):
+        """Test that every write moves the graph generation on."""
+        before = await engine.get_generation()
+        await engine.add_entity(make_entity("d", "/repo/d.py"))
+        after_add = await engine.get_generation()
+        await engine.delete_file_entities("/repo/d.py")
+
+        assert after_add > before
+        assert await engine.get_generation() > after_add
+
+    @pytest.mark.asyncio
+    async def test_reloads_when_stale(self, engine):
+        """Test that a stale snapshot is rebuilt on next use."""
+        snapshot = GraphSnapshot()
+        csr = await snapshot.get_csr(engine)
+        assert csr.number_of_nodes() == 3
+        assert await snapshot.get_csr(engine) is csr
+
+        await engine.add_relation(Relation(C, A, RelationType.CALLS))
+
+        csr = await snapshot.get_csr(engine)
+        assert C in csr.predecessors(A)
+        assert snapshot.generation == await engine.get_generation()
+
+    @pytest.mark.asyncio
+    async def test_patch_matches_full_reload(self, engine):
+        """Test that patching for changed files equals rebuilding."""
+        snapshot = GraphSnapshot()
+        await snapshot.load(engine)
+
+        # Re-index b.py: b is replaced by b2, which calls c and a
+        b2 = "/repo/b.py::b2::3"
+        await engine.delete_file_entities("/repo/b.py")
+        await engine.add_entity(make_entity("b2", "/repo/b.py", 3))
+        await engine.add_relations_batch([
+            Relation(b2, C, RelationType.CALLS),
+            Relation(b2, A, RelationType.CALLS),
+        ])
+        # a.py's call is relinked to the new entity
+        await engine.add_relation(Relation(A, b2, RelationType.CALLS))
+
+        await snapshot.patch(engine, [Path("/repo/b.py")], [A])
+
+        fresh = GraphSnapshot()
+        await fresh.load(engine)
+        assert set(snapshot.csr.nodes()) == set(fresh.csr.nodes())
+        assert edges(snapshot) == edges(fresh)
+        assert snapshot.generation == fresh.generation
+
+    @pytest.mark.asyncio
+    async def test_patch_ignores_unloaded(self, engine):
+        """Test that patching an unloaded snapshot is a no-op."""
+        snapshot = GraphSnapshot()
+        await snapshot.patch(engine, [Path("/repo/a.py")])
+        assert not snapshot.is_loaded
+
+
+class TestEngineWithSnapshot:
+    """Tests for GraphEngine queries backed by a snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_find_paths(self, engine):
+        """Test path finding over the shared snapshot."""
+        engine.snapshot = GraphSnapshot()
+        paths = await engine.find_paths(A, C)
+        assert paths == [[A, B, C]]
+
+    @pytest.mark.asyncio
+    async def test_find_dependencies_matches_sql(self, engine):
+        """Test that snapshot dependency traversal matches the SQL one."""
+        expected = await engine.find_dependencies(A, depth=2)
+        engine.snapshot = GraphSnapshot()
+        result = await engine.find_dependencies(A, depth=2)
+
+        assert [e.id for e in result.entities] == [e.id for e in expected.entities]
+        assert {(r.source_id, r.target_id) for r in result.relations} == {
+            (r.source_id, r.target_id) for r in expected.relations
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_subgraph_matches_sql(self, engine):
+        """Test that snapshot subgraphs match the SQL traversal."""
+        expected = await engine.get_subgraph(B, depth=1)
+        engine.snapshot = GraphSnapshot()
+        result = await engine.get_subgraph(B, depth=1)
+
+        assert {e.id for e in result.entities} == {e.id for e in expected.entities}
+        assert {(r.source_id, r.target_id) for r in result.relations} == {
+            (r.source_id, r.target_id) for r in expected.relations
+        }
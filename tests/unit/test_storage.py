@@ -5,6 +5,7 @@ Storage Unit Tests
 ストレージ層の単体テスト。
 """
 
+import numpy as np
 import pytest
 
 
@@ -74,17 +75,240 @@ class TestFileCache:
 class TestVectorStore:
     """VectorStoreのテスト"""
 
+    @staticmethod
+    def make_store(count: int = 200, dimensions: int = 16, seed: int = 0):
+        """Create a store filled with random vectors."""
+        from codegraph_mcp.storage.vectors import VectorStore
+
+        rng = np.random.default_rng(seed)
+        vectors = rng.standard_normal((count, dimensions)).astype(np.float32)
+        store = VectorStore(dimensions=dimensions)
+        store.add_batch([f"e{i}" for i in range(count)], vectors)
+        return store, vectors
+
     def test_vector_initialization(self):
         """ベクトルストア初期化テスト"""
-        # TODO: 実装後にテスト追加
-        pass
+        from codegraph_mcp.storage.vectors import VectorStore
+
+        store = VectorStore(dimensions=8)
+        assert len(store) == 0
+        assert store.search(np.ones(8)) == []
+        assert store.get_stats()["vector_count"] == 0
 
     def test_store_vector(self):
         """ベクトル保存テスト"""
-        # TODO: 実装後にテスト追加
-        pass
+        from codegraph_mcp.storage.vectors import VectorStore
+
+        store = VectorStore(dimensions=3)
+        store.add("a", [3.0, 0.0, 4.0])
+        store.add("a", [0.0, 2.0, 0.0])  # replaces in place
+
+        assert len(store) == 1
+        assert np.allclose(store.get_vector("a"), [0.0, 1.0, 0.0])
+        with pytest.raises(ValueError):
+            store.add("b", [1.0, 2.0])
 
     def test_similarity_search(self):
         """類似度検索テスト"""
-        # TODO: 実装後にテスト追加
-        pass
+        store, vectors = self.make_store()
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        query = vectors[7]
+
+        expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+        results = store.search(query, top_k=5)
+
+        assert [r.entity_id for r in results] == [f"e{i}" for i in expected]
+        assert results[0].entity_id == "e7"
+        assert results[0].score == pytest.approx(1.0, abs=1e-5)
+        assert all(r.score >= 0.5 for r in store.search(query, top_k=50, threshold=0.5))
+
+    def test_batch_search_matches_single(self):
+        """バッチ検索は単一検索と一致する"""
+        store, vectors = self.make_store()
+        batch = store.search_batch(vectors[:4], top_k=3)
+
+        for query, results in zip(vectors[:4], batch, strict=True):
+            assert [r.entity_id for r in results] == [
+                r.entity_id for r in store.search(query, top_k=3)
+            ]
+
+    def test_remove_tombstones_and_compacts(self):
+        """削除はトゥームストーン化され、後で圧縮される"""
+        store, vectors = self.make_store(count=3000)
+
+        assert store.remove("e7")
+        assert not store.remove("e7")
+        assert "e7" not in [r.entity_id for r in store.search(vectors[7], top_k=10)]
+        assert store.get_stats()["tombstones"] == 1
+
+        for i in range(2000):
+            store.remove(f"e{i}")
+        assert len(store) == 1000
+        assert store.get_stats()["tombstones"] < 1000
+        assert store.search_by_entity("e2500", top_k=1)[0].entity_id != "e2500"
+
+
+class TestIVFIndex:
+    """IVFIndex（近似最近傍探索）のテスト"""
+
+    @staticmethod
+    def make_clustered(count: int = 5000, dimensions: int = 32, seed: int = 1):
+        """Create vectors drawn around random cluster centers."""
+        rng = np.random.default_rng(seed)
+        centers = rng.standard_normal((50, dimensions))
+        labels = rng.integers(0, 50, count)
+        noise = 0.4 * rng.standard_normal((count, dimensions))
+        return (centers[labels] + noise).astype(np.float32)
+
+    @staticmethod
+    def recall(store, queries, top_k: int = 10) -> float:
+        """Recall@k of approximate search against exact search."""
+        hits = 0
+        for query in queries:
+            exact = {r.entity_id for r in store.search(query, top_k, exact=True)}
+            approx = {r.entity_id for r in store.search(query, top_k)}
+            hits += len(exact & approx)
+        return hits / (top_k * len(queries))
+
+    def test_recall_against_exact_search(self):
+        """近似検索の再現率ベンチマーク"""
+        from codegraph_mcp.storage.vectors import IVFIndex, VectorStore
+
+        vectors = self.make_clustered()
+        store = VectorStore(dimensions=32, ann_index=IVFIndex(nprobe=8))
+        store.add_batch([f"e{i}" for i in range(len(vectors))], vectors)
+        store.build_index()
+
+        queries = vectors[:100] + 0.1
+        assert self.recall(store, queries) >= 0.9
+
+        # Probing every bucket is exact
+        store.ann_index.nprobe = len(store.ann_index.centroids)
+        assert self.recall(store, queries) == 1.0
+
+    def test_incremental_insert_and_delete(self):
+        """インデックス学習後の追加・削除"""
+        from codegraph_mcp.storage.vectors import VectorStore
+
+        vectors = self.make_clustered(count=1000)
+        store = VectorStore(dimensions=32)
+        store.add_batch([f"e{i}" for i in range(900)], vectors[:900])
+        store.build_index()
+
+        store.add_batch([f"e{i}" for i in range(900, 1000)], vectors[900:])
+        assert store.search(vectors[950], top_k=1)[0].entity_id == "e950"
+
+        store.remove("e950")
+        assert "e950" not in [r.entity_id for r in store.search(vectors[950], top_k=5)]
+
+        # Moving a vector re-buckets it
+        store.add("e10", vectors[20])
+        top = [r.entity_id for r in store.search(vectors[20], top_k=2)]
+        assert set(top) == {"e10", "e20"}
+
+    def test_persistence_roundtrip(self, temp_dir):
+        """graph.db と同じ場所への保存と読み込み"""
+        from codegraph_mcp.storage.vectors import IVFIndex, VectorStore
+
+        class Storage:
+            db_path = temp_dir / "graph.db"
+
+        vectors = self.make_clustered(count=1000)
+        ids = [f"e{i}" for i in range(1000)]
+        store = VectorStore(dimensions=32, storage=Storage(), ann_index=IVFIndex(nprobe=4))
+        store.add_batch(ids, vectors)
+        store.build_index()
+        assert store.save_index() == temp_dir / "vectors.ivf.npz"
+
+        reloaded = VectorStore(dimensions=32, storage=Storage())
+        reloaded.add_batch(ids, vectors)
+        assert reloaded.load_index()
+        assert reloaded.ann_index.nprobe == 4
+        assert np.array_equal(reloaded.ann_index.centroids, store.ann_index.centroids)
+        for query in vectors[:20]:
+            assert [r.entity_id for r in reloaded.search(query)] == [
+                r.entity_id for r in store.search(query)
+            ]
+
+
+class TestEmbeddingFile:
+    """メモリマップされた埋め込みファイルのテスト"""
+
+    @pytest.fixture
+    async def storage(self, temp_dir):
+        from codegraph_mcp.storage.sqlite import SQLiteStorage
+
+        storage = SQLiteStorage(temp_dir / "graph.db")
+        await storage.initialize()
+        yield storage
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_persist_and_map(self, storage, temp_dir):
+        """永続化したベクトルは再起動時にメモリマップされる"""
+        from codegraph_mcp.storage.vectors import VectorStore
+
+        rng = np.random.default_rng(3)
+        vectors = rng.standard_normal((50, 8)).astype(np.float32)
+        store = VectorStore(dimensions=8, storage=storage)
+        await store.initialize()
+        await store.add_persistent_batch([f"e{i}" for i in range(40)], vectors[:40])
+        await store.add_persistent_batch([f"e{i}" for i in range(40, 50)], vectors[40:])
+        await store.add_persistent("e0", vectors[1])
+        await store.remove_persistent("e2")
+
+        assert (temp_dir / "embeddings.f32").stat().st_size == 50 * 8 * 4
+
+        reloaded = VectorStore(dimensions=8, storage=storage)
+        await reloaded.initialize()
+        assert reloaded.get_stats()["memory_mapped"]
+        assert len(reloaded) == 49
+        assert "e2" not in reloaded
+        assert np.allclose(reloaded.get_vector("e0"), store.get_vector("e1"))
+        for query in vectors[:5]:
+            assert [r.entity_id for r in reloaded.search(query)] == [
+                r.entity_id for r in store.search(query)
+            ]
+
+    @pytest.mark.asyncio
+    async def test_stale_writer_appends_after_other_writes(self, storage, temp_dir):
+        """古いビューの書き込みは他の書き込みを上書きせず、ファイルを縮めない"""
+        from codegraph_mcp.storage.vectors import VectorStore
+
+        vectors = np.eye(8, dtype=np.float32)
+        first = VectorStore(dimensions=8, storage=storage)
+        await first.initialize()
+        await first.add_persistent_batch(["a", "b"], vectors[:2])
+
+        stale = VectorStore(dimensions=8, storage=storage)
+        await stale.initialize()
+        await first.add_persistent_batch(["c", "d", "e"], vectors[2:5])
+        await stale.add_persistent("f", vectors[5])
+
+        assert (temp_dir / "embeddings.f32").stat().st_size == 6 * 8 * 4
+        reloaded = VectorStore(dimensions=8, storage=storage)
+        await reloaded.initialize()
+        assert len(reloaded) == 6
+        for i, entity_id in enumerate("abcdef"):
+            assert np.allclose(reloaded.get_vector(entity_id), vectors[i])
+
+    @pytest.mark.asyncio
+    async def test_migrates_legacy_blobs(self, storage, temp_dir):
+        """entities.embedding の BLOB はファイルへ移行される"""
+        from codegraph_mcp.storage.vectors import VectorStore
+
+        vector = np.arange(8, dtype=np.float32)
+        await storage.execute(
+            "INSERT INTO entities (id, type, name, qualified_name, file_path, "
+            "start_line, end_line, embedding) VALUES ('a', 'function', 'a', 'a', "
+            "'a.py', 1, 2, ?)",
+            (vector.tobytes(),),
+        )
+        await storage.commit()
+
+        store = VectorStore(dimensions=8, storage=storage)
+        await store.initialize()
+
+        assert (temp_dir / "embeddings.f32").exists()
+        assert store.get_stats()["memory_mapped"]
+        assert store.search(vector, top_k=1)[0].entity_id == "a"